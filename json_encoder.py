@@ -8,6 +8,7 @@ https://gist.github.com/jannismain/e96666ca4f059c3e5bc28abb711b5c92
 from __future__ import annotations
 
 import json
+from json.encoder import encode_basestring, encode_basestring_ascii
 
 
 class CompactJSONEncoder(json.JSONEncoder):
@@ -28,6 +29,12 @@ class CompactJSONEncoder(json.JSONEncoder):
             kwargs["indent"] = 4
         super().__init__(*args, **kwargs)
         self.indentation_level = 0
+        self._encode_string = (
+            encode_basestring_ascii if self.ensure_ascii else encode_basestring
+        )
+        # Sound files repeat the same handful of keys over and over
+        self._inline_keys: dict[str, str] = {}
+        self._multiline_keys: dict[str, str] = {}
 
     def encode(self, o):
         """Encode JSON object *o* with respect to single line lists."""
@@ -35,9 +42,31 @@ class CompactJSONEncoder(json.JSONEncoder):
             return self._encode_list(o)
         if isinstance(o, dict):
             return self._encode_object(o)
+        return self._encode_primitive(o)[0]
+
+    def _encode_primitive(self, o) -> tuple[str, int]:
+        """
+        Encode a non-container value, returning the encoded text and the
+        width the value occupies in ``str()`` of its container.
+        """
+        if isinstance(o, str):
+            text = self._encode_string(o)
+            # Nothing was escaped, so repr() only adds the two quotes
+            if len(text) == len(o) + 2 and o.isprintable():
+                return text, len(text)
+            return text, len(repr(o))
+        if o is None:
+            return "null", 4
+        if o is True:
+            return "true", 4
+        if o is False:
+            return "false", 5
+        if isinstance(o, int):
+            text = int.__repr__(o)
+            return text, len(text) if type(o) is int else len(repr(o))
         if isinstance(o, float):  # Use scientific notation for floats
-            return format(o, "g")
-        return json.dumps(
+            return format(o, "g"), len(repr(o))
+        text = json.dumps(
             o,
             skipkeys=self.skipkeys,
             ensure_ascii=self.ensure_ascii,
@@ -48,50 +77,119 @@ class CompactJSONEncoder(json.JSONEncoder):
             separators=(self.item_separator, self.key_separator),
             default=self.default if hasattr(self, "default") else None,
         )
+        return text, len(repr(o))
+
+    def _encode_inline(self, o: list | tuple | dict) -> str | None:
+        """
+        Encode the items of *o* for a single line, or return None if *o*
+        holds a container or is too long to fit on one.
+
+        Every value is encoded exactly once.  The width is taken from the
+        encoded text and corrected only where ``str()`` of the container
+        would spell a value differently (floats, escaped strings), so the
+        layout matches the original ``len(str(o))`` measurement.
+        """
+        if len(o) > self.MAX_ITEMS:
+            return None
+
+        encode_string = self._encode_string
+        extra = 0
+
+        if isinstance(o, dict):
+            keys: list[str] = []
+            cache = self._inline_keys
+            for k in o:
+                if type(k) is str:
+                    key = cache.get(k)
+                    if key is None:
+                        key = cache[k] = encode_string(k)
+                else:
+                    key, width = self._encode_primitive(k)
+                    extra += width - len(key)
+                keys.append(key)
+            values = o.values()
+        else:
+            values = o
+
+        pieces: list[str] = []
+        append = pieces.append
+        for v in values:
+            t = type(v)
+            if t is str:
+                text = encode_string(v)
+            elif t is float:
+                text = format(v, "g")
+                extra += len(repr(v)) - len(text)
+            elif t is int:
+                text = int.__repr__(v)
+            elif t is bool:
+                text = "true" if v else "false"
+            elif v is None:
+                text = "null"
+            elif isinstance(v, self.CONTAINER_TYPES):
+                return None
+            else:
+                text, width = self._encode_primitive(v)
+                extra += width - len(text)
+            append(text)
+
+        if isinstance(o, dict):
+            pieces = [f"{k}: {v}" for k, v in zip(keys, pieces)]
+        line = ", ".join(pieces)
+
+        # repr() spells escapes differently, and subclasses may have their
+        # own repr(), so measure those cases the way the check always has
+        if (
+            "\\" in line
+            or not line.isprintable()
+            or type(o) not in self.CONTAINER_TYPES
+        ):
+            extra = len(str(o)) - 2 - len(line)
+        elif type(o) is tuple and len(o) == 1:
+            extra += 1  # str() writes single-item tuples as "(x,)"
+
+        if len(line) + extra > self.MAX_WIDTH:
+            return None
+        return line
 
     def _encode_list(self, o):
-        if self._put_on_single_line(o):
-            return "[" + ", ".join(self.encode(el) for el in o) + "]"
+        line = self._encode_inline(o)
+        if line is not None:
+            return "[" + line + "]"
         self.indentation_level += 1
-        output = [self.indent_str + self.encode(el) for el in o]
+        indent = self.indent_str
+        output = [indent + self.encode(el) for el in o]
         self.indentation_level -= 1
         return "[\n" + ",\n".join(output) + "\n" + self.indent_str + "]"
 
     def _encode_object(self, o):
         if not o:
             return "{}"
-        if self._put_on_single_line(o):
-            return (
-                "{"
-                + ", ".join(
-                    f"{self.encode(k)}: {self.encode(el)}" for k, el in o.items()
-                )
-                + "}"
-            )
+        line = self._encode_inline(o)
+        if line is not None:
+            return "{" + line + "}"
         self.indentation_level += 1
+        indent = self.indent_str
         output = [
-            f"{self.indent_str}{json.dumps(k)}: {self.encode(v)}" for k, v in o.items()
+            f"{indent}{self._encode_key(k)}: {self.encode(v)}" for k, v in o.items()
         ]
 
         self.indentation_level -= 1
         return "{\n" + ",\n".join(output) + "\n" + self.indent_str + "}"
 
+    def _encode_key(self, k) -> str:
+        # Keys of multi-line objects have always been ASCII-escaped
+        if type(k) is not str:
+            return json.dumps(k)
+        key = self._multiline_keys.get(k)
+        if key is None:
+            key = self._multiline_keys[k] = encode_basestring_ascii(k)
+        return key
+
     def iterencode(self, o, **kwargs):
         """Required to also work with `json.dump`."""
-        return self.encode(o)
-
-    def _put_on_single_line(self, o):
-        return (
-            self._primitives_only(o)
-            and len(o) <= self.MAX_ITEMS
-            and len(str(o)) - 2 <= self.MAX_WIDTH
-        )
-
-    def _primitives_only(self, o: list | tuple | dict):
-        if isinstance(o, (list, tuple)):
-            return not any(isinstance(el, self.CONTAINER_TYPES) for el in o)
-        elif isinstance(o, dict):
-            return not any(isinstance(el, self.CONTAINER_TYPES) for el in o.values())
+        # One chunk, so json.dump makes a single write instead of one per character
+        return iter((self.encode(o),))
 
     @property
     def indent_str(self) -> str:
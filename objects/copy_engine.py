@@ -0,0 +1,371 @@
+import errno
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from objects.file_hasher import FileHasher
+from objects.metadata_cache import MetadataCache
+from objects.token_bucket import TokenBucket
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux ioctl that clones a whole file on copy-on-write filesystems
+FICLONE = 0x40049409
+
+# Errors that mean a link mode can't work between these two folders at all
+UNSUPPORTED_ERRORS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+    errno.ENOSYS, errno.EPERM, errno.EMLINK}
+
+
+def replace_file(target: Path, write: Callable[[BinaryIO], None]):
+    """
+    Writes a new file beside the target, then renames it over the target.
+    A target hard linked to its source by an earlier run is swapped out
+    rather than written through, so the source is never touched.
+    :param write: Fills the new file
+    """
+
+    temporary = target.with_name(f".{target.name}.spindex-copy")
+
+    try:
+        with open(temporary, "wb") as fp:
+            write(fp)
+        os.replace(temporary, target)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+class LinkMode(str, Enum):
+
+    copy = "copy"
+    hardlink = "hardlink"
+    reflink = "reflink"
+    copy_file_range = "copy_file_range"
+
+
+class CopyReport:
+    """Totals gathered while the copy engine runs"""
+
+    def __init__(self):
+        self.files_copied: int = 0
+        self.bytes_copied: int = 0
+        self.files_linked: int = 0
+        self.files_fallen_back: int = 0
+        self.files_skipped: int = 0
+        self.bytes_skipped: int = 0
+        self.seconds: float = 0.0
+        self.errors: list[str] = []
+
+    def __str__(self):
+        megabytes = self.bytes_copied / 1_000_000
+        summary = (f"Copied {self.files_copied} files ({megabytes:.1f} MB) "
+                   f"in {self.seconds:.2f}s: "
+                   f"{self.files_per_second:.0f} files/s, "
+                   f"{self.bytes_per_second / 1_000_000:.1f} MB/s")
+
+        if self.files_linked or self.files_fallen_back:
+            summary += (f"\n{self.files_linked} placed without copying data, "
+                        f"{self.files_fallen_back} fell back to a normal copy")
+
+        if self.files_skipped:
+            summary += (f"\nSkipped {self.files_skipped} unchanged files "
+                        f"({self.bytes_skipped / 1_000_000:.1f} MB saved)")
+
+        return summary
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_copied / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_copied / self.seconds if self.seconds else 0.0
+
+
+class CopyEngine:
+
+    PROGRESS_INTERVAL = 1.0
+    """Seconds between progress reports while files are copied."""
+
+    TRANSFORMED_CACHE_KIND = "transformed"
+    """What targets written through the transform are filed under in the
+    cache, so an untransformed copy is never taken for a transformed one."""
+
+    def __init__(
+            self,
+            workers: int = 8,
+            incremental: bool = False,
+            checksum: bool = False,
+            link_mode: LinkMode = LinkMode.copy,
+            bytes_per_second: int | None = None,
+            files_per_second: float | None = None,
+            on_progress: Callable[[CopyReport], None] | None = None,
+            transform: Callable[[str, bytes], bytes] | None = None,
+            cache: MetadataCache | None = None):
+        """
+        :param bytes_per_second: Most bytes to copy per second, if limited
+        :param files_per_second: Most files to place per second, if limited
+        :param on_progress: Called with the report so far, now and then
+        :param transform: Changes each file's contents on the way,
+            given its name.  Files are always copied when it's set.
+        :param cache: Hashes from earlier runs, for checksum mode, and
+            the targets that were written through the transform
+        """
+
+        if type(workers) is not int:
+            raise TypeError("workers must be an integer")
+
+        if workers < 1:
+            raise ValueError("workers cannot be less than 1")
+
+        self.workers: int = workers
+        self.incremental: bool = incremental or checksum
+        self.checksum: bool = checksum
+        self.link_mode: LinkMode = LinkMode(link_mode)
+        self.on_progress: Callable[[CopyReport], None] | None = on_progress
+        self.transform: Callable[[str, bytes], bytes] | None = transform
+        self.__cache: MetadataCache = \
+            MetadataCache() if cache is None else cache
+        self.__hasher = FileHasher(cache=self.__cache)
+
+        # Shared by every worker, so the limits hold for the whole copy
+        self.__byte_bucket: TokenBucket | None = \
+            None if bytes_per_second is None else TokenBucket(bytes_per_second)
+        self.__file_bucket: TokenBucket | None = \
+            None if files_per_second is None else TokenBucket(files_per_second)
+
+        # Set once the link mode fails in a way that will never succeed
+        self.__link_unsupported: bool = (
+            self.link_mode == LinkMode.reflink and fcntl is None or
+            self.link_mode == LinkMode.copy_file_range and
+            not hasattr(os, "copy_file_range"))
+
+    def copy_files(
+            self,
+            files: list[tuple[Path, Path]],
+            existing_targets: set[Path] | None = None) -> CopyReport:
+        """
+        Copies files, creating every target folder once up front.
+        A file that fails is recorded in the report, and the rest carry on.
+        :param files: (source, target) pairs of full file paths
+        :param existing_targets: Every file already in the target, if known.
+            In incremental mode, targets missing from it are copied
+            without being looked at first.
+        :return: A report of what was copied, how fast, and what failed
+        """
+
+        report = CopyReport()
+        start = time.perf_counter()
+
+        failed_folders = self.__make_folders(
+            {target.parent for _, target in files}, report)
+        pending = [(s, t) for s, t in files if t.parent not in failed_folders]
+
+        def copy_file(paths: tuple[Path, Path]):
+            return self.__copy_file(paths, existing_targets)
+
+        # A single worker copies in this thread, without a pool
+        if self.workers == 1:
+            self.__collect(map(copy_file, pending), report, start)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                self.__collect(pool.map(copy_file, pending), report, start)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    def __make_folders(folders: set[Path], report: CopyReport) -> set[Path]:
+
+        failed: set[Path] = set()
+
+        # Sorted, so parents are created before their children
+        for folder in sorted(folders):
+            try:
+                folder.mkdir(parents=True, exist_ok=True)
+            except OSError as error:
+                failed.add(folder)
+                report.errors.append(f"{folder} <- {error}")
+
+        return failed
+
+    def __copy_file(
+            self,
+            paths: tuple[Path, Path],
+            existing_targets: set[Path] | None
+    ) -> tuple[Path, int, LinkMode | None, str | None]:
+        """
+        :return: The source, its size, the way it was placed in the target
+            (None when it was skipped), and an error message if it failed
+        """
+
+        source, target = paths
+
+        try:
+            if self.incremental and self.__is_unchanged(
+                    source, target, existing_targets):
+                return source, source.stat().st_size, None, None
+
+            self.throttle(source.stat().st_size)
+            method = self.__place_file(source, target)
+            return source, target.stat().st_size, method, None
+        except shutil.SameFileError:
+            # Already hard linked by an earlier run, so nothing to copy
+            return source, source.stat().st_size, None, None
+        except OSError as error:
+            return source, 0, None, str(error)
+
+    def throttle(self, size: int):
+        """
+        Waits until the rate limits allow another file to be placed.
+        Also used for files that are placed some other way, such as
+        out of a zip, so they count against the same limits.
+        :param size: The file's size in bytes
+        """
+
+        if self.__file_bucket is not None:
+            self.__file_bucket.take()
+
+        if self.__byte_bucket is not None:
+            self.__byte_bucket.take(size)
+
+    def __place_file(self, source: Path, target: Path) -> LinkMode:
+        """Uses the link mode if it can, and a normal copy if it can't"""
+
+        if self.transform is not None:
+            data = self.transform(str(source), source.read_bytes())
+            replace_file(target, lambda fp: fp.write(data))
+            shutil.copystat(source, target)
+            self.__cache.put(target.stat(), self.TRANSFORMED_CACHE_KIND, {})
+            return LinkMode.copy
+
+        if self.link_mode != LinkMode.copy and not self.__link_unsupported:
+            try:
+                if self.link_mode == LinkMode.hardlink:
+                    self.__hardlink(source, target)
+                elif self.link_mode == LinkMode.reflink:
+                    self.__reflink(source, target)
+                else:
+                    self.__copy_file_range(source, target)
+                return self.link_mode
+            except OSError as error:
+                if error.errno in UNSUPPORTED_ERRORS:
+                    self.__link_unsupported = True
+
+        shutil.copy2(source, target)
+        return LinkMode.copy
+
+    @staticmethod
+    def __hardlink(source: Path, target: Path):
+
+        # Link beside the target, then rename over it, so an existing
+        # target is replaced in one step
+        temporary = target.with_name(f".{target.name}.spindex-link")
+        temporary.unlink(missing_ok=True)
+        os.link(source, temporary)
+
+        try:
+            os.replace(temporary, target)
+        finally:
+            # Renaming onto another link to the same file does nothing
+            temporary.unlink(missing_ok=True)
+
+    @staticmethod
+    def __reflink(source: Path, target: Path):
+
+        with open(source, "rb") as src:
+            replace_file(target, lambda dst: fcntl.ioctl(
+                dst.fileno(), FICLONE, src.fileno()))
+
+        shutil.copystat(source, target)
+
+    @staticmethod
+    def __copy_file_range(source: Path, target: Path):
+
+        def write(dst: BinaryIO):
+            remaining = os.fstat(src.fileno()).st_size
+
+            # The kernel may copy less than asked for, so keep going
+            while remaining > 0:
+                copied = os.copy_file_range(
+                    src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+
+        with open(source, "rb") as src:
+            replace_file(target, write)
+
+        shutil.copystat(source, target)
+
+    def __is_unchanged(
+            self,
+            source: Path,
+            target: Path,
+            existing_targets: set[Path] | None) -> bool:
+        """
+        Size is compared first.  Then either the contents (checksum mode)
+        or the modification time, which copy2 carries over from the source.
+        Transformed files match on modification time, and only if the
+        target is known to have been written through the transform.
+        """
+
+        if existing_targets is not None and target not in existing_targets:
+            return False
+
+        try:
+            target_stat = target.stat()
+        except FileNotFoundError:
+            return False
+
+        source_stat = source.stat()
+
+        # A target copied as it was, by a run without the transform,
+        # has the same modification time but was never transformed
+        if self.transform is not None:
+            return source_stat.st_mtime_ns == target_stat.st_mtime_ns and \
+                self.__cache.get(
+                    target_stat, self.TRANSFORMED_CACHE_KIND) is not None
+
+        if source_stat.st_size != target_stat.st_size:
+            return False
+
+        if self.checksum:
+            return (self.__hasher.hash_file(source) ==
+                    self.__hasher.hash_file(target))
+
+        return source_stat.st_mtime_ns == target_stat.st_mtime_ns
+
+    def __collect(self, results, report: CopyReport, start: float):
+
+        reported = start
+
+        for source, size, method, error in results:
+            if error is not None:
+                report.errors.append(f"{source} <- {error}")
+            elif method is None:
+                report.files_skipped += 1
+                report.bytes_skipped += size
+            else:
+                report.files_copied += 1
+                report.bytes_copied += size
+
+                if method != LinkMode.copy:
+                    report.files_linked += 1
+                elif self.link_mode != LinkMode.copy:
+                    report.files_fallen_back += 1
+
+            now = time.perf_counter()
+            if self.on_progress is not None and \
+                    now - reported >= self.PROGRESS_INTERVAL:
+                report.seconds = now - start
+                self.on_progress(report)
+                reported = now
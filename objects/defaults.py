@@ -4,11 +4,29 @@ from objects.typed_dictionaries import SoundEventDefaults, SoundEvent, Sound
 
 
 class Defaults:
-    def __init__(self, data: dict[str, SoundEventDefaults]):
+    def __init__(
+            self,
+            data: dict[str, SoundEventDefaults],
+            sound_values: dict[str, SoundEventDefaults] | None = None,
+            sound_overrides: dict[str, SoundEventDefaults] | None = None):
+        """
+        :param data: Defaults for each event, and for "all" events
+        :param sound_values: Values worked out for individual sounds,
+            keyed by sound name.  Used where data sets nothing.
+        :param sound_overrides: Values set on individual sounds,
+            keyed by sound name.  Used instead of anything in data.
+        """
 
         if self.__validate_data(data):
             self.data: dict[str, SoundEventDefaults] = data
 
+        self.sound_values: dict[str, SoundEventDefaults] = \
+            sound_values if sound_values is not None else {}
+
+        if self.__validate_data(sound_overrides or {}):
+            self.sound_overrides: dict[str, SoundEventDefaults] = \
+                sound_overrides if sound_overrides is not None else {}
+
     def __str__(self):
         return f"{self.data}"
 
@@ -94,15 +112,21 @@ class Defaults:
 
         a: SoundEventDefaults = self.data["all"] if "all" in self.data else SoundEventDefaults()
         d: SoundEventDefaults = self.data[event_name] if event_name in self.data else SoundEventDefaults()
-
-        default_volume = d["volume"] if "volume" in d else a["volume"] if "volume" in a else None
-        default_weight = d["weight"] if "weight" in d else a["weight"] if "weight" in a else None
+        g: SoundEventDefaults = self.sound_values.get(sound_name, SoundEventDefaults())
+        o: SoundEventDefaults = self.sound_overrides.get(sound_name, SoundEventDefaults())
+
+        default_volume = \
+            o["volume"] if "volume" in o else \
+            d["volume"] if "volume" in d else a["volume"] if "volume" in a else None
+        default_weight = \
+            o["weight"] if "weight" in o else \
+            d["weight"] if "weight" in d else a["weight"] if "weight" in a else None
         default_pitch = d["pitch"] if "pitch" in d else a["pitch"] if "pitch" in a else None
-        default_stream = d["stream"] if "stream" in d else a["stream"] if "stream" in a else None
+        default_stream = d["stream"] if "stream" in d else a["stream"] if "stream" in a else g.get("stream")
         default_attenuation = \
             d["attenuation_distance"] if "attenuation_distance" in d else \
             a["attenuation_distance"] if "attenuation_distance" in a else None
-        default_preload = d["preload"] if "preload" in d else a["preload"] if "preload" in a else None
+        default_preload = d["preload"] if "preload" in d else a["preload"] if "preload" in a else g.get("preload")
         default_type = d["type"] if "type" in d else a["type"] if "type" in a else None
 
         sound: Sound = Sound(name=sound_name)
@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+class DeploymentError(Exception):
+    pass
+
+
+class Deployment:
+    """
+    Copies files into a staging folder beside the target sounds folder,
+    then swaps them in with renames.  A journal in the staging folder
+    lets an interrupted deployment be resumed or rolled back.
+    """
+
+    STAGING_FOLDER = ".spindex-staging"
+    """Lives in the target namespace folder, so renames never cross filesystems."""
+
+    def __init__(self, sound_path: Path, json_path: Path):
+
+        self.sound_path: Path = sound_path
+        self.json_path: Path = json_path
+        self.staging_path: Path = sound_path.parent / self.STAGING_FOLDER
+        self.staged_sound_path: Path = self.staging_path / "sounds"
+        self.backup_path: Path = self.staging_path / "backup"
+        self.journal_path: Path = self.staging_path / "journal.jsonl"
+        self.staged_json_path: Path = json_path.with_name(
+            f".{json_path.name}.spindex-new")
+        self.backup_json_path: Path = self.backup_path / json_path.name
+
+    def is_interrupted(self) -> bool:
+        return self.journal_path.exists()
+
+    def is_committing(self) -> bool:
+        return self.__read_journal()[0] == "committing"
+
+    def begin(self):
+        """Starts (or restarts) staging.  Files already staged are kept."""
+
+        self.staged_sound_path.mkdir(parents=True, exist_ok=True)
+
+        with open(self.journal_path, "w") as fp:
+            self.__write_entry(fp, {"state": "staging"})
+
+    def commit(
+            self,
+            files: list[Path] | None = None,
+            json_data: bytes | None = None):
+        """
+        Moves every staged file into the target, keeping a backup of
+        anything it replaces, then swaps in the new sounds.json.
+        Called without arguments, finishes an interrupted commit.
+        :param files: The staged files, relative to the sounds folder
+        :param json_data: The new sounds.json, or None to leave it alone
+        """
+
+        state, journal_files, has_json = self.__read_journal()
+
+        if state != "committing":
+            if files is None:
+                raise DeploymentError("Nothing has been staged to commit.")
+
+            if json_data is not None:
+                with open(self.staged_json_path, "wb") as fp:
+                    fp.write(json_data)
+                    fp.flush()
+                    os.fsync(fp.fileno())
+
+            journal_files = [f.as_posix() for f in files]
+            has_json = json_data is not None
+
+            with open(self.journal_path, "a") as fp:
+                self.__write_entry(fp, {
+                    "state": "committing",
+                    "json": has_json,
+                    "files": journal_files})
+
+        # Create every folder once, rather than once per file
+        for folder in sorted({Path(f).parent for f in journal_files}):
+            (self.sound_path / folder).mkdir(parents=True, exist_ok=True)
+
+        for file in journal_files:
+            self.__swap_in(file)
+
+        # Once the new file has been renamed over it, there is no temp file
+        if has_json and self.staged_json_path.exists():
+            if self.json_path.exists():
+                # Only created so far if a sound file was replaced
+                self.backup_json_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(self.json_path, self.backup_json_path)
+            os.replace(self.staged_json_path, self.json_path)
+
+        shutil.rmtree(self.staging_path)
+
+    def rollback(self):
+        """Puts the target back the way it was before the deployment"""
+
+        state, journal_files, has_json = self.__read_journal()
+
+        # Nothing in the target has been touched until the commit starts
+        if state == "committing":
+            for file in reversed(journal_files):
+                self.__swap_out(file)
+
+            if has_json and not self.staged_json_path.exists() and \
+                    self.backup_json_path.exists():
+                shutil.move(self.backup_json_path, self.json_path)
+
+        self.staged_json_path.unlink(missing_ok=True)
+        shutil.rmtree(self.staging_path)
+
+    def __swap_in(self, file: str):
+        """
+        Each step can be repeated safely, so an interrupted commit can be
+        resumed from whatever state the file was left in.
+        """
+
+        staged = self.staged_sound_path / file
+        target = self.sound_path / file
+        backup = self.backup_path / "sounds" / file
+
+        # Already moved into place
+        if not staged.exists():
+            return
+
+        if target.exists() and not backup.exists():
+            backup.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(target, backup)
+
+        os.replace(staged, target)
+
+    def __swap_out(self, file: str):
+
+        staged = self.staged_sound_path / file
+        target = self.sound_path / file
+        backup = self.backup_path / "sounds" / file
+
+        # Never moved into place, though the original may have been set aside
+        if staged.exists():
+            if backup.exists() and not target.exists():
+                os.replace(backup, target)
+            return
+
+        if backup.exists():
+            os.replace(backup, target)
+        else:
+            # The file was new to the target
+            target.unlink(missing_ok=True)
+
+    def __read_journal(self) -> tuple[str | None, list[str], bool]:
+
+        if not self.journal_path.exists():
+            return None, [], False
+
+        state: str | None = None
+        files: list[str] = []
+        has_json = False
+
+        with open(self.journal_path) as fp:
+            for line in fp:
+
+                # A line cut short by a crash was never acted upon
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+                state = entry["state"]
+                files = entry.get("files", files)
+                has_json = entry.get("json", has_json)
+
+        return state, files, has_json
+
+    @staticmethod
+    def __write_entry(fp, entry: dict):
+
+        fp.write(json.dumps(entry) + "\n")
+        fp.flush()
+        os.fsync(fp.fileno())
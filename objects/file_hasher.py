@@ -0,0 +1,93 @@
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from objects.metadata_cache import MetadataCache
+
+
+class FileHasher:
+    """Hashes files over memory maps, several files at a time"""
+
+    CHUNK_SIZE = 1 << 20
+    """Bytes handed to the hash at once, so large files don't stall a worker."""
+
+    def __init__(
+            self,
+            workers: int = 8,
+            algorithm: str = "sha256",
+            cache: MetadataCache | None = None):
+        """
+        :param workers: How many files to hash at once
+        :param algorithm: Any algorithm hashlib knows
+        :param cache: Hashes from earlier runs, for files that haven't changed
+        """
+
+        if type(workers) is not int:
+            raise TypeError("workers must be an integer")
+
+        if workers < 1:
+            raise ValueError("workers cannot be less than 1")
+
+        # Fail now, rather than once per file later on
+        hashlib.new(algorithm)
+
+        self.workers: int = workers
+        self.algorithm: str = algorithm
+        self.cache: MetadataCache = MetadataCache() if cache is None else cache
+
+    def hash_file(self, path: Path) -> str:
+        """
+        Hashes one file.  hashlib releases the GIL while it works on each
+        chunk, so hash_files gets real parallelism from plain threads.
+        :param path: The file to hash
+        :return: The hex digest of the file's contents
+        """
+
+        digest = hashlib.new(self.algorithm)
+
+        with open(path, "rb") as fp:
+            stat = os.fstat(fp.fileno())
+
+            cached = self.cache.get(stat, self.algorithm)
+            if cached is not None:
+                return cached["digest"]
+
+            # Empty files can't be memory mapped
+            size = stat.st_size
+            if size > 0:
+                with (mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                      memoryview(mapped) as view):
+                    for offset in range(0, size, self.CHUNK_SIZE):
+                        digest.update(view[offset:offset + self.CHUNK_SIZE])
+
+        self.cache.put(stat, self.algorithm, {"digest": digest.hexdigest()})
+        return digest.hexdigest()
+
+    def hash_files(self, paths: list[Path]) -> tuple[dict[Path, str], list[str]]:
+        """
+        Hashes many files on a thread pool
+        :param paths: The files to hash
+        :return: A tuple containing the following items:
+            The hex digest of every file that could be read
+            A warning for each file that couldn't
+        """
+
+        digests: dict[Path, str] = {}
+        warnings: list[str] = []
+
+        def hash_one(path: Path) -> tuple[Path, str | None, str | None]:
+            try:
+                return path, self.hash_file(path), None
+            except OSError as error:
+                return path, None, str(error)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for path, digest, error in pool.map(hash_one, paths):
+                if error is not None:
+                    warnings.append(f"{path} <- {error}")
+                else:
+                    digests[path] = digest
+
+        return digests, warnings
@@ -0,0 +1,53 @@
+from enum import Enum
+
+from objects.ogg_inspector import OggInfo
+
+
+class LoadingMode(str, Enum):
+
+    stream = "stream"
+    preload = "preload"
+
+
+class LoadingAdvisor:
+    """
+    Suggests how the game should load each sound, from its length and size.
+    Long or large sounds should stream, rather than be decoded into memory
+    all at once.  Short sounds that play all the time should preload, so
+    the first one doesn't stall while it is read from disk.
+    """
+
+    STREAM_SECONDS = 10.0
+    STREAM_BYTES = 1_000_000
+
+    PRELOAD_SECONDS = 1.0
+    PRELOAD_BYTES = 100_000
+
+    STREAMED_CATEGORIES = {"music", "music_disc"}
+    """The game streams these itself, however short they are."""
+
+    FREQUENT_ACTIONS = {
+        "ambient", "attack", "break", "click", "fall", "hit", "hurt",
+        "land", "place", "splash", "step", "swim"}
+    """The last part of the names of events that play over and over."""
+
+    def recommend(self, event_name: str, info: OggInfo) -> LoadingMode | None:
+        """
+        :param event_name: The event the sound belongs to
+        :param info: What the sound file's headers say
+        :return: How the sound should load, or None to leave it to the game
+        """
+
+        parts = event_name.split(".")
+
+        if parts[0] in self.STREAMED_CATEGORIES or \
+                info.duration >= self.STREAM_SECONDS or \
+                info.size >= self.STREAM_BYTES:
+            return LoadingMode.stream
+
+        if parts[-1] in self.FREQUENT_ACTIONS and \
+                info.duration <= self.PRELOAD_SECONDS and \
+                info.size <= self.PRELOAD_BYTES:
+            return LoadingMode.preload
+
+        return None
@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class MetadataCache:
+    """
+    Remembers what was worked out about each file between runs (its
+    headers, its hash), in a SQLite database shared by every stage.
+    Entries are keyed by device and inode, and only count while the
+    file's size and modification time still match, so a file is only
+    read again once it has changed.  Used from several threads at once.
+    """
+
+    VERSION = 1
+
+    BATCH_SIZE = 500
+    """New entries are written this many at a time, in one transaction."""
+
+    def __init__(self, path: Path | None = None):
+        """
+        :param path: The database file, or None to keep the cache in memory
+        :raise sqlite3.Error: If the database can't be opened or created
+        """
+
+        self.path: Path | None = path
+        self.__lock = threading.Lock()
+        self.__pending: dict[tuple[int, int, str], tuple] = {}
+
+        try:
+            self.__connection = self.__open()
+        except sqlite3.DatabaseError:
+            # A cache in memory can't be damaged, so failing there is final
+            if path is None:
+                raise
+
+            # A cache can always be rebuilt, so a damaged one is replaced
+            path.unlink(missing_ok=True)
+            self.__connection = self.__open()
+
+    def __open(self) -> sqlite3.Connection:
+
+        connection = sqlite3.connect(
+            ":memory:" if self.path is None else self.path,
+            check_same_thread=False)
+
+        try:
+            # Readers aren't blocked while a batch is written
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            version, = connection.execute("PRAGMA user_version").fetchone()
+            if version != self.VERSION:
+                connection.execute("DROP TABLE IF EXISTS entries")
+                connection.execute(f"PRAGMA user_version={self.VERSION}")
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "device INTEGER, inode INTEGER, kind TEXT, "
+                "size INTEGER, mtime_ns INTEGER, data TEXT, "
+                "PRIMARY KEY (device, inode, kind)) WITHOUT ROWID")
+            connection.commit()
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+
+        return connection
+
+    def get(self, stat: os.stat_result, kind: str) -> dict | None:
+        """
+        :param stat: The file's current status
+        :param kind: What was worked out, such as "ogg" or "sha256"
+        :return: The entry, or None if there isn't one for the file as it is
+        """
+
+        key = (stat.st_dev, stat.st_ino, kind)
+
+        with self.__lock:
+            row = self.__pending.get(key)
+            if row is None:
+                row = self.__connection.execute(
+                    "SELECT device, inode, kind, size, mtime_ns, data "
+                    "FROM entries WHERE device = ? AND inode = ? AND kind = ?",
+                    key).fetchone()
+
+        if row is None or row[3] != stat.st_size or row[4] != stat.st_mtime_ns:
+            return None
+
+        return json.loads(row[5])
+
+    def put(self, stat: os.stat_result, kind: str, entry: dict):
+        """Replaces whatever was known about the file before it changed"""
+
+        key = (stat.st_dev, stat.st_ino, kind)
+
+        with self.__lock:
+            self.__pending[key] = (
+                *key, stat.st_size, stat.st_mtime_ns, json.dumps(entry))
+
+            if len(self.__pending) >= self.BATCH_SIZE:
+                self.__flush()
+
+    def save(self):
+        """Writes any entries still waiting for a batch"""
+
+        with self.__lock:
+            self.__flush()
+
+    def close(self):
+
+        self.save()
+        self.__connection.close()
+
+    def __flush(self):
+
+        if not self.__pending:
+            return
+
+        # A cache that can't be written only costs time on the next run
+        try:
+            with self.__connection:
+                self.__connection.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    list(self.__pending.values()))
+        except sqlite3.Error:
+            pass
+
+        self.__pending = {}
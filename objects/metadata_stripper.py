@@ -0,0 +1,147 @@
+import struct
+import threading
+from pathlib import Path
+
+from objects.ogg_inspector import (
+    CONTINUED_PACKET, PAGE_HEADER, OggPage, ogg_crc, read_comments,
+    read_identification)
+
+# Page granule position when no packet ends on the page
+NO_GRANULE = -1
+
+
+def lace(packet: bytes) -> list[int]:
+    """The segment lengths an Ogg page uses to carry a packet"""
+
+    return [255] * (len(packet) // 255) + [len(packet) % 255]
+
+
+def strip_comments(buffer) -> bytes:
+    """
+    Empties a Vorbis file's comment header, keeping only the vendor string.
+    The comment and setup headers are laid out again over exactly as many
+    pages as they filled before, so every audio page keeps its sequence
+    number and is copied byte for byte.
+    :param buffer: The whole file
+    :return: The file without its comments, or the buffer itself if it
+        had none
+    :raise ValueError: If the headers can't be rewritten
+    """
+
+    first_page, _, _ = read_identification(buffer)
+
+    # The comment and setup headers start on the second page,
+    # and the audio starts on a fresh page after them
+    pages: list[OggPage] = []
+    packets: list[bytes] = []
+    parts: list[bytes] = []
+    position = first_page.end
+
+    while len(packets) < 2:
+        page = OggPage(buffer, position)
+        if page.serial_number != first_page.serial_number:
+            raise ValueError("Vorbis headers are split between streams")
+
+        offset = page.data_offset
+        for segment in page.segments:
+            if len(packets) == 2:
+                raise ValueError("Audio starts on the last header page")
+
+            parts.append(bytes(buffer[offset:offset + segment]))
+            offset += segment
+            if segment < 255:
+                packets.append(b"".join(parts))
+                parts = []
+
+        pages.append(page)
+        position = page.end
+
+    comments, setup = packets
+    if len(read_comments(comments)) == 0:
+        return buffer
+
+    vendor_length, = struct.unpack_from("<I", comments, 7)
+    comments = comments[:11 + vendor_length] + struct.pack("<I", 0) + b"\x01"
+
+    segments = lace(comments) + lace(setup)
+    if len(segments) < len(pages):
+        raise ValueError(
+            "Vorbis headers would fill fewer pages than before, "
+            "so the audio pages would have to be renumbered")
+
+    data = comments + setup
+    header_pages: list[bytes] = []
+    continued = False
+    taken = 0
+    offset = 0
+
+    for index, page in enumerate(pages):
+
+        # Fill each page, leaving a segment for every page still to come
+        remaining_pages = len(pages) - index - 1
+        count = min(255, len(segments) - taken - remaining_pages)
+        if index == len(pages) - 1 and taken + count < len(segments):
+            raise ValueError("Vorbis headers don't fit on their pages")
+
+        page_segments = segments[taken:taken + count]
+        taken += count
+
+        size = sum(page_segments)
+        ends_packet = any(segment < 255 for segment in page_segments)
+
+        header = PAGE_HEADER.pack(
+            b"OggS", 0, CONTINUED_PACKET if continued else 0,
+            0 if ends_packet else NO_GRANULE, page.serial_number,
+            page.sequence_number, 0, len(page_segments))
+        new_page = header + bytes(page_segments) + data[offset:offset + size]
+        header_pages.append(
+            new_page[:22] + struct.pack("<I", ogg_crc(new_page)) +
+            new_page[26:])
+
+        continued = page_segments[-1] == 255
+        offset += size
+
+    return (bytes(buffer[:first_page.end]) + b"".join(header_pages) +
+            bytes(buffer[position:]))
+
+
+class MetadataStripper:
+    """
+    Strips comments, such as titles and album art, from sound files as
+    they are copied or zipped, and keeps count of what that saved.
+    Used from several threads at once.
+    """
+
+    def __init__(self):
+        self.saved: dict[str, int] = {}
+        self.errors: list[str] = []
+        self.__lock = threading.Lock()
+
+    def __str__(self):
+        total = sum(self.saved.values())
+        return (f"Stripped metadata from {len(self.saved)} files, "
+                f"saving {total / 1_000:.1f} KB")
+
+    def strip(self, name: str, data: bytes) -> bytes:
+        """
+        :param name: The file's name, used for its suffix and the report
+        :param data: The file's contents
+        :return: The contents without metadata, or as they were if the file
+            isn't an ogg, had none, or couldn't be rewritten
+        """
+
+        if Path(name).suffix.lower() != ".ogg":
+            return data
+
+        try:
+            stripped = strip_comments(data)
+        except ValueError as error:
+            with self.__lock:
+                self.errors.append(f"{name} <- {error}")
+            return data
+
+        if len(stripped) < len(data):
+            with self.__lock:
+                self.saved[name] = len(data) - len(stripped)
+
+        return stripped
@@ -0,0 +1,446 @@
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from objects.metadata_cache import MetadataCache
+from objects.pack_archive import ArchiveMember
+
+CAPTURE_PATTERN = b"OggS"
+
+# Capture pattern, version, header type, granule position,
+# serial number, sequence number, CRC and segment count
+PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+
+# Header type flags
+CONTINUED_PACKET = 0x01
+FIRST_PAGE = 0x02
+LAST_PAGE = 0x04
+
+MAX_PAGE_SIZE = PAGE_HEADER.size + 255 + 255 * 255
+"""The largest an Ogg page can be, so the last page is within this of the end."""
+
+# Packet type, "vorbis", version, channels, sample rate,
+# the three bitrates, block sizes and the framing flag
+IDENTIFICATION_HEADER = struct.Struct("<B6sIBIiiiBB")
+
+COMMENT_HEADER = b"\x03vorbis"
+
+# Every byte value with its bits in the opposite order
+REVERSED_BITS = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+OVERRIDE_PREFIX = "SPINDEX_"
+"""Comments named like SPINDEX_VOLUME set values for the sound itself."""
+
+
+class OggInfo:
+    """What the headers of an Ogg Vorbis file say about it"""
+
+    def __init__(
+            self,
+            channels: int,
+            sample_rate: int,
+            duration: float,
+            size: int,
+            tags: int = 0,
+            overrides: dict[str, str] | None = None):
+        """
+        :param channels: 1 for mono, 2 for stereo, and so on
+        :param sample_rate: Samples per second, per channel
+        :param duration: Playback time in seconds
+        :param size: The file's size in bytes
+        :param tags: How many metadata comments (titles, artists, album
+            art) the file carries, not counting overrides
+        :param overrides: The value of each SPINDEX_ comment,
+            keyed by the rest of its name in lower case
+        """
+
+        self.channels: int = channels
+        self.sample_rate: int = sample_rate
+        self.duration: float = duration
+        self.size: int = size
+        self.tags: int = tags
+        self.overrides: dict[str, str] = {} if overrides is None else overrides
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OggInfo":
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __eq__(self, other):
+        return isinstance(other, OggInfo) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"OggInfo({vars(self)})"
+
+
+class OggPage:
+    """One page of an Ogg stream, parsed in place from a buffer"""
+
+    def __init__(self, buffer, offset: int):
+        """
+        :param buffer: The whole file, or as much of it as was read
+        :param offset: Where the page starts in the buffer
+        :raise ValueError: If there isn't a whole, valid page there
+        """
+
+        if len(buffer) - offset < PAGE_HEADER.size:
+            raise ValueError("Ogg page is cut short")
+
+        (capture_pattern, version, self.header_type, self.granule_position,
+         self.serial_number, self.sequence_number, self.crc,
+         segment_count) = PAGE_HEADER.unpack_from(buffer, offset)
+
+        if capture_pattern != CAPTURE_PATTERN:
+            raise ValueError("No Ogg capture pattern where a page should start")
+
+        if version != 0:
+            raise ValueError(f"Unknown Ogg version {version}")
+
+        self.offset: int = offset
+        self.data_offset: int = offset + PAGE_HEADER.size + segment_count
+        self.segments: bytes = bytes(
+            buffer[offset + PAGE_HEADER.size:self.data_offset])
+        self.end: int = self.data_offset + sum(self.segments)
+
+        if self.data_offset > len(buffer) or self.end > len(buffer):
+            raise ValueError("Ogg page is cut short")
+
+    def checksum(self, buffer) -> int:
+        """Works out what the page's CRC should be, from its contents"""
+
+        return ogg_crc(
+            bytes(buffer[self.offset:self.offset + 22]) + b"\x00" * 4 +
+            bytes(buffer[self.offset + 26:self.end]))
+
+    def first_packet(self, buffer) -> bytes | None:
+        """
+        :return: The first packet that starts on this page,
+            or None if it carries on to the next page
+        """
+
+        if self.header_type & CONTINUED_PACKET:
+            raise ValueError("Ogg page starts partway through a packet")
+
+        length = 0
+        for segment in self.segments:
+            length += segment
+            # A segment shorter than 255 bytes ends the packet
+            if segment < 255:
+                return bytes(buffer[self.data_offset:self.data_offset + length])
+
+        return None
+
+
+def ogg_crc(data: bytes) -> int:
+    """
+    Ogg's CRC-32 takes each byte's most significant bit first, and zlib's
+    takes the least significant first.  So the bytes are reversed through
+    a table, zlib's table-driven C code does the work, and the result is
+    reversed back.  That is many times faster than a loop in Python.
+    :param data: A whole page, with its CRC field set to zero
+    """
+
+    reflected = zlib.crc32(data.translate(REVERSED_BITS), 0xFFFFFFFF)
+    return int(f"{reflected ^ 0xFFFFFFFF:032b}"[::-1], 2)
+
+
+def read_identification(buffer) -> tuple[OggPage, int, int]:
+    """
+    Checks that a buffer starts with an Ogg Vorbis stream
+    :param buffer: The file's contents, or at least its first page
+    :return: The first page, the channel count and the sample rate
+    :raise ValueError: Saying what is wrong with the file
+    """
+
+    if bytes(buffer[:4]) != CAPTURE_PATTERN:
+        raise ValueError("Not an Ogg file")
+
+    page = OggPage(buffer, 0)
+
+    if not page.header_type & FIRST_PAGE:
+        raise ValueError("First Ogg page isn't marked as the start of a stream")
+
+    packet = page.first_packet(buffer)
+    if packet is None or len(packet) < IDENTIFICATION_HEADER.size:
+        raise ValueError("Vorbis identification header is cut short")
+
+    (packet_type, codec, version, channels, sample_rate,
+     _, _, _, _, framing) = IDENTIFICATION_HEADER.unpack_from(packet)
+
+    if packet_type != 1 or codec != b"vorbis":
+        raise ValueError("Ogg stream isn't Vorbis audio")
+
+    if version != 0 or channels == 0 or sample_rate == 0 or not framing & 1:
+        raise ValueError("Vorbis identification header is invalid")
+
+    return page, channels, sample_rate
+
+
+def read_packet(buffer, page: OggPage) -> bytes:
+    """
+    Reads the first packet that starts on a page, following it onto
+    as many pages as it carries on to
+    :raise ValueError: If the file ends partway through the packet
+    """
+
+    if page.header_type & CONTINUED_PACKET:
+        raise ValueError("Ogg page starts partway through a packet")
+
+    parts: list[bytes] = []
+
+    while True:
+        position = page.data_offset
+        for segment in page.segments:
+            parts.append(bytes(buffer[position:position + segment]))
+            position += segment
+            # A segment shorter than 255 bytes ends the packet
+            if segment < 255:
+                return b"".join(parts)
+
+        next_page = OggPage(buffer, page.end)
+        if next_page.serial_number != page.serial_number or \
+                not next_page.header_type & CONTINUED_PACKET:
+            raise ValueError("Ogg packet is cut short")
+        page = next_page
+
+
+def read_comments(packet: bytes) -> list[str]:
+    """
+    Reads the comments from a Vorbis comment header
+    :param packet: The whole header, which is the stream's second packet
+    :return: Each comment, in the form NAME=value
+    :raise ValueError: If the header is cut short or isn't one
+    """
+
+    if packet[:7] != COMMENT_HEADER:
+        raise ValueError("Vorbis comment header is missing")
+
+    try:
+        vendor_length, = struct.unpack_from("<I", packet, 7)
+        position = 11 + vendor_length
+        count, = struct.unpack_from("<I", packet, position)
+        position += 4
+
+        comments: list[str] = []
+        for _ in range(count):
+            length, = struct.unpack_from("<I", packet, position)
+            position += 4
+            if position + length > len(packet):
+                raise ValueError("Vorbis comment header is cut short")
+            comments.append(
+                packet[position:position + length].decode("utf-8", "replace"))
+            position += length
+    except struct.error:
+        raise ValueError("Vorbis comment header is cut short")
+
+    return comments
+
+
+def read_headers(buffer) -> tuple[OggPage, int, int, int, dict[str, str]]:
+    """
+    Reads the identification and comment headers at the start of a file
+    :param buffer: The file's contents, or at least as far as its headers
+    :return: The first page, the channel count, the sample rate, how many
+        metadata comments there are, and the value of each override
+    :raise ValueError: Saying what is wrong with the file
+    """
+
+    page, channels, sample_rate = read_identification(buffer)
+
+    # The comment and setup headers follow on the next page,
+    # so a file cut off within its headers fails here
+    if page.end >= len(buffer):
+        raise ValueError("Ogg file ends after its first page")
+
+    comment_page = OggPage(buffer, page.end)
+    if comment_page.serial_number != page.serial_number:
+        raise ValueError("Vorbis headers are split between streams")
+
+    # Comment names aren't case sensitive
+    tags = 0
+    overrides: dict[str, str] = {}
+    for comment in read_comments(read_packet(buffer, comment_page)):
+        name, _, value = comment.partition("=")
+        if name.upper().startswith(OVERRIDE_PREFIX):
+            overrides[name[len(OVERRIDE_PREFIX):].lower()] = value
+        else:
+            tags += 1
+
+    return page, channels, sample_rate, tags, overrides
+
+
+def read_last_page(buffer, serial_number: int) -> OggPage:
+    """
+    Finds the stream's last page by searching back from the end of the
+    buffer, so only the final page or two of a file are ever read
+    :param buffer: The whole file, as bytes or a memory map
+    :param serial_number: The stream whose last page to find
+    :raise ValueError: If the file doesn't end with a last page
+    """
+
+    start = max(0, len(buffer) - MAX_PAGE_SIZE)
+    position = buffer.rfind(CAPTURE_PATTERN, start)
+
+    while position >= 0:
+        try:
+            page = OggPage(buffer, position)
+        except ValueError:
+            page = None
+
+        # "OggS" can turn up inside audio data, so anything that isn't
+        # a page running right up to the end of the file is skipped
+        if page is None or page.end != len(buffer) or \
+                page.serial_number != serial_number:
+            position = buffer.rfind(CAPTURE_PATTERN, start, position)
+            continue
+
+        if not page.header_type & LAST_PAGE or page.granule_position < 0:
+            break
+
+        return page
+
+    raise ValueError("Ogg file is cut short before its last page")
+
+
+class OggInspector:
+    """
+    Reads just the headers of Ogg Vorbis files, several files at a time.
+    Files on disk are memory mapped, so only the pages that are looked at
+    are ever read.
+    """
+
+    CACHE_KIND = "ogg"
+    """What the inspector's results are filed under in the cache."""
+
+    HEAD_SIZE = 65_536
+    """Bytes read from the start of a file in a zip, which holds the
+    headers of all but files with very large comments, such as album art."""
+
+    def __init__(self, workers: int = 8, cache: MetadataCache | None = None):
+        """
+        :param workers: How many files to inspect at once
+        :param cache: Results from earlier runs, for files on disk
+        """
+
+        if type(workers) is not int:
+            raise TypeError("workers must be an integer")
+
+        if workers < 1:
+            raise ValueError("workers cannot be less than 1")
+
+        self.workers: int = workers
+        self.cache: MetadataCache = \
+            MetadataCache() if cache is None else cache
+
+    def inspect_file(self, source: Path | ArchiveMember) -> OggInfo:
+        """
+        :param source: A file, or a file in a zip
+        :return: What the file's headers say about it
+        :raise ValueError: Saying what is wrong with the file
+        :raise OSError: If the file can't be read
+        """
+
+        if isinstance(source, ArchiveMember):
+            return self.inspect_member(source)
+
+        with open(source, "rb") as fp:
+            stat = os.fstat(fp.fileno())
+
+            cached = self.cache.get(stat, self.CACHE_KIND)
+            if cached is not None:
+                return OggInfo.from_dict(cached)
+
+            # Empty files can't be memory mapped
+            if stat.st_size == 0:
+                raise ValueError("File is empty")
+
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                info = self.inspect_buffer(mapped)
+
+        self.cache.put(stat, self.CACHE_KIND, info.to_dict())
+        return info
+
+    def inspect_member(self, member: ArchiveMember) -> OggInfo:
+        """
+        Reads just the start and the end of a file in a zip, so the
+        audio in between is never read out of it
+        """
+
+        head = member.read_range(0, self.HEAD_SIZE)
+
+        try:
+            headers = read_headers(head)
+        except ValueError:
+            # Headers too big for the first read are read with the rest
+            if len(head) < member.size:
+                return self.inspect_buffer(member.read_bytes())
+            raise
+
+        tail = member.read_range(
+            max(0, member.size - MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+
+        return self.__get_info(headers, tail, member.size)
+
+    def inspect_buffer(self, buffer) -> OggInfo:
+
+        return self.__get_info(read_headers(buffer), buffer, len(buffer))
+
+    @staticmethod
+    def __get_info(
+            headers: tuple[OggPage, int, int, int, dict[str, str]],
+            tail,
+            size: int) -> OggInfo:
+        """
+        :param headers: What read_headers found
+        :param tail: The end of the file, at least its last page
+        :param size: The file's size in bytes
+        """
+
+        page, channels, sample_rate, tags, overrides = headers
+
+        # The last granule position is the number of samples in the file
+        last_page = read_last_page(tail, page.serial_number)
+
+        return OggInfo(
+            channels,
+            sample_rate,
+            last_page.granule_position / sample_rate,
+            size,
+            tags,
+            overrides)
+
+    def inspect_files(
+            self,
+            sources: dict[Path, Path | ArchiveMember]
+    ) -> tuple[dict[Path, OggInfo], list[str]]:
+        """
+        Inspects many files on a thread pool
+        :param sources: The file to read for each sound file
+        :return: A tuple containing the following items:
+            What was found in each file that could be inspected
+            A warning for each file that couldn't
+        """
+
+        results: dict[Path, OggInfo] = {}
+        warnings: list[str] = []
+
+        def inspect(item: tuple[Path, Path | ArchiveMember]):
+            file, source = item
+            try:
+                return file, self.inspect_file(source), None
+            except (OSError, ValueError) as error:
+                return file, None, str(error)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for file, info, error in pool.map(inspect, sources.items()):
+                if error is not None:
+                    warnings.append(f"{file} <- {error}, and will be ignored")
+                else:
+                    results[file] = info
+
+        return results, warnings
@@ -0,0 +1,154 @@
+import mmap
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from objects.ogg_inspector import OggPage
+from objects.pack_archive import ArchiveMember
+
+
+class VerifyReport:
+    """Totals gathered while the pages of many files are checked"""
+
+    def __init__(self):
+        self.files_checked: int = 0
+        self.pages_checked: int = 0
+        self.seconds: float = 0.0
+        self.errors: list[str] = []
+        self.not_checked: list[str] = []
+
+    def __str__(self):
+        summary = (f"Checked {self.pages_checked} pages in "
+                   f"{self.files_checked} files in {self.seconds:.2f}s: "
+                   f"{len(self.errors)} files are corrupt")
+
+        if self.not_checked:
+            summary += f", {len(self.not_checked)} files were not checked"
+
+        return summary
+
+    def write(self, path: Path):
+        """
+        Writes the summary, then one line for each corrupt file,
+        then one for each file that wasn't checked
+        """
+
+        with open(path, "w") as fp:
+            fp.write(f"{self}\n")
+            for error in self.errors:
+                fp.write(f"{error}\n")
+            for file in self.not_checked:
+                fp.write(f"Not checked: {file}\n")
+
+
+def verify_buffer(buffer) -> tuple[int, str | None]:
+    """
+    Checks the CRC of every page, stopping at the first one that's wrong
+    :param buffer: The whole file, as bytes or a memory map
+    :return: How many pages were checked, and what is wrong with the
+        first bad page, if there is one
+    """
+
+    pages = 0
+    position = 0
+
+    while position < len(buffer):
+        try:
+            page = OggPage(buffer, position)
+        except ValueError as error:
+            return pages, f"Page {pages} at byte {position}: {error}"
+
+        checksum = page.checksum(buffer)
+        if checksum != page.crc:
+            return pages, (f"Page {pages} at byte {position}: CRC is "
+                           f"{page.crc:08x}, but the page adds up to "
+                           f"{checksum:08x}")
+
+        pages += 1
+        position = page.end
+
+    return pages, None
+
+
+def verify_file(path: Path) -> tuple[int, str | None]:
+    """
+    Runs in the pool's processes, so it has to be a plain function
+    :return: The same as verify_buffer, or the error if the file can't be read
+    """
+
+    try:
+        with open(path, "rb") as fp:
+
+            # Empty files can't be memory mapped
+            if os.fstat(fp.fileno()).st_size == 0:
+                return 0, "File is empty"
+
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return verify_buffer(mapped)
+    except OSError as error:
+        return 0, str(error)
+
+
+class OggVerifier:
+    """
+    Checks the CRC of every page of every file.  Working out CRCs keeps
+    a CPU busy, so files on disk are spread over a pool of processes.
+    """
+
+    CHUNK_SIZE = 32
+    """Files handed to a process at a time, so 50,000 small files don't
+    mean 50,000 round trips."""
+
+    def __init__(self, workers: int = 8):
+
+        if type(workers) is not int:
+            raise TypeError("workers must be an integer")
+
+        if workers < 1:
+            raise ValueError("workers cannot be less than 1")
+
+        self.workers: int = workers
+
+    def verify_files(
+            self,
+            sources: dict[Path, Path | ArchiveMember],
+            not_checked: list[str] | None = None) -> VerifyReport:
+        """
+        :param sources: The file to read for each sound file.  Files in a
+            zip are checked in this process, as they are read from it.
+        :param not_checked: Files left out before checking, and why,
+            so the report accounts for them too
+        :return: A report of what was checked, and each corrupt file
+        """
+
+        report = VerifyReport()
+        report.not_checked = [] if not_checked is None else not_checked
+        start = time.perf_counter()
+
+        files = [f for f, s in sources.items() if not isinstance(s, ArchiveMember)]
+        members = [f for f, s in sources.items() if isinstance(s, ArchiveMember)]
+
+        results: dict[Path, tuple[int, str | None]] = {}
+
+        if files:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results.update(zip(files, pool.map(
+                    verify_file, [sources[f] for f in files],
+                    chunksize=self.CHUNK_SIZE)))
+
+        for file in members:
+            try:
+                results[file] = verify_buffer(sources[file].read_bytes())
+            except (OSError, zipfile.BadZipFile) as error:
+                results[file] = 0, str(error)
+
+        for file, (pages, error) in sorted(results.items()):
+            report.files_checked += 1
+            report.pages_checked += pages
+            if error is not None:
+                report.errors.append(f"{file} <- {error}")
+
+        report.seconds = time.perf_counter() - start
+        return report
@@ -0,0 +1,263 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Callable
+
+from objects.copy_engine import CopyReport, replace_file
+
+# Signature, versions, flags, method, time, date, CRC, sizes,
+# and the lengths of the name and extra field
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE = 0x04034b50
+
+
+class ArchiveMember:
+    """A file inside a pack archive, read only when its contents are needed"""
+
+    def __init__(self, archive: "PackArchive", info: zipfile.ZipInfo):
+        self.archive: PackArchive = archive
+        self.info: zipfile.ZipInfo = info
+
+    @property
+    def name(self) -> str:
+        return self.info.filename
+
+    @property
+    def size(self) -> int:
+        return self.info.file_size
+
+    @property
+    def crc(self) -> int:
+        return self.info.CRC
+
+    @property
+    def mtime(self) -> float:
+        return time.mktime(self.info.date_time + (0, 0, -1))
+
+    def read_bytes(self) -> bytes:
+        return self.archive.read(self.info)
+
+    def read_range(self, start: int, length: int) -> bytes:
+        return self.archive.read_range(self.info, start, length)
+
+
+class PackArchive:
+    """
+    A read-only view of a zip, rooted at a namespace folder inside it.
+    Everything is worked out from the central directory, and nothing is
+    extracted until it is asked for.
+    """
+
+    def __init__(self, path: Path, root: str = ""):
+        """
+        :param path: The zip file
+        :param root: The namespace folder inside the zip, such as
+            "assets/namespace/", or "" if the zip is the namespace folder
+        """
+
+        self.path: Path = path
+        self.root: str = root
+        self.__zip = zipfile.ZipFile(path)
+        self.__members: dict[str, zipfile.ZipInfo] = {
+            info.filename: info
+            for info in self.__zip.infolist() if not info.is_dir()}
+
+    @classmethod
+    def open_namespace(cls, path: Path) -> "PackArchive":
+        """
+        Opens a zipped namespace folder.  Zipping a folder often wraps
+        everything in one more folder, so that is looked through.
+        """
+
+        archive = cls(path)
+        top_level = {name.split("/", 1)[0] for name in archive.__members}
+
+        if len(top_level) == 1:
+            folder = top_level.pop()
+            if folder != "sounds" and not archive.has(folder):
+                archive.root = f"{folder}/"
+
+        return archive
+
+    @staticmethod
+    def is_archive(path: Path | None) -> bool:
+        return path is not None and path.is_file() and zipfile.is_zipfile(path)
+
+    @property
+    def namespace(self) -> str:
+        return PurePosixPath(self.root).name or self.path.stem
+
+    def close(self):
+        self.__zip.close()
+
+    def has(self, name: str) -> bool:
+        return name in self.__members
+
+    def list_folders(self) -> set[str]:
+        """Lists the folders directly inside the root"""
+
+        return {name[len(self.root):].split("/", 1)[0]
+                for name in self.__members
+                if name.startswith(self.root) and
+                "/" in name[len(self.root):]}
+
+    def list_sound_files(self) -> tuple[list[Path], set[str]]:
+        """
+        Lists every ogg file under the root's sounds folder
+        :return: A tuple containing the following items:
+            The files, relative to the sounds folder
+            The same files as normalized (forward-slash) strings, for lookups
+        """
+
+        prefix = f"{self.root}sounds/"
+        keys: set[str] = {
+            name[len(prefix):] for name in self.__members
+            if name.startswith(prefix) and name.endswith(".ogg")}
+
+        return [Path(key) for key in keys], keys
+
+    def members(self) -> list[ArchiveMember]:
+        """Every file in the zip, in the order they are stored"""
+
+        return [ArchiveMember(self, info) for info in self.__members.values()]
+
+    def member(self, name: str) -> ArchiveMember:
+        """
+        :param name: The full name of the file inside the zip
+        :raise KeyError: If there is no such file
+        """
+
+        return ArchiveMember(self, self.__members[name])
+
+    def sound_member(self, file: Path) -> ArchiveMember:
+        return self.member(f"{self.root}sounds/{file.as_posix()}")
+
+    def read(self, info: zipfile.ZipInfo) -> bytes:
+        # ZipFile serializes access to the underlying file itself,
+        # so members can be read from several threads at once
+        return self.__zip.read(info)
+
+    def read_range(
+            self, info: zipfile.ZipInfo, start: int, length: int) -> bytes:
+        """
+        Reads part of a file.  Stored files, as sound files usually are,
+        are read straight from that part of the zip, so the rest is never
+        touched.  Compressed files have to be inflated as a whole.
+        :param info: The file
+        :param start: The first byte to read
+        :param length: Most bytes to read
+        """
+
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return self.__zip.read(info)[start:start + length]
+
+        length = max(0, min(length, info.file_size - start))
+
+        # The local header's own extra field can differ from the one
+        # in the central directory, so the data offset is read from it
+        with open(self.path, "rb") as fp:
+            fp.seek(info.header_offset)
+            header = fp.read(LOCAL_HEADER.size)
+            if len(header) != LOCAL_HEADER.size:
+                raise zipfile.BadZipFile(f"{info.filename} is cut short")
+
+            signature, *_, name_length, extra_length = \
+                LOCAL_HEADER.unpack(header)
+            if signature != LOCAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile(
+                    f"Bad local file header for {info.filename}")
+
+            fp.seek(info.header_offset + LOCAL_HEADER.size +
+                    name_length + extra_length + start)
+            return fp.read(length)
+
+    def read_json(self, name: str) -> dict:
+        """
+        Loads a json file from the zip
+        :param name: The full name of the file inside the zip
+        :return: The loaded object, or an empty one if it's missing or empty
+        """
+
+        if name not in self.__members or self.__members[name].file_size == 0:
+            return {}
+
+        return dict(json.loads(self.__zip.read(self.__members[name])))
+
+    def extract_sound_files(
+            self,
+            files: list[tuple[Path, Path]],
+            workers: int = 8,
+            transform: Callable[[str, bytes], bytes] | None = None,
+            throttle: Callable[[int], None] | None = None
+    ) -> CopyReport:
+        """
+        Copies sound files out of the zip, creating every target folder
+        once up front.  A file that fails is recorded in the report.
+        :param files: (file relative to the sounds folder, target) pairs
+        :param workers: How many files to extract at once
+        :param transform: Changes each file's contents on the way,
+            given its name in the zip
+        :param throttle: Called with each file's size before it is
+            extracted, to wait for the rate limits
+        :return: A report of what was extracted, how fast, and what failed
+        """
+
+        report = CopyReport()
+        start = time.perf_counter()
+
+        for folder in sorted({target.parent for _, target in files}):
+            folder.mkdir(parents=True, exist_ok=True)
+
+        def extract(paths: tuple[Path, Path]):
+            file, target = paths
+            try:
+                member = self.sound_member(file)
+                if throttle is not None:
+                    throttle(member.size)
+                if transform is None:
+                    with self.__zip.open(member.info) as src:
+                        replace_file(
+                            target, lambda dst: shutil.copyfileobj(src, dst))
+                    size = member.size
+                else:
+                    data = transform(member.name, member.read_bytes())
+                    replace_file(target, lambda fp: fp.write(data))
+                    size = len(data)
+                os.utime(target, (member.mtime, member.mtime))
+                return file, size, None
+            except (OSError, KeyError, zipfile.BadZipFile) as error:
+                return file, 0, str(error)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for file, size, error in pool.map(extract, files):
+                if error is not None:
+                    report.errors.append(f"{file} <- {error}")
+                else:
+                    report.files_copied += 1
+                    report.bytes_copied += size
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def crc32_file(path: Path) -> int:
+    """
+    Works out a file's CRC-32, so it can be compared with the one a zip
+    already stores.  zlib releases the GIL on large buffers.
+    """
+
+    with open(path, "rb") as fp:
+
+        # Empty files can't be memory mapped
+        if os.fstat(fp.fileno()).st_size == 0:
+            return 0
+
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return zlib.crc32(mapped)
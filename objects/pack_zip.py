@@ -0,0 +1,234 @@
+import hashlib
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from objects.pack_archive import ArchiveMember
+
+# Already compressed, so deflating them only costs time
+STORED_SUFFIXES = {".ogg", ".png"}
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Names are always written as UTF-8
+UTF8_FLAG = 0x0800
+
+VERSION = 20
+"""Zip 2.0, the oldest version that has everything these archives need."""
+
+ZIP_LIMIT = 0xFFFFFFFF
+"""Beyond this, sizes and offsets need zip64 records, which aren't written."""
+
+
+class ZipReport:
+    """Totals gathered while a pack zip is written"""
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self.files_stored: int = 0
+        self.files_deflated: int = 0
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+        self.sha1: str = ""
+        self.seconds: float = 0.0
+
+    def __str__(self):
+        return (f"Wrote {self.files_stored + self.files_deflated} files "
+                f"({self.files_stored} stored, {self.files_deflated} "
+                f"deflated) to {self.path.name} "
+                f"({self.bytes_written / 1_000_000:.1f} MB) "
+                f"in {self.seconds:.2f}s\nSHA-1: {self.sha1}")
+
+
+class PackZip:
+    """
+    Writes a resource pack zip in one pass.  Members are read and
+    checksummed on a thread pool, a few files ahead of the writer,
+    and the archive's SHA-1 is worked out as each byte is written.
+    """
+
+    def __init__(
+            self,
+            workers: int = 8,
+            transform: Callable[[str, bytes], bytes] | None = None):
+        """
+        :param workers: How many members to read at once
+        :param transform: Changes each member's contents before it's
+            written, given its name in the zip
+        """
+
+        if type(workers) is not int:
+            raise TypeError("workers must be an integer")
+
+        if workers < 1:
+            raise ValueError("workers cannot be less than 1")
+
+        self.workers: int = workers
+        self.transform: Callable[[str, bytes], bytes] | None = transform
+
+    def write(
+            self,
+            path: Path,
+            members: list[tuple[str, Path | ArchiveMember | bytes]]
+    ) -> ZipReport:
+        """
+        Writes the zip beside its final path, then renames it into place,
+        so a failed run never leaves half an archive behind.
+        :param path: Where the zip will be written
+        :param members: (name in the zip, file, file in another zip,
+            or contents) pairs, in order
+        :return: A report of what was written, including the zip's SHA-1
+        """
+
+        report = ZipReport(path)
+        start = time.perf_counter()
+
+        temporary = path.with_name(f".{path.name}.spindex-new")
+        digest = hashlib.sha1()
+        central_directory: list[bytes] = []
+        offset = 0
+
+        def write(fp, data: bytes):
+            nonlocal offset
+            fp.write(data)
+            digest.update(data)
+            offset += len(data)
+
+        try:
+            with (open(temporary, "wb") as fp,
+                  ThreadPoolExecutor(max_workers=self.workers) as pool):
+
+                for name, method, data, crc, size, date_time in \
+                        self.__prepare_all(pool, members):
+
+                    if offset > ZIP_LIMIT or size > ZIP_LIMIT:
+                        raise ValueError(
+                            f"{path} is too large for a zip without zip64")
+
+                    encoded_name = name.encode()
+                    fields = (VERSION, UTF8_FLAG, method, *date_time,
+                              crc, len(data), size, len(encoded_name))
+
+                    central_directory.append(struct.pack(
+                        "<IHHHHHHIIIHHHHHII", 0x02014b50,
+                        (3 << 8) | VERSION, *fields, 0, 0, 0, 0,
+                        0o100644 << 16, offset) + encoded_name)
+
+                    write(fp, struct.pack(
+                        "<IHHHHHIIIHH", 0x04034b50, *fields, 0) +
+                        encoded_name)
+                    write(fp, data)
+
+                    report.bytes_read += size
+                    if method == ZIP_STORED:
+                        report.files_stored += 1
+                    else:
+                        report.files_deflated += 1
+
+                if len(central_directory) > 0xFFFF or offset > ZIP_LIMIT:
+                    raise ValueError(
+                        f"{path} is too large for a zip without zip64")
+
+                directory = b"".join(central_directory)
+                write(fp, directory)
+                write(fp, struct.pack(
+                    "<IHHHHIIH", 0x06054b50, 0, 0,
+                    len(central_directory), len(central_directory),
+                    len(directory), offset - len(directory), 0))
+
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+        report.bytes_written = offset
+        report.sha1 = digest.hexdigest()
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def __prepare_all(self, pool: ThreadPoolExecutor, members):
+        """
+        Keeps a few members more than there are workers in flight,
+        so the pool stays busy without every file sitting in memory at once
+        """
+
+        pending = deque()
+        members = iter(members)
+
+        for member in members:
+            pending.append(pool.submit(self.__prepare, *member))
+            if len(pending) >= self.workers * 2:
+                break
+
+        for member in members:
+            yield pending.popleft().result()
+            pending.append(pool.submit(self.__prepare, *member))
+
+        while pending:
+            yield pending.popleft().result()
+
+    def __prepare(self, name: str, source: Path | ArchiveMember | bytes):
+        """
+        Reads one member and checksums it.  zlib releases the GIL while it
+        works on large buffers, so the pool's threads really run together.
+        :return: The name, compression method, the data to write, its CRC,
+            its uncompressed size, and its DOS date and time
+        """
+
+        if isinstance(source, bytes):
+            data = source
+            crc = zlib.crc32(data)
+            modified = time.localtime()
+        elif isinstance(source, ArchiveMember):
+            # Reading a zip member checks its CRC, so there's no need for another
+            data = source.read_bytes()
+            crc = source.crc
+            modified = time.localtime(source.mtime)
+        else:
+            data = source.read_bytes()
+            crc = zlib.crc32(data)
+            modified = time.localtime(source.stat().st_mtime)
+
+        if self.transform is not None:
+            transformed = self.transform(name, data)
+            if transformed is not data:
+                data = transformed
+                crc = zlib.crc32(data)
+
+        size = len(data)
+
+        if Path(name).suffix.lower() in STORED_SUFFIXES:
+            method = ZIP_STORED
+        else:
+            method = ZIP_DEFLATED
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            data = compressor.compress(data) + compressor.flush()
+
+        return name, method, data, crc, size, dos_date_time(modified)
+
+
+def member_overhead(name: str) -> int:
+    """
+    Bytes a member takes in the zip on top of its data: its local header
+    and its central directory record, each with a copy of its name
+    """
+
+    return 30 + 46 + 2 * len(name.encode())
+
+
+def dos_date_time(moment: time.struct_time) -> tuple[int, int]:
+    """Zip timestamps can't go back before 1980"""
+
+    if moment.tm_year < 1980:
+        return 0, (1 << 5) | 1
+
+    return ((moment.tm_hour << 11) | (moment.tm_min << 5) |
+            (moment.tm_sec // 2),
+            ((moment.tm_year - 1980) << 9) | (moment.tm_mon << 5) |
+            moment.tm_mday)
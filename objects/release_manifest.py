@@ -0,0 +1,116 @@
+import json
+import os
+from pathlib import Path
+
+from objects.file_hasher import FileHasher
+
+
+class ReleaseManifest:
+    """
+    Records the size, modification time and hash of every sound file
+    in a release, so the next release can ship only what changed
+    """
+
+    VERSION = 1
+
+    def __init__(self, files: dict[str, dict] | None = None):
+        """
+        :param files: {"size", "mtime_ns", "sha256"} for each file,
+            keyed by its forward-slash path under the sounds folder
+        """
+
+        self.files: dict[str, dict] = {} if files is None else files
+
+    @classmethod
+    def load(cls, path: Path) -> "ReleaseManifest":
+        """
+        :param path: A manifest written by an earlier release
+        :return: The manifest, or an empty one if there was no earlier release
+        """
+
+        if not path.exists():
+            return cls()
+
+        with open(path) as fp:
+            data = json.load(fp)
+
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"{path} is not a version {cls.VERSION} manifest")
+
+        return cls(data["files"])
+
+    def save(self, path: Path):
+        """Writes beside the final path first, so a crash never truncates it"""
+
+        temporary = path.with_name(f".{path.name}.spindex-new")
+        with open(temporary, "w") as fp:
+            json.dump({"version": self.VERSION, "files": self.files},
+                      fp, indent=1, sort_keys=True)
+
+        os.replace(temporary, path)
+
+    def update(
+            self,
+            sound_path: Path,
+            sound_files: list[Path],
+            hasher: FileHasher) -> tuple["ReleaseManifest", list[str]]:
+        """
+        Builds the manifest for the files as they are now.  Hashes are
+        carried over for files whose size and modification time still
+        match, so only files that were touched are read.
+        :param sound_path: The sounds folder
+        :param sound_files: Files relative to the sounds folder
+        :param hasher: Hashes the touched files, several at a time
+        :return: A tuple containing the following items:
+            The new manifest
+            A warning for each file that couldn't be read
+        """
+
+        files: dict[str, dict] = {}
+        to_hash: dict[Path, tuple[str, os.stat_result]] = {}
+        warnings: list[str] = []
+
+        for file in sound_files:
+            key = file.as_posix()
+            try:
+                stat = (sound_path / file).stat()
+            except OSError as error:
+                warnings.append(f"{file} <- {error}")
+                continue
+
+            previous = self.files.get(key)
+            if previous is not None and \
+                    previous["size"] == stat.st_size and \
+                    previous["mtime_ns"] == stat.st_mtime_ns:
+                files[key] = previous
+            else:
+                to_hash[sound_path / file] = key, stat
+
+        digests, hash_warnings = hasher.hash_files(list(to_hash))
+        warnings.extend(hash_warnings)
+
+        for path, digest in digests.items():
+            key, stat = to_hash[path]
+            files[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest}
+
+        return ReleaseManifest(dict(sorted(files.items()))), warnings
+
+    def get_changes(
+            self, current: "ReleaseManifest") -> tuple[list[str], list[str]]:
+        """
+        Compares this (earlier) manifest with the current one
+        :return: A tuple containing the following items:
+            Files that are new or whose contents changed
+            Files that are gone
+        """
+
+        changed = [
+            key for key, entry in current.files.items()
+            if key not in self.files or
+            self.files[key]["sha256"] != entry["sha256"]]
+        removed = [key for key in self.files if key not in current.files]
+
+        return changed, removed
@@ -7,6 +7,9 @@ class SoundEventValueError(Exception):
 
 class SoundEventCatalog:
 
+    # Events in these categories play at a position in the world
+    positional_categories: set[str] = {"block", "entity"}
+
     catalog: dict[str: list[str]] = {
         "ambient": [
             "ambient.basalt_deltas.additions",
@@ -1376,3 +1379,20 @@ class SoundEventCatalog:
             raise SoundEventValueError(f"Could not build a sound event from this path: {ogg_file_path}")
 
         return event_name
+
+    def is_positional(self, event_name: str) -> bool:
+        """
+        :param event_name: An event name formatted with dots
+        :return: Whether the game plays the event at a position,
+            fading it with distance
+        """
+
+        return event_name.split(".", 1)[0] in self.positional_categories
+
+    def has_event(self, event_name: str) -> bool:
+        """
+        :param event_name: An event name formatted with dots
+        :return: Whether Minecraft has an event by that name
+        """
+
+        return event_name in self.catalog.get(event_name.split(".", 1)[0], [])
@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Limits how fast something happens.  Tokens build up at a steady rate,
+    to a limit, and each action spends some.  An action bigger than the
+    bucket still goes through, and the ones after it wait off the debt.
+    Safe to share between threads.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Most tokens the bucket can hold, which is how big
+            a burst can get.  Defaults to one second's worth.
+        """
+
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate: float = rate
+        self.capacity: float = rate if capacity is None else capacity
+        self.__tokens: float = self.capacity
+        self.__updated: float = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def take(self, amount: float = 1):
+        """Spends tokens, waiting until the bucket can cover them"""
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.capacity,
+                self.__tokens + (now - self.__updated) * self.rate)
+            self.__updated = now
+
+            # Spending now reserves the tokens, so threads queue up fairly
+            self.__tokens -= amount
+            wait = -self.__tokens / self.rate if self.__tokens < 0 else 0.0
+
+        # Sleep outside the lock, so other threads can reserve behind us
+        if wait > 0:
+            time.sleep(wait)
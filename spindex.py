@@ -23,20 +23,39 @@ __status__ = "Prototype"
 
 
 # Import modules
+from objects.copy_engine import CopyEngine, CopyReport, LinkMode
 from objects.defaults import Defaults
-from objects.typed_dictionaries import SoundEvent
+from objects.deployment import Deployment
+from objects.file_hasher import FileHasher
+from objects.loading_advisor import LoadingAdvisor, LoadingMode
+from objects.metadata_cache import MetadataCache
+from objects.metadata_stripper import MetadataStripper
+from objects.ogg_inspector import OggInfo, OggInspector
+from objects.ogg_verifier import OggVerifier
+from objects.pack_archive import ArchiveMember, PackArchive, crc32_file
+from objects.pack_zip import PackZip, member_overhead
+from objects.release_manifest import ReleaseManifest
+from objects.typed_dictionaries import SoundEvent, SoundEventDefaults
 from objects.sound_event_catalog import SoundEventCatalog, SoundEventValueError
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from json_encoder import CompactJSONEncoder
 from pathlib import Path
 from typing import Tuple
 
 import argparse
+import atexit
+import copy
+import difflib
+import hashlib
 import json
+import os
 import re
-import shutil
+import sqlite3
 import sys
+import zipfile
 
 
 class Color(str, Enum):
@@ -47,10 +66,66 @@ class Color(str, Enum):
     default = "\033[0m"
 
 
+class OutputFormat(str, Enum):
+
+    compact = "compact"
+    minified = "minified"
+
+
+class PreviewMode(str, Enum):
+
+    full = "full"
+    summary = "summary"
+    diff = "diff"
+
+
+class LoadingAdvice(str, Enum):
+
+    report = "report"
+    apply = "apply"
+
+
+class TagMode(str, Enum):
+
+    report = "report"
+    apply = "apply"
+
+
 class IncorrectDirStructureError(Exception):
     pass
 
 
+def parse_byte_rate(text: str) -> int:
+    """
+    Reads a rate like 500K or 20M (bytes per second, in powers of 1024)
+    """
+
+    multipliers = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([KMG]?)", text.strip().upper())
+
+    if match is None or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError(
+            f"'{text}' is not a rate, such as 500K or 20M")
+
+    return int(float(match.group(1)) * multipliers[match.group(2)])
+
+
+def parse_file_rate(text: str) -> float:
+    """Reads a number of files per second, which must be more than 0"""
+
+    try:
+        rate = float(text)
+    except ValueError:
+        rate = 0.0
+
+    # Also turns away nan and inf, which no bucket can count with
+    if not 0 < rate < float("inf"):
+        raise argparse.ArgumentTypeError(
+            f"'{text}' is not a rate, such as 5 or 0.5")
+
+    return rate
+
+
 def handle_command_line():
     """
     Handle arguments supplied by the user
@@ -81,6 +156,17 @@ def handle_command_line():
         action='store_true',
         help="Suppress printing of json file contents. Only show warnings.")
 
+    parser.add_argument(
+        "-p",
+        "--preview",
+        type=PreviewMode,
+        default=PreviewMode.summary,
+        choices=list(PreviewMode),
+        metavar="MODE",
+        help=("How json results are shown: 'summary' of added, changed and "
+              "removed events (default), 'diff' to add a unified diff of "
+              "those events, or 'full' to print the entire file."))
+
     parser.add_argument(
         "-a",
         "--abort-warnings",
@@ -88,12 +174,114 @@ def handle_command_line():
         help=("Treat all warnings as fatal errors, "
               "and exit as soon as they occur."))
 
+    parser.add_argument(
+        "--loading-advice",
+        type=LoadingAdvice,
+        choices=list(LoadingAdvice),
+        metavar="MODE",
+        help=("Suggest which sounds should stream and which should preload, "
+              "from their length and size: 'report' lists them, and 'apply' "
+              "also sets them wherever defaults.json doesn't."))
+
+    parser.add_argument(
+        "--tags",
+        type=TagMode,
+        choices=list(TagMode),
+        metavar="MODE",
+        help=("Check sound files for metadata tags: 'report' lists the files "
+              "that carry them, and 'apply' also uses SPINDEX_VOLUME and "
+              "SPINDEX_WEIGHT tags in place of defaults.json."))
+
+    parser.add_argument(
+        "--dedup",
+        action='store_true',
+        help=("Ship only one copy of sound files with the same contents, "
+              "and name that copy from every event that used any of them."))
+
+    parser.add_argument(
+        "--durations",
+        action='store_true',
+        help=("List the playback time of every generated event, "
+              "as well as the whole pack's."))
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=8,
+        help="Number of files to copy to the target folder at once.")
+
+    parser.add_argument(
+        "--incremental",
+        action='store_true',
+        help=("Only copy files that are new, or whose size or modification "
+              "time differs from the file already in the target folder."))
+
+    parser.add_argument(
+        "--checksum",
+        action='store_true',
+        help=("Like --incremental, but compare the contents of same-sized "
+              "files instead of their modification times."))
+
+    parser.add_argument(
+        "--link-mode",
+        type=LinkMode,
+        default=LinkMode.copy,
+        choices=list(LinkMode),
+        metavar="MODE",
+        help=("How files are placed in the target folder: 'copy' (default), "
+              "'hardlink', 'reflink' (copy-on-write clone) or "
+              "'copy_file_range' (in-kernel copy). Falls back to a normal "
+              "copy wherever the chosen mode isn't supported."))
+
+    parser.add_argument(
+        "--limit-rate",
+        type=parse_byte_rate,
+        metavar="RATE",
+        help=("Most bytes to copy to the target per second, such as 500K "
+              "or 20M, so shared storage isn't saturated."))
+
+    parser.add_argument(
+        "--limit-files",
+        type=parse_file_rate,
+        metavar="RATE",
+        help="Most files to place in the target per second.")
+
+    parser.add_argument(
+        "--transactional",
+        action='store_true',
+        help=("Stage files beside the target sounds folder and swap them "
+              "in only once everything has been copied. An interrupted "
+              "deployment can be resumed or rolled back on the next run."))
+
+    parser.add_argument(
+        "--strip-metadata",
+        action='store_true',
+        help=("Remove metadata tags and album art from sound files as they "
+              "are copied or zipped, leaving the audio untouched."))
+
+    parser.add_argument(
+        "--verify",
+        type=Path,
+        metavar="REPORT",
+        help=("Only check the CRC of every page of every sound file, write "
+              "a report of corrupt files to this path, and exit with an "
+              "error if there are any."))
+
+    parser.add_argument(
+        "--lint",
+        action='store_true',
+        help=("Only check the target pack: list sounds in its sounds.json "
+              "whose files are missing, sound files no event names, and "
+              "events Minecraft doesn't have, and exit with an error if "
+              "there are any."))
+
     parser.add_argument(
         "-s",
         "--source",
         type=Path,
         default=Path.cwd(),
-        help=("Path to the source folder. "
+        help=("Path to the source folder, or a zip of it. "
               "Ogg files to be indexed are found here."))
 
     parser.add_argument(
@@ -101,29 +289,89 @@ def handle_command_line():
         "--target",
         type=Path,
         default=type('NonePath', (), {'resolve': lambda: None}),
-        help=("Path to the target folder. "
-              "Ogg files will be copied here, if allowed."))
+        help=("Path to the target folder, or a resource pack zip. "
+              "Ogg files will be copied here, if allowed. "
+              "A zip is rewritten with the new files and sounds.json."))
+
+    parser.add_argument(
+        "--generated-format",
+        type=OutputFormat,
+        default=OutputFormat.compact,
+        choices=list(OutputFormat),
+        metavar="FORMAT",
+        help=("Layout of generated-sounds.json: 'compact' for human review "
+              "(default) or 'minified' for canonical, whitespace-free json."))
+
+    parser.add_argument(
+        "--target-format",
+        type=OutputFormat,
+        default=OutputFormat.compact,
+        choices=list(OutputFormat),
+        metavar="FORMAT",
+        help=("Layout of the target sounds.json: 'compact' for human review "
+              "(default) or 'minified' for canonical, whitespace-free json."))
+
+    parser.add_argument(
+        "--zip",
+        type=Path,
+        metavar="ZIP",
+        help=("Write the source ogg files and the combined sounds.json "
+              "straight into a resource pack zip at this path, along with "
+              "the target pack's own sound files if a target is given. "
+              "The target folder is left untouched."))
+
+    parser.add_argument(
+        "--delta",
+        type=Path,
+        metavar="MANIFEST",
+        help=("With --zip, only put sound files that are new or changed "
+              "since the release this manifest describes into the zip, "
+              "and write a manifest for the next delta beside the zip."))
 
     args = parser.parse_args()
+
+    # Checked here, so a bad count fails before any prompt is answered
+    if args.jobs < 1:
+        parser.error("-j/--jobs cannot be less than 1")
+
+    if args.delta is not None and args.zip is None:
+        parser.error("--delta needs --zip")
+
+    if args.lint and args.target.resolve() is None:
+        parser.error("--lint needs --target")
+
+    if args.strip_metadata and args.checksum:
+        parser.error("--checksum can't compare stripped files with their "
+                     "sources, so use --incremental with --strip-metadata")
+
     return args
 
 
 def validate_source_path(path: Path):
-    """Folder must have only one child, and that child must be 'sounds'"""
+    """
+    Folder must have only one child, and that child must be 'sounds'.
+    A zipped namespace folder is checked from its central directory.
+    """
 
     if not path.exists():
         raise FileNotFoundError(
             f"Specified source path not found. "
             f"{path} is not a valid filesystem path.")
 
-    path_check = [i for i in path.iterdir() if i.is_dir()]
+    if PackArchive.is_archive(path):
+        archive = PackArchive.open_namespace(path)
+        path_check = sorted(archive.list_folders())
+        archive.close()
+    else:
+        path_check = [i.name for i in path.iterdir() if i.is_dir()]
+
     error_start: str = f"{path} does not appear to be a namespace folder."
 
     if len(path_check) > 1:
         raise IncorrectDirStructureError(
             f"{error_start} Should only have one sub-folder.")
 
-    if len(path_check) != 1 or path_check[0].name != "sounds":
+    if len(path_check) != 1 or path_check[0] != "sounds":
         raise IncorrectDirStructureError(
             f"{error_start} Should have a 'sounds' sub-folder.")
 
@@ -198,6 +446,432 @@ def process_ogg_files(files: list[Path]) -> tuple[list[Path], list[str]]:
     return sound_paths, warnings
 
 
+def get_sound_sources(
+        sound_files: list[Path],
+        source: Path | PackArchive) -> dict[Path, Path | ArchiveMember]:
+    """
+    :param sound_files: Files relative to the sounds folder
+    :param source: The source namespace folder or zip
+    :return: The file to read for each sound file
+    """
+
+    return {
+        file: source.sound_member(file) if isinstance(source, PackArchive)
+        else source / "sounds" / file
+        for file in sound_files}
+
+
+def inspect_sound_files(
+        sound_files: list[Path],
+        source: Path | PackArchive,
+        inspector: OggInspector
+) -> tuple[list[Path], dict[Path, OggInfo], list[str]]:
+    """
+    Checks that each file really is Ogg Vorbis audio, from its headers.
+    Truncated files and other formats renamed to .ogg are left out.
+    :param sound_files: Files relative to the sounds folder
+    :param source: The source namespace folder or zip
+    :param inspector: Reads the headers, several files at a time
+    :return: A tuple containing the following items:
+        The files that passed
+        What the headers of each of those files say
+        A warning for each file that didn't pass
+    """
+
+    info, warnings = inspector.inspect_files(
+        get_sound_sources(sound_files, source))
+
+    return [f for f in sound_files if f in info], info, warnings
+
+
+def get_stereo_warnings(
+        sound_info: dict[Path, OggInfo],
+        catalog: SoundEventCatalog) -> list[str]:
+    """
+    Minecraft only fades mono sounds with distance, so a stereo file
+    for an entity or block event plays at full volume wherever it is
+    :param sound_info: What the headers of each sound file say
+    :param catalog: Finds the event each file belongs to
+    :return: A warning for each stereo file in a positional event
+    """
+
+    warnings: list[str] = []
+
+    for file, info in sorted(sound_info.items()):
+        if info.channels == 1:
+            continue
+
+        # Files without an event are reported by get_generated_events
+        try:
+            event_name = catalog.get_sound_event_name(file)
+        except SoundEventValueError:
+            continue
+
+        if catalog.is_positional(event_name):
+            warnings.append(
+                f"{file} <- Has {info.channels} channels, so {event_name} "
+                f"won't fade with distance, and the file is larger than it needs to be")
+
+    return warnings
+
+
+def print_stereo_warnings(warnings: list[str]):
+    """Stereo files still play, so they are pointed out, not left out"""
+
+    if len(warnings) == 0:
+        return
+
+    print(f"\n{len(warnings)} stereo file(s) in entity and block events "
+          f"will be kept, but should be converted to mono:{Color.red.value}")
+    for w in warnings:
+        print(w)
+    print(Color.default.value, end="")
+
+
+def get_event_durations(
+        events: dict[str, SoundEvent],
+        namespace: str,
+        sound_info: dict[Path, OggInfo]) -> dict[str, float]:
+    """
+    Adds up the playback time of each event's sound files
+    :param events: Generated events
+    :param namespace: The namespace the sound files belong to
+    :param sound_info: What the headers of each sound file say
+    :return: Seconds of audio in each event
+    """
+
+    durations: dict[str, float] = {
+        get_sound_name(namespace, file): info.duration
+        for file, info in sound_info.items()}
+
+    return {
+        event_name: sum(
+            durations.get(sound["name"], 0.0) for sound in event["sounds"])
+        for event_name, event in events.items()}
+
+
+def get_loading_recommendations(
+        sound_files: list[Path],
+        sound_info: dict[Path, OggInfo],
+        namespace: str,
+        catalog: SoundEventCatalog,
+        advisor: LoadingAdvisor) -> dict[str, LoadingMode]:
+    """
+    Works out which sounds should stream and which should preload
+    :param sound_files: Files relative to the sounds folder
+    :param sound_info: What the headers of each sound file say
+    :param namespace: The namespace the sound files belong to
+    :param catalog: Finds the event each file belongs to
+    :param advisor: Makes the recommendation for each sound
+    :return: The recommendation for each sound that has one,
+        keyed by sound name
+    """
+
+    recommendations: dict[str, LoadingMode] = {}
+
+    for file in sound_files:
+
+        # Files without an event are reported by get_generated_events
+        try:
+            event_name = catalog.get_sound_event_name(file)
+        except SoundEventValueError:
+            continue
+
+        mode = advisor.recommend(event_name, sound_info[file])
+        if mode is not None:
+            recommendations[get_sound_name(namespace, file)] = mode
+
+    return recommendations
+
+
+def print_loading_recommendations(recommendations: dict[str, LoadingMode]):
+
+    for mode in LoadingMode:
+        names = sorted(n for n, m in recommendations.items() if m == mode)
+        print(f"\n{len(names)} sound(s) should {mode.value}:")
+        for name in names:
+            print(f"    {name}")
+
+
+def find_duplicate_sounds(
+        sound_files: list[Path],
+        source: Path | PackArchive,
+        sound_info: dict[Path, OggInfo],
+        hasher: FileHasher) -> tuple[dict[Path, Path], list[str]]:
+    """
+    Finds sound files with the same contents.  Files are grouped by size
+    first, so only files that share a size with another are hashed.
+    :param sound_files: Files relative to the sounds folder
+    :param source: The source namespace folder or zip
+    :param sound_info: What the headers of each sound file say
+    :param hasher: Hashes the files, several at a time
+    :return: A tuple containing the following items:
+        The first file, in path order, with the same contents as each
+            file that is a duplicate
+        A warning for each file that couldn't be read
+    """
+
+    sizes: dict[int, list[Path]] = defaultdict(list)
+    for file in sorted(sound_files):
+        sizes[sound_info[file].size].append(file)
+
+    candidates = [
+        file for files in sizes.values() if len(files) > 1 for file in files]
+    sources = get_sound_sources(candidates, source)
+
+    if isinstance(source, PackArchive):
+        def hash_member(file: Path):
+            try:
+                return file, hashlib.new(
+                    hasher.algorithm,
+                    sources[file].read_bytes()).hexdigest(), None
+            except (OSError, zipfile.BadZipFile) as error:
+                return file, None, str(error)
+
+        digests: dict[Path, str] = {}
+        warnings: list[str] = []
+        with ThreadPoolExecutor(max_workers=hasher.workers) as pool:
+            for file, digest, error in pool.map(hash_member, candidates):
+                if error is not None:
+                    warnings.append(f"{file} <- {error}")
+                else:
+                    digests[file] = digest
+    else:
+        path_digests, warnings = hasher.hash_files(list(sources.values()))
+        digests = {file: path_digests[sources[file]]
+                   for file in candidates if sources[file] in path_digests}
+
+    # Candidates are in path order, so the first of each is kept
+    first: dict[tuple[int, str], Path] = {}
+    duplicates: dict[Path, Path] = {}
+    for file in candidates:
+        if file not in digests:
+            continue
+        key = sound_info[file].size, digests[file]
+        if key in first:
+            duplicates[file] = first[key]
+        else:
+            first[key] = file
+
+    return duplicates, warnings
+
+
+def print_duplicates(
+        duplicates: dict[Path, Path],
+        sound_info: dict[Path, OggInfo],
+        namespace: str):
+
+    kept: dict[Path, list[Path]] = defaultdict(list)
+    for file, original in duplicates.items():
+        kept[original].append(file)
+
+    print(f"\n{len(duplicates)} duplicate sound files will use "
+          f"{len(kept)} shipped copies:")
+    for original, files in sorted(kept.items()):
+        print(f"{Color.cyan.value}{original}{Color.default.value}")
+        for file in sorted(files):
+            print(f"    = {file}")
+
+    disk = sum(sound_info[file].size for file in duplicates)
+    download = disk + sum(
+        member_overhead(f"assets/{namespace}/sounds/{file.as_posix()}")
+        for file in duplicates)
+    print(f"\nSaves {disk / 1_000_000:.2f} MB on disk, and "
+          f"{download / 1_000_000:.2f} MB from every download of the pack")
+
+
+def lint_pack(
+        target_path: Path,
+        catalog: SoundEventCatalog) -> tuple[list[str], list[str], list[str]]:
+    """
+    Checks a pack's sounds.json against the sound files it names.  Each
+    namespace's sounds folder is listed once, into a set, so every name
+    is looked up without touching the disk again.
+    :param target_path: The pack's namespace folder
+    :param catalog: Every Minecraft sound event name
+    :return: A tuple containing the following items:
+        Sounds whose files are missing, or that have no name,
+            as event -> sound name
+        Files in the namespace's sounds folder that no event names,
+            relative to that folder
+        Events Minecraft doesn't have
+    """
+
+    assets_path = target_path.parent
+    target_namespace = target_path.name
+    events = get_event_dictionary(assets_path / "minecraft" / "sounds.json")
+
+    # Forward-slash paths of every file, for each namespace named so far
+    indexes: dict[str, set[str]] = {
+        target_namespace: list_sound_files(target_path / "sounds")[1]}
+    referenced: set[str] = set()
+
+    dangling: list[str] = []
+    unknown_events: list[str] = []
+
+    for event_name, event in events.items():
+
+        if not catalog.has_event(event_name):
+            unknown_events.append(event_name)
+
+        for sound in event.get("sounds", []):
+
+            # Sounds can be plain names, and can name other events
+            if isinstance(sound, str):
+                name = sound
+            elif sound.get("type") == "event":
+                continue
+            elif "name" not in sound:
+                dangling.append(f"{event_name} -> a sound with no name")
+                continue
+            else:
+                name = sound["name"]
+
+            namespace, _, path = name.rpartition(":")
+            namespace = namespace or "minecraft"
+
+            # The game's own sounds aren't in the pack to check
+            if namespace == "minecraft":
+                continue
+
+            if namespace not in indexes:
+                indexes[namespace] = list_sound_files(
+                    assets_path / namespace / "sounds")[1]
+
+            key = f"{path}.ogg"
+            if key in indexes[namespace]:
+                if namespace == target_namespace:
+                    referenced.add(key)
+            else:
+                dangling.append(f"{event_name} -> {name}")
+
+    orphans = sorted(indexes[target_namespace] - referenced)
+
+    return dangling, orphans, unknown_events
+
+
+def print_lint_results(
+        dangling: list[str],
+        orphans: list[str],
+        unknown_events: list[str]):
+
+    for results, one, many, none in [
+            (dangling,
+             "1 sound doesn't name a file that exists",
+             "sounds don't name files that exist",
+             "Every sound names a file that exists."),
+            (orphans,
+             "1 sound file isn't named by any event",
+             "sound files aren't named by any event",
+             "Every sound file is named by an event."),
+            (unknown_events,
+             "1 event isn't a Minecraft sound event",
+             "events aren't Minecraft sound events",
+             "Every event is a Minecraft sound event.")]:
+
+        if not results:
+            print(f"\n{none}")
+            continue
+
+        header = one if len(results) == 1 else f"{len(results)} {many}"
+        print(f"\n{header}:{Color.red.value}")
+        for result in results:
+            print(result)
+        print(Color.default.value, end="")
+
+
+def get_tag_warnings(sound_info: dict[Path, OggInfo]) -> list[str]:
+    """
+    :param sound_info: What the headers of each sound file say
+    :return: A warning for each file that carries metadata tags
+    """
+
+    return [
+        f"{file} <- Carries {info.tags} metadata tag(s), "
+        f"which ship to every player"
+        for file, info in sorted(sound_info.items()) if info.tags > 0]
+
+
+def get_tag_overrides(
+        sound_info: dict[Path, OggInfo],
+        namespace: str
+) -> tuple[dict[str, SoundEventDefaults], list[str]]:
+    """
+    Turns each file's SPINDEX_ tags into values for its sound
+    :param sound_info: What the headers of each sound file say
+    :param namespace: The namespace the sound files belong to
+    :return: A tuple containing the following items:
+        The values set on each sound that has any, keyed by sound name
+        A warning for each tag that couldn't be used
+    """
+
+    overrides: dict[str, SoundEventDefaults] = {}
+    warnings: list[str] = []
+
+    for file, info in sorted(sound_info.items()):
+
+        values = SoundEventDefaults()
+
+        for name, value in info.overrides.items():
+            try:
+                if name == "volume":
+                    volume = float(value)
+                    if not 0.0 <= volume <= 1.0:
+                        raise ValueError("volume must be between 0.0 and 1.0")
+                    values["volume"] = volume
+
+                elif name == "weight":
+                    weight = int(value)
+                    if not 1 <= weight <= 2_147_483_647:
+                        raise ValueError(
+                            "weight must be between 1 and 2,147,483,647")
+                    values["weight"] = weight
+
+                else:
+                    raise ValueError("only volume and weight can be set")
+
+            except ValueError as error:
+                warnings.append(
+                    f"{file} <- SPINDEX_{name.upper()}={value} "
+                    f"will be ignored: {error}")
+
+        if len(values) > 0:
+            overrides[get_sound_name(namespace, file)] = values
+
+    return overrides, warnings
+
+
+def print_strip_report(stripper: MetadataStripper):
+
+    for name, saved in sorted(
+            stripper.saved.items(), key=lambda item: (-item[1], item[0])):
+        print(f"{saved:>10,} bytes  {name}")
+
+    print(f"\n{stripper}")
+
+    if stripper.errors:
+        print(f"\n{len(stripper.errors)} files kept their metadata:"
+              f"\n{Color.red.value}")
+        for error in stripper.errors:
+            print(error)
+        print(Color.default.value, end="")
+
+
+def format_duration(seconds: float) -> str:
+    return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+
+
+def print_durations(durations: dict[str, float], show_events: bool):
+
+    if show_events:
+        print("\nPlayback time of each event:")
+        for event_name, seconds in durations.items():
+            print(f"{format_duration(seconds):>10}  {event_name}")
+
+    print(f"\nTotal playback time: {format_duration(sum(durations.values()))} "
+          f"in {len(durations)} events")
+
+
 def get_combined_events(
         incoming_events: dict[str, SoundEvent],
         existing_events: dict[str, SoundEvent]) -> dict[str, SoundEvent]:
@@ -241,11 +915,19 @@ def get_combined_events(
     return dict(sorted(sorted_events.items()))
 
 
+def get_sound_name(namespace: str, file: Path) -> str:
+    """The name sounds.json gives a sound file, such as namespace:path/file"""
+
+    return f"{namespace}:{file.parent}/{file.stem}"
+
+
 def get_generated_events(
         namespace: str,
         sound_files: list[Path],
         defaults: Defaults,
-        catalog: SoundEventCatalog) -> Tuple[dict[str, SoundEvent], list[str]]:
+        catalog: SoundEventCatalog,
+        duplicates: dict[Path, Path] | None = None
+) -> Tuple[dict[str, SoundEvent], list[str]]:
     """
     Generates JSON records in the same format as a Minecraft sounds.json file
 
@@ -254,6 +936,9 @@ def get_generated_events(
     :param defaults: A dictionary of default values for various parameters,
         built from a json file
     :param catalog: An object that contains every Minecraft sound event name
+    :param duplicates: The file to name instead, for each file that is
+        identical to another.  Identical files in the same event are
+        named once, with their weights added together.
     :return: A tuple containing the following items:
         A dictionary representing the json data to be written to sounds.json
         A list of warnings that occurred during the process
@@ -282,10 +967,25 @@ def get_generated_events(
             events[event_name] = defaults.get_sound_event(event_name)
 
         # build the sound dictionary, and add it to the sounds list
-        sound_name: str = f"{namespace}:{file.parent}/{file.stem}"
+        sound_name: str = get_sound_name(namespace, file)
 
         sound = defaults.get_sound(event_name, sound_name)
 
+        # The sound keeps its own values, but plays the one shipped copy
+        if duplicates is not None and file in duplicates:
+            sound["name"] = get_sound_name(namespace, duplicates[file])
+
+        # Copies within one event become a single sound, as likely to play
+        # as all of them were together
+        if duplicates:
+            same_sound = next((
+                s for s in events[event_name]["sounds"]
+                if s["name"] == sound["name"]), None)
+            if same_sound is not None:
+                same_sound["weight"] = \
+                    same_sound.get("weight", 1) + sound.get("weight", 1)
+                continue
+
         events[event_name]["sounds"].append(sound)
 
         # Sort the sounds by sound path name
@@ -299,21 +999,394 @@ def get_generated_events(
     return sorted_events, warnings
 
 
+def list_sound_files(sound_path: Path) -> tuple[list[Path], set[str]]:
+    """
+    Lists every ogg file under a sounds folder in a single walk
+    :param sound_path: The sounds folder to scan
+    :return: A tuple containing the following items:
+        The files, relative to the sounds folder
+        The same files as normalized (forward-slash) strings, for lookups
+    """
+
+    files: list[Path] = []
+    keys: set[str] = set()
+
+    for folder, _, names in os.walk(sound_path):
+
+        # Work out the relative folder once, not once per file
+        relative = Path(folder).relative_to(sound_path)
+        prefix = "" if relative == Path(".") else f"{relative.as_posix()}/"
+
+        for name in names:
+            if name.endswith(".ogg"):
+                files.append(relative / name)
+                keys.add(prefix + name)
+
+    return files, keys
+
+
 def check_for_overwritten_files(
         source_files: list[Path],
-        target_files: list[Path]) -> list[str]:
+        target_files: list[Path] | set[str]
+) -> tuple[list[str], dict[str, int]]:
+    """
+    Finds source files that would overwrite a file in the target
+    :param source_files: Files to be copied, relative to the sounds folder
+    :param target_files: Files already in the target, either as paths
+        or as the normalized keys built by list_sound_files
+    :return: A tuple containing the following items:
+        A warning for each file that would be overwritten
+        The number of those files in each folder
+    """
 
     warnings: list[str] = list()
+    folder_collisions: dict[str, int] = dict()
+
+    target_keys: set[str] = target_files if isinstance(target_files, set) \
+        else {f.as_posix() for f in target_files}
 
     # Loop through source list
     for file in source_files:
 
         # If the file will overwrite a file in the target,
         # add its path to the warnings
-        if file in target_files:
+        if file.as_posix() in target_keys:
             warnings.append(f".../{file}")
 
-    return warnings
+            folder = file.parent.as_posix()
+            folder_collisions[folder] = folder_collisions.get(folder, 0) + 1
+
+    return warnings, folder_collisions
+
+
+def classify_collisions(
+        colliding_files: list[Path],
+        source_sound_path: Path,
+        target_sound_path: Path,
+        hasher: FileHasher) -> tuple[list[Path], list[Path], list[Path]]:
+    """
+    Sorts same-named files by whether overwriting them changes anything.
+    Sizes are compared first, and only same-sized pairs are hashed.
+    :param colliding_files: Files found in both sounds folders,
+        relative to them
+    :param source_sound_path: The source sounds folder
+    :param target_sound_path: The target sounds folder
+    :param hasher: Hashes the same-sized pairs, several at a time
+    :return: A tuple containing the following items:
+        Files whose contents are identical in both places
+        Files whose contents differ
+        Files whose contents differ, and whose target copy is newer
+    """
+
+    differs: dict[Path, bool] = {}
+    target_is_newer: dict[Path, bool] = {}
+    same_size: list[Path] = []
+
+    for file in colliding_files:
+        try:
+            source_stat = (source_sound_path / file).stat()
+            target_stat = (target_sound_path / file).stat()
+        except OSError:
+            # Can't tell, so let the user decide
+            differs[file] = True
+            target_is_newer[file] = False
+            continue
+
+        target_is_newer[file] = target_stat.st_mtime_ns > source_stat.st_mtime_ns
+
+        # Hard links to the same file can't differ
+        if (source_stat.st_dev, source_stat.st_ino) == \
+                (target_stat.st_dev, target_stat.st_ino):
+            differs[file] = False
+        elif source_stat.st_size != target_stat.st_size:
+            differs[file] = True
+        else:
+            same_size.append(file)
+
+    digests, _ = hasher.hash_files(
+        [folder / file for file in same_size
+         for folder in (source_sound_path, target_sound_path)])
+
+    for file in same_size:
+        source_digest = digests.get(source_sound_path / file)
+        differs[file] = source_digest is None or \
+            source_digest != digests.get(target_sound_path / file)
+
+    identical: list[Path] = []
+    differing: list[Path] = []
+    target_newer: list[Path] = []
+
+    for file in colliding_files:
+        if not differs[file]:
+            identical.append(file)
+        elif target_is_newer[file]:
+            target_newer.append(file)
+        else:
+            differing.append(file)
+
+    return identical, differing, target_newer
+
+
+def classify_archive_collisions(
+        colliding_files: list[Path],
+        source: Path | PackArchive,
+        target: Path | PackArchive,
+        workers: int = 8) -> tuple[list[Path], list[Path], list[Path]]:
+    """
+    Like classify_collisions, for when either side is a zip.  Zips
+    already store each file's CRC-32, so CRCs are compared instead of
+    hashes, and only the side that is a folder has anything to read.
+    :param colliding_files: Files found in both sounds folders,
+        relative to them
+    :param source: The source namespace folder or zip
+    :param target: The target namespace folder or zip
+    :param workers: How many folder files to checksum at once
+    :return: A tuple containing the following items:
+        Files whose contents are identical in both places
+        Files whose contents differ
+        Files whose contents differ, and whose target copy is newer
+    """
+
+    def get_facts(side: Path | PackArchive, file: Path):
+        """:return: The file's size, modification time, and CRC if known"""
+
+        if isinstance(side, PackArchive):
+            member = side.sound_member(file)
+            return member.size, member.mtime, member.crc
+
+        stat = (side / "sounds" / file).stat()
+        return stat.st_size, stat.st_mtime, None
+
+    def get_crc(side: Path | PackArchive, file: Path, crc: int | None):
+        return crc if crc is not None else crc32_file(side / "sounds" / file)
+
+    identical: list[Path] = []
+    differing: list[Path] = []
+    target_newer: list[Path] = []
+    same_size: list[tuple[Path, bool, int | None, int | None]] = []
+
+    for file in colliding_files:
+        try:
+            source_size, source_mtime, source_crc = get_facts(source, file)
+            target_size, target_mtime, target_crc = get_facts(target, file)
+        except (OSError, KeyError):
+            # Can't tell, so let the user decide
+            differing.append(file)
+            continue
+
+        # Zip timestamps only count every other second
+        is_newer = target_mtime > source_mtime + 2
+
+        if source_size != target_size:
+            (target_newer if is_newer else differing).append(file)
+        else:
+            same_size.append((file, is_newer, source_crc, target_crc))
+
+    def compare(item) -> tuple[Path, bool, bool]:
+        file, is_newer, source_crc, target_crc = item
+        try:
+            return file, is_newer, get_crc(source, file, source_crc) != \
+                get_crc(target, file, target_crc)
+        except OSError:
+            return file, is_newer, True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for file, is_newer, differs in pool.map(compare, same_size):
+            if not differs:
+                identical.append(file)
+            elif is_newer:
+                target_newer.append(file)
+            else:
+                differing.append(file)
+
+    return identical, differing, target_newer
+
+
+def is_file_unchanged(path: Path, data: bytes) -> bool:
+    """
+    Checks whether a file on disk already holds exactly the given bytes.
+    Sizes are compared first, so most changed files are never read.
+    """
+
+    if not path.exists() or path.stat().st_size != len(data):
+        return False
+
+    with open(path, "rb") as fp:
+        existing = hashlib.file_digest(fp, "sha256").digest()
+
+    return existing == hashlib.sha256(data).digest()
+
+
+def encode_events(
+        events: dict[str, SoundEvent],
+        output_format: OutputFormat = OutputFormat.compact) -> str:
+    """
+    Encodes a dictionary of sound events in the requested layout
+    :param events: The sound events to be encoded
+    :param output_format: compact for human review,
+        minified for shipping packs
+    :return: The encoded json text
+    """
+
+    # Canonical form (sorted keys, no whitespace) goes through the
+    # C-accelerated encoder, and is stable enough to content-address
+    if output_format == OutputFormat.minified:
+        return json.dumps(events, separators=(",", ":"), sort_keys=True)
+
+    return json.dumps(events, indent=4, cls=CompactJSONEncoder)
+
+
+def write_events(
+        events: dict[str, SoundEvent],
+        path: Path,
+        output_format: OutputFormat = OutputFormat.compact) -> tuple[str, bool]:
+    """
+    Encodes a dictionary of sound events and writes it to disk,
+    unless the file already has identical contents
+    :param events: The sound events to be written
+    :param path: The json file to write
+    :param output_format: The layout to write the file in
+    :return: A tuple containing the following items:
+        The encoded text, so it can be shown without encoding it again
+        Whether the file was written (False when it was unchanged)
+    """
+
+    text = encode_events(events, output_format)
+    data = text.encode()
+
+    # Leave identical files alone, so their modification time is kept
+    if is_file_unchanged(path, data):
+        return text, False
+
+    with open(path, "wb") as fp:
+        fp.write(data)
+
+    return text, True
+
+
+def get_event_changes(
+        previous_events: dict[str, SoundEvent],
+        current_events: dict[str, SoundEvent]
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    Compares two dictionaries of sound events by event name
+    :param previous_events: The events as they were before this run
+    :param current_events: The events as they are now
+    :return: A tuple containing the names of the events that were
+        added, changed and removed, in that order
+    """
+
+    added: list[str] = []
+    changed: list[str] = []
+
+    for event_name, event in current_events.items():
+        if event_name not in previous_events:
+            added.append(event_name)
+        elif event != previous_events[event_name]:
+            changed.append(event_name)
+
+    removed: list[str] = [
+        e for e in previous_events if e not in current_events]
+
+    return added, changed, removed
+
+
+def get_event_diff(
+        previous_events: dict[str, SoundEvent],
+        current_events: dict[str, SoundEvent],
+        event_names: list[str]) -> list[str]:
+    """
+    Builds a unified diff of only the named events, encoding each
+    event on its own rather than diffing the text of whole files
+    :param previous_events: The events as they were before this run
+    :param current_events: The events as they are now
+    :param event_names: The events to include in the diff
+    :return: The lines of the diff
+    """
+
+    lines: list[str] = []
+
+    for event_name in event_names:
+        before = encode_events(
+            {event_name: previous_events[event_name]}).splitlines() \
+            if event_name in previous_events else []
+        after = encode_events(
+            {event_name: current_events[event_name]}).splitlines() \
+            if event_name in current_events else []
+
+        lines.extend(difflib.unified_diff(
+            before, after, f"a/{event_name}", f"b/{event_name}", lineterm=""))
+
+    return lines
+
+
+def print_event_summary(
+        file_name: str,
+        previous_events: dict[str, SoundEvent],
+        current_events: dict[str, SoundEvent],
+        show_diff: bool):
+
+    added, changed, removed = get_event_changes(
+        previous_events, current_events)
+    unchanged = len(current_events) - len(added) - len(changed)
+
+    print(f"\n{file_name}: {len(added)} added, {len(changed)} changed, "
+          f"{len(removed)} removed, {unchanged} unchanged")
+
+    for e in added:
+        count = len(current_events[e].get("sounds", []))
+        print(f"{Color.green.value}+ {e}{Color.default.value} "
+              f"({count} sounds)")
+
+    for e in changed:
+        before = len(previous_events[e].get("sounds", []))
+        after = len(current_events[e].get("sounds", []))
+        print(f"{Color.cyan.value}~ {e}{Color.default.value} "
+              f"({before} -> {after} sounds)")
+
+    for e in removed:
+        count = len(previous_events[e].get("sounds", []))
+        print(f"{Color.red.value}- {e}{Color.default.value} "
+              f"(had {count} sounds)")
+
+    if not show_diff:
+        return
+
+    print()
+    for line in get_event_diff(
+            previous_events, current_events, added + changed + removed):
+        color = Color.default if line.startswith(("+++", "---")) else \
+            Color.green if line.startswith("+") else \
+            Color.red if line.startswith("-") else \
+            Color.cyan if line.startswith("@@") else Color.default
+        print(f"{color.value}{line}{Color.default.value}")
+
+
+def resume_deployment(deployment: Deployment):
+    """
+    Offers to resume an interrupted transactional deployment,
+    and rolls it back if the user declines
+    """
+
+    if not deployment.is_interrupted():
+        return
+
+    response = input(
+        f"\nAn interrupted deployment was found in "
+        f"{deployment.staging_path}.\n"
+        f"Resume it? Answering no rolls it back. (y/N) ")
+
+    # Both end the run successfully, as declining any other prompt does
+    if response.lower() != "y":
+        deployment.rollback()
+        print("Interrupted deployment rolled back.")
+        sys.exit()
+
+    # The files were all staged, so the commit can finish on its own
+    if deployment.is_committing():
+        deployment.commit()
+        print("Interrupted deployment finished.")
+        sys.exit()
 
 
 def print_banner(title: str, info: str):
@@ -323,6 +1396,22 @@ def print_banner(title: str, info: str):
     print(f"{Color.cyan.value}{info}{Color.default.value}")
 
 
+def print_write_status(file_name: str, written: bool):
+
+    status = "written" if written else "unchanged"
+    print(f"\n{file_name}: {Color.cyan.value}{status}{Color.default.value}")
+
+
+def print_copy_progress(report: CopyReport):
+    """Rewrites one status line while files are being copied"""
+
+    print(f"\rCopied {report.files_copied} files "
+          f"({report.bytes_copied / 1_000_000:.1f} MB): "
+          f"{report.files_per_second:.0f} files/s, "
+          f"{report.bytes_per_second / 1_000_000:.1f} MB/s",
+          end="", flush=True)
+
+
 def print_warnings(
         warnings: list[str],
         header: str,
@@ -350,16 +1439,219 @@ def print_warnings(
 
 def copy_sound_files(
         sound_files: list[Path],
-        source_path: Path,
-        target_path: Path):
+        source_path: Path | PackArchive,
+        target_path: Path,
+        engine: CopyEngine,
+        target_files: list[Path] | None = None) -> CopyReport:
+    """
+    Copies ogg files from the source sounds folder to the target one
+    :param sound_files: Files to copy, relative to the sounds folder
+    :param source_path: The source namespace folder or zip.
+        Files in a zip are always extracted, whatever the engine's mode.
+    :param target_path: The target namespace folder
+    :param engine: The copy engine that does the work
+    :param target_files: The files already in the target sounds folder,
+        if they have been listed, so they don't have to be looked up again
+    :return: The copy engine's report
+    """
 
-    for file in sound_files:
+    target_sound_path = target_path / "sounds"
+
+    if isinstance(source_path, PackArchive):
+        return source_path.extract_sound_files(
+            [(file, target_sound_path / file) for file in sound_files],
+            engine.workers,
+            engine.transform,
+            engine.throttle)
+
+    source_sound_path = source_path / "sounds"
+
+    files: list[tuple[Path, Path]] = [
+        (source_sound_path / file, target_sound_path / file)
+        for file in sound_files]
+
+    existing_targets: set[Path] | None = None
+    if target_files is not None:
+        existing_targets = {target_sound_path / f for f in target_files}
+
+    return engine.copy_files(files, existing_targets)
+
+
+def get_zip_members(
+        sound_files: list[Path],
+        source: Path | PackArchive,
+        sounds_json: bytes,
+        target: Path | PackArchive | None = None,
+        include_target_files: bool = True
+) -> list[tuple[str, Path | ArchiveMember | bytes]]:
+    """
+    Lays out a resource pack zip: the pack's own metadata and sound files,
+    then the source sound files over the top, then sounds.json.
+    A zipped target pack keeps everything else it held, too.
+    :param sound_files: Source files, relative to the sounds folder
+    :param source: The source namespace folder or zip
+    :param sounds_json: The encoded, combined sounds.json
+    :param target: The target namespace folder or pack zip, if there is one
+    :param include_target_files: Whether the target's own files go in too,
+        or only the source files and sounds.json, as in a delta
+    :return: (name in the zip, file or contents) pairs
+    """
+
+    if isinstance(target, (Path, PackArchive)):
+        namespace = target.name if isinstance(target, Path) \
+            else target.namespace
+    else:
+        namespace = source.name if isinstance(source, Path) \
+            else source.namespace
+
+    sound_prefix = f"assets/{namespace}/sounds/"
+    sounds_json_name = "assets/minecraft/sounds.json"
+    members: list[tuple[str, Path | ArchiveMember | bytes]] = []
+
+    # Source files replace same-named target files
+    replaced = {sound_prefix + f.as_posix() for f in sound_files}
+    replaced.add(sounds_json_name)
+
+    if include_target_files and isinstance(target, PackArchive):
+        members.extend(
+            (member.name, member) for member in target.members()
+            if member.name not in replaced)
+    elif include_target_files and target is not None:
+        pack_path = target.parent.parent
+        for name in ["pack.mcmeta", "pack.png"]:
+            if (pack_path / name).is_file():
+                members.append((name, pack_path / name))
+
+        target_files, _ = list_sound_files(target / "sounds")
+        members.extend(
+            (sound_prefix + f.as_posix(), target / "sounds" / f)
+            for f in sorted(target_files)
+            if sound_prefix + f.as_posix() not in replaced)
+
+    members.extend(
+        (sound_prefix + f.as_posix(),
+         source.sound_member(f) if isinstance(source, PackArchive)
+         else source / "sounds" / f)
+        for f in sorted(sound_files))
+    members.append((sounds_json_name, sounds_json))
+
+    return members
+
+
+def confirm_overwrites(
+        sound_files: list[Path],
+        source: Path | PackArchive,
+        target: Path | PackArchive,
+        hasher: FileHasher,
+        quiet: bool,
+        abort_on_warnings: bool) -> list[Path]:
+    """
+    Warns about source files that would replace different target files,
+    and asks the user whether to go on
+    :param sound_files: Source files, relative to the sounds folder
+    :param source: The source namespace folder or zip
+    :param target: The target namespace folder or zip
+    :param hasher: Hashes same-sized files when both sides are folders
+    :param quiet: Whether to skip the informational messages
+    :param abort_on_warnings: Whether warnings are fatal
+    :return: The files already in the target sounds folder
+    """
+
+    # pull lists of files from target
+    target_files, target_keys = target.list_sound_files() \
+        if isinstance(target, PackArchive) \
+        else list_sound_files(target / "sounds")
+    colliding_files = [f for f in sound_files if f.as_posix() in target_keys]
+
+    # Only same-named files whose contents differ are worth asking about
+    if isinstance(source, Path) and isinstance(target, Path):
+        identical, differing, target_newer = classify_collisions(
+            colliding_files, source / "sounds", target / "sounds", hasher)
+    else:
+        identical, differing, target_newer = classify_archive_collisions(
+            colliding_files, source, target, hasher.workers)
+
+    overwrite_warnings, folder_collisions = check_for_overwritten_files(
+        differing, target_keys)
+
+    if not quiet and identical:
+        print(f"\n{len(identical)} same-named files are identical "
+              f"to the target and need no confirmation.")
+
+    if not quiet and folder_collisions:
+        print("\nFolders with files that could be overwritten:")
+        for folder, count in sorted(
+                folder_collisions.items(), key=lambda ele: -ele[1]):
+            print(f"{count:>8}  {folder}")
+
+    print_warnings(
+        [f".../{f}" for f in target_newer],
+        f"{len(target_newer)} file(s) in the target "
+        f"are newer than the source:",
+        "overwrite these newer files",
+        abort_on_warnings)
+
+    print_warnings(
+        overwrite_warnings,
+        f"Files could be overwritten during this process.  "
+        f"{len(overwrite_warnings)} warning(s) "
+        f"in {len(folder_collisions)} folder(s):",
+        "overwrite these files",
+        abort_on_warnings)
 
-        source = source_path / "sounds" / file
-        target = target_path / "sounds" / file
+    return target_files
 
-        target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, target)
+
+def get_delta_files(
+        sound_files: list[Path],
+        source: Path | PackArchive,
+        manifest_path: Path,
+        hasher: FileHasher,
+        quiet: bool,
+        abort_on_warnings: bool) -> tuple[list[Path], ReleaseManifest]:
+    """
+    Works out which source files changed since the last release
+    :param sound_files: Source files, relative to the sounds folder
+    :param source: The source namespace folder
+    :param manifest_path: The last release's manifest.
+        If it doesn't exist yet, every file counts as new.
+    :param hasher: Hashes files whose size or modification time changed
+    :param quiet: Whether to skip the informational messages
+    :param abort_on_warnings: Whether warnings are fatal
+    :return: A tuple containing the following items:
+        The files that are new or changed
+        The manifest for this release
+    """
+
+    if isinstance(source, PackArchive):
+        sys.exit("--delta needs a source folder, not a zip.")
+
+    try:
+        previous = ReleaseManifest.load(manifest_path)
+    except (OSError, ValueError, KeyError) as error:
+        sys.exit(f"Cannot read the manifest {manifest_path}: {error}")
+
+    manifest, warnings = previous.update(source / "sounds", sound_files, hasher)
+    print_warnings(
+        warnings,
+        f"{len(warnings)} files could not be hashed:",
+        "leave them out of the delta",
+        abort_on_warnings)
+
+    changed, removed = previous.get_changes(manifest)
+
+    if not quiet:
+        print(f"\n{len(changed)} files are new or changed since the last "
+              f"release, and {len(manifest.files) - len(changed)} are not.")
+
+    print_warnings(
+        [f".../{f}" for f in removed],
+        f"{len(removed)} files are gone since the last release, "
+        f"but a delta cannot remove them:",
+        "continue",
+        abort_on_warnings)
+
+    return [Path(key) for key in changed], manifest
 
 
 # Main -------------------------------------------------
@@ -371,6 +1663,24 @@ def main():
 
     args = handle_command_line()
 
+    # Linting only looks at the target pack, so there's no source to check
+    if args.lint:
+        target_path = args.target.resolve()
+        if not (target_path / "sounds").is_dir():
+            sys.exit(f"{target_path} has no sounds folder to lint")
+
+        if not args.quiet:
+            print_banner("Linting target pack:", f"Target folder: {target_path}")
+
+        dangling, orphans, unknown_events = lint_pack(
+            target_path, SoundEventCatalog())
+        print_lint_results(dangling, orphans, unknown_events)
+
+        if dangling or orphans or unknown_events:
+            sys.exit(f"{Color.red.value}\nThe target pack has problems."
+                     f"{Color.default.value}")
+        sys.exit()
+
     try:
         validate_source_path(args.source)
     except FileNotFoundError as error:
@@ -383,33 +1693,150 @@ def main():
 
     source_path: Path = args.source
 
+    # A zipped namespace folder is read where it is, without extracting it
+    source_archive: PackArchive | None = None
+    if PackArchive.is_archive(source_path):
+        source_archive = PackArchive.open_namespace(source_path)
+        atexit.register(source_archive.close)
+    source: Path | PackArchive = \
+        source_path if source_archive is None else source_archive
+    namespace = \
+        source_path.name if source_archive is None else source_archive.namespace
+
     if not args.quiet:
         print_banner(
             "Processing staging area ogg files:",
             f"Source folder: {source_path}")
 
-    source_sound_path = source_path / "sounds"
-    ogg_files: list[Path] = [
-        f.relative_to(source_sound_path)
-        for f in source_sound_path.rglob('*.ogg')]
+    ogg_files, _ = list_sound_files(source_path / "sounds") \
+        if source_archive is None else source_archive.list_sound_files()
     sound_files, warnings = process_ogg_files(ogg_files)
+
+    # A verify run only checks every page of every file, then stops
+    if args.verify is not None:
+        try:
+            verifier = OggVerifier(args.jobs)
+        except (TypeError, ValueError) as error:
+            sys.exit(str(error))
+
+        # Files with names Minecraft won't accept are listed, not checked
+        valid_files = set(sound_files)
+        verify_report = verifier.verify_files(
+            get_sound_sources(sound_files, source),
+            [f"{file} <- Path does not match valid naming rules"
+             for file in sorted(ogg_files) if file not in valid_files])
+
+        try:
+            verify_report.write(args.verify)
+        except OSError as error:
+            sys.exit(str(error))
+
+        if not args.quiet:
+            print(f"\n{verify_report}")
+
+        if verify_report.errors:
+            sys.exit(f"{Color.red.value}\n{len(verify_report.errors)} files "
+                     f"are corrupt.  See {args.verify}{Color.default.value}")
+        sys.exit()
+
+    # Headers and hashes are kept between runs, for files that haven't
+    # changed.  Whatever is still waiting to be written goes in on exit.
+    try:
+        metadata_cache = MetadataCache(
+            source_path / ".spindex-cache.sqlite" if source_archive is None
+            else None)
+    except sqlite3.Error as error:
+        warnings.append(f"{source_path / '.spindex-cache.sqlite'} <- {error}")
+        metadata_cache = MetadataCache()
+    atexit.register(metadata_cache.close)
+
+    try:
+        inspector = OggInspector(args.jobs, metadata_cache)
+    except (TypeError, ValueError) as error:
+        sys.exit(str(error))
+
+    # Files that aren't really Ogg Vorbis only fail once they're in the game
+    sound_files, sound_info, ogg_warnings = inspect_sound_files(
+        sound_files, source, inspector)
+    warnings.extend(ogg_warnings)
+
     print_warnings(
         warnings,
         f"There were {len(warnings)} warnings during the process:",
         "continue",
         args.abort_warnings)
 
+    # Channel counts come from the metadata cache, so this costs nothing
+    catalog = SoundEventCatalog()
+    print_stereo_warnings(get_stereo_warnings(sound_info, catalog))
+
     # Get the sound event defaults from the json file
-    with open(source_path / 'defaults.json') as f:
-        default_data = json.load(f)
+    if source_archive is None:
+        with open(source_path / 'defaults.json') as f:
+            default_data = json.load(f)
+    else:
+        default_data = json.loads(source_archive.member(
+            f"{source_archive.root}defaults.json").read_bytes())
+
+    # Stream and preload suggestions fill in what defaults.json leaves out
+    sound_values: dict[str, SoundEventDefaults] = {}
+    if args.loading_advice is not None:
+        recommendations = get_loading_recommendations(
+            sound_files, sound_info, namespace, catalog, LoadingAdvisor())
+
+        if not args.quiet:
+            print_loading_recommendations(recommendations)
+
+        if args.loading_advice == LoadingAdvice.apply:
+            sound_values = {
+                name: SoundEventDefaults(**{mode.value: True})
+                for name, mode in recommendations.items()}
+
+    # Tags set on a sound file win over defaults.json
+    sound_overrides: dict[str, SoundEventDefaults] = {}
+    if args.tags is not None:
+        warnings = get_tag_warnings(sound_info)
+
+        if args.tags == TagMode.apply:
+            sound_overrides, tag_warnings = get_tag_overrides(
+                sound_info, namespace)
+            warnings.extend(tag_warnings)
+
+        print_warnings(
+            warnings,
+            f"There were {len(warnings)} warnings about metadata tags:",
+            "continue",
+            args.abort_warnings)
+
+    # Identical files are shipped once, and named from every event
+    duplicates: dict[Path, Path] = {}
+    if args.dedup:
+        try:
+            duplicates, warnings = find_duplicate_sounds(
+                sound_files,
+                source,
+                sound_info,
+                FileHasher(args.jobs, cache=metadata_cache))
+        except (TypeError, ValueError) as error:
+            sys.exit(str(error))
+
+        print_warnings(
+            warnings,
+            f"{len(warnings)} files could not be checked for duplicates:",
+            "continue",
+            args.abort_warnings)
 
     # Generate events from our .ogg files,
     # and return any warnings that happened along the way
     generated_events, warnings = get_generated_events(
-        source_path.name,
+        namespace,
         sound_files,
-        Defaults(default_data),
-        SoundEventCatalog())
+        Defaults(default_data, sound_values, sound_overrides),
+        catalog,
+        duplicates)
+
+    # From here on, only the files that are shipped matter
+    sound_files = [f for f in sound_files if f not in duplicates]
 
     # If nothing was generated, just get out
     if len(generated_events) == 0:
@@ -424,14 +1851,123 @@ def main():
         "skip those files",
         args.abort_warnings)
 
+    # Keep the last run's results around, so we can show what changed.
+    # A zipped source gets its generated file beside the zip.
+    generated_json_file = source_path / "generated-sounds.json" \
+        if source_archive is None \
+        else source_path.with_name("generated-sounds.json")
+    previous_generated_events = get_event_dictionary(generated_json_file) \
+        if args.preview != PreviewMode.full else {}
+
     # Write the finished file to the source folder
-    with open(source_path / "generated-sounds.json", "w") as fp:
-        json.dump(generated_events, fp, indent=4, cls=CompactJSONEncoder)
+    generated_text, written = write_events(
+        generated_events, generated_json_file, args.generated_format)
 
     # Show the user what was written to the source folder, unless in quiet mode
     if not args.quiet:
-        print("\ngenerated-sounds.json contains the following contents:\n")
-        print(json.dumps(generated_events, indent=4, cls=CompactJSONEncoder))
+        if args.preview == PreviewMode.full:
+            print("\ngenerated-sounds.json contains the following contents:\n")
+            print(generated_text)
+        else:
+            print_event_summary(
+                "generated-sounds.json",
+                previous_generated_events,
+                generated_events,
+                args.preview == PreviewMode.diff)
+        print_write_status("generated-sounds.json", written)
+        print_durations(
+            get_event_durations(generated_events, namespace, sound_info),
+            args.durations)
+        if duplicates:
+            print_duplicates(duplicates, sound_info, namespace)
+
+    # Stripping happens as files are written, wherever they go
+    stripper: MetadataStripper | None = \
+        MetadataStripper() if args.strip_metadata else None
+
+    # The target option's default stands in for a missing path
+    target_path: Path | None = \
+        None if args.target.resolve() is None else args.target
+
+    # A zipped target pack can only be rewritten as a whole
+    target_archive: PackArchive | None = None
+    if PackArchive.is_archive(target_path):
+        target_archive = PackArchive(target_path, f"assets/{namespace}/")
+        atexit.register(target_archive.close)
+
+    # Build the pack zip instead of copying to the target folder
+    if (args.zip is not None or target_archive is not None) and \
+            not args.index_only:
+        target: Path | PackArchive | None = \
+            target_path if target_archive is None else target_archive
+
+        # Without --zip, the target zip itself is rewritten, so ask first,
+        # as for a target folder
+        if args.zip is None:
+            print(f"\nTarget set to existing pack zip at:"
+                  f"\n{Color.cyan.value}{target_path}{Color.default.value}")
+            response = input(
+                "\nIncorporate source files into existing pack? (y/N) ")
+            if response.lower() != "y":
+                sys.exit()
+
+        try:
+            hasher = FileHasher(args.jobs, cache=metadata_cache)
+            pack_zip = PackZip(
+                args.jobs, None if stripper is None else stripper.strip)
+        except (TypeError, ValueError) as error:
+            sys.exit(str(error))
+
+        if target is not None:
+            confirm_overwrites(
+                sound_files,
+                source,
+                target,
+                hasher,
+                args.quiet,
+                args.abort_warnings)
+
+        if target_archive is not None:
+            target_events: dict[str, SoundEvent] = \
+                target_archive.read_json("assets/minecraft/sounds.json")
+        elif target_path is not None:
+            target_events = get_event_dictionary(
+                target_path.parent / "minecraft" / "sounds.json")
+        else:
+            target_events = {}
+
+        combined_json = generated_events if not target_events else (
+            get_combined_events(generated_events, target_events))
+
+        # A delta only ships the files that changed since the last release
+        zip_sound_files = sound_files
+        manifest: ReleaseManifest | None = None
+        if args.delta is not None:
+            zip_sound_files, manifest = get_delta_files(
+                sound_files, source, args.delta, hasher,
+                args.quiet, args.abort_warnings)
+
+        members = get_zip_members(
+            zip_sound_files,
+            source,
+            encode_events(combined_json, args.target_format).encode(),
+            target,
+            args.delta is None)
+
+        # Without --zip, the target zip is replaced once the new one is done
+        try:
+            zip_report = pack_zip.write(args.zip or target_path, members)
+            if manifest is not None:
+                manifest.save(
+                    args.zip.with_name(f"{args.zip.stem}.manifest.json"))
+        except (OSError, ValueError) as error:
+            sys.exit(str(error))
+
+        if not args.quiet:
+            print(f"\n{zip_report}")
+            if stripper is not None:
+                print_strip_report(stripper)
+        sys.exit()
 
     # Just get out if index-only mode is set or if no target folder specified
     if args.index_only or args.target is None or args.target.resolve() is None:
@@ -455,24 +1991,69 @@ def main():
         print_banner("Copying files to target location:",
                      f"Target folder: {args.target}")
 
-    # pull lists of files from target
-    target_sound_path = args.target / "sounds"
-    target_files: list[Path] = list(
-        f.relative_to(target_sound_path)
-        for f in target_sound_path.rglob("*.ogg"))
-    overwrite_warnings = check_for_overwritten_files(sound_files, target_files)
-    print_warnings(
-        overwrite_warnings,
-        f"Files could be overwritten during this process.  "
-        f"{len(overwrite_warnings)} warning(s):",
-        "overwrite these files",
+    target_json_file = args.target.parent / "minecraft" / "sounds.json"
+
+    deployment: Deployment | None = None
+    if args.transactional:
+        deployment = Deployment(args.target / "sounds", target_json_file)
+        resume_deployment(deployment)
+
+    try:
+        # Staged files are compared with the staging folder, so a resumed
+        # deployment doesn't copy files that were already staged
+        engine = CopyEngine(
+            args.jobs,
+            args.incremental or deployment is not None,
+            args.checksum,
+            args.link_mode,
+            args.limit_rate,
+            args.limit_files,
+            None if args.quiet else print_copy_progress,
+            None if stripper is None else stripper.strip,
+            metadata_cache)
+        hasher = FileHasher(args.jobs, cache=metadata_cache)
+    except (TypeError, ValueError) as error:
+        sys.exit(str(error))
+
+    target_files = confirm_overwrites(
+        sound_files,
+        source,
+        args.target,
+        hasher,
+        args.quiet,
         args.abort_warnings)
 
-    # Copy OGG files to the target folder,
+    # Copy OGG files to the target folder (or to the staging folder,
+    # for a transactional deployment),
     # creating folder structure if it doesn't exist
-    copy_sound_files(sound_files, args.source, args.target)
+    if deployment is None:
+        copy_report = copy_sound_files(
+            sound_files, source, args.target, engine, target_files)
+    else:
+        deployment.begin()
+        copy_report = copy_sound_files(
+            sound_files, source, deployment.staging_path, engine)
 
-    target_json_file = args.target.parent / "minecraft" / "sounds.json"
+    if not args.quiet:
+        print(f"\n{copy_report}")
+        if stripper is not None:
+            print_strip_report(stripper)
+
+    # Nothing in the target has changed yet, so leave what was staged
+    # for the next run to resume from
+    if deployment is not None and copy_report.errors:
+        print(f"\n{len(copy_report.errors)} files could not be staged:"
+              f"\n{Color.red.value}")
+        for error in copy_report.errors:
+            print(error)
+        sys.exit(f"\n{Color.default.value}The target was not changed.  "
+                 f"Run again to resume the deployment.")
+
+    print_warnings(
+        copy_report.errors,
+        f"{len(copy_report.errors)} files could not be copied:",
+        "update sounds.json anyway",
+        args.abort_warnings)
 
     if not args.quiet:
         print_banner(
@@ -486,21 +2067,38 @@ def main():
 
     # Combine JSON files - If target is empty, just use source
     target_events = get_event_dictionary(target_json_file)
+
+    # Merging changes target events in place, so copy the ones it will touch
+    previous_target_events = {**target_events, **{
+        e: copy.deepcopy(target_events[e])
+        for e in generated_events if e in target_events}}
     combined_json = generated_events if not target_events else (
         get_combined_events(generated_events, target_events))
 
     # Write the finished file to the target folder
-    with open(target_json_file, "w") as fp:
-        json.dump(combined_json, fp, indent=4, cls=CompactJSONEncoder)
+    if deployment is None:
+        combined_text, written = write_events(
+            combined_json, target_json_file, args.target_format)
+    else:
+        combined_text = encode_events(combined_json, args.target_format)
+        combined_data = combined_text.encode()
+        written = not is_file_unchanged(target_json_file, combined_data)
+
+        # Swap the staged files and the new sounds.json into the target
+        deployment.commit(sound_files, combined_data if written else None)
 
     # Show the user what was written to the target folder, unless in quiet mode
     if not args.quiet:
-        print("\nCombined file has the following contents:\n")
-        print(json.dumps(
-            combined_json,
-            indent=4,
-            cls=CompactJSONEncoder,
-            sort_keys=True))
+        if args.preview == PreviewMode.full:
+            print("\nCombined file has the following contents:\n")
+            print(combined_text)
+        else:
+            print_event_summary(
+                "sounds.json",
+                previous_target_events,
+                combined_json,
+                args.preview == PreviewMode.diff)
+        print_write_status("sounds.json", written)
 
 
 # ------------------------------------------------------
@@ -0,0 +1,70 @@
+import struct
+
+
+def ogg_crc(data: bytes) -> int:
+    """The Ogg page checksum, worked out the slow, obvious way"""
+
+    crc = 0
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = (crc << 1) ^ 0x04C11DB7 if crc & 0x80000000 else crc << 1
+            crc &= 0xFFFFFFFF
+    return crc
+
+
+def make_page(packets: list[bytes], header_type: int = 0, granule_position: int = 0,
+              serial_number: int = 1, sequence_number: int = 0) -> bytes:
+    """Builds one Ogg page holding whole packets, with a correct CRC"""
+
+    segments = b""
+    for packet in packets:
+        segments += b"\xff" * (len(packet) // 255) + bytes([len(packet) % 255])
+
+    return make_raw_page(b"".join(packets), segments, header_type, granule_position,
+                         serial_number, sequence_number)
+
+
+def make_raw_page(data: bytes, segments: bytes, header_type: int = 0, granule_position: int = 0,
+                  serial_number: int = 1, sequence_number: int = 0) -> bytes:
+    """Builds one Ogg page from a segment table of your own, with a correct CRC"""
+
+    header = struct.pack(
+        "<4sBBqIIIB", b"OggS", 0, header_type, granule_position,
+        serial_number, sequence_number, 0, len(segments)) + segments
+    page = header + data
+    return page[:22] + struct.pack("<I", ogg_crc(page)) + page[26:]
+
+
+def make_identification(channels: int = 1, sample_rate: int = 44100) -> bytes:
+    return struct.pack("<B6sIBIiiiBB", 1, b"vorbis", 0, channels, sample_rate, 0, 0, 0, 0xB8, 1)
+
+
+def make_comments(comments: list[str], vendor: str = "test") -> bytes:
+    packet = b"\x03vorbis" + struct.pack("<I", len(vendor)) + vendor.encode()
+    packet += struct.pack("<I", len(comments))
+    for comment in comments:
+        packet += struct.pack("<I", len(comment.encode())) + comment.encode()
+    return packet + b"\x01"
+
+
+def make_vorbis_file(channels: int = 1, sample_rate: int = 44100, samples: int = 44100,
+                     comments: list[str] | None = None, audio_pages: int = 2) -> bytes:
+    """
+    Builds a small Ogg Vorbis file.  The audio is made up, but the pages
+    are laid out the way a real encoder lays them out.
+    """
+
+    data = make_page([make_identification(channels, sample_rate)], header_type=0x02)
+    data += make_page(
+        [make_comments(comments or []), b"\x05vorbis" + b"\x00" * 40], sequence_number=1)
+
+    for page in range(audio_pages):
+        last = page == audio_pages - 1
+        data += make_page(
+            [bytes([page]) * 300],
+            header_type=0x04 if last else 0,
+            granule_position=samples if last else samples * (page + 1) // audio_pages,
+            sequence_number=page + 2)
+
+    return data
@@ -10,7 +10,7 @@ def test_check_for_overwritten_files_should_not_warn_when_no_files_in_target():
     target_files: list[Path] = []
 
     # Act
-    warnings = check_for_overwritten_files(source_files, target_files)
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_files)
 
     # Assert
     assert len(warnings) == 0
@@ -23,7 +23,7 @@ def test_check_for_overwritten_files_should_not_warn_when_path_is_different():
     target_files: list[Path] = [Path("entity/villager/hurt/file01.ogg")]
 
     # Act
-    warnings = check_for_overwritten_files(source_files, target_files)
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_files)
 
     # Assert
     assert len(warnings) == 0
@@ -36,7 +36,7 @@ def test_check_for_overwritten_files_should_not_warn_when_file_name_is_different
     target_files: list[Path] = [Path("entity/villager/ambient/file02.ogg")]
 
     # Act
-    warnings = check_for_overwritten_files(source_files, target_files)
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_files)
 
     # Assert
     assert len(warnings) == 0
@@ -49,7 +49,7 @@ def test_check_for_overwritten_files_should_warn_when_file_name_is_identical():
     target_files: list[Path] = [Path("entity/villager/ambient/file01.ogg")]
 
     # Act
-    warnings = check_for_overwritten_files(source_files, target_files)
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_files)
 
     # Assert
     assert len(warnings) == 1
@@ -72,9 +72,37 @@ def test_check_for_overwritten_files_should_warn_for_multiple_collisions():
     ]
 
     # Act
-    warnings = check_for_overwritten_files(source_files, target_files)
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_files)
 
     # Assert
     assert len(warnings) == 2
     assert warnings[0] == f".../{source_files[0]}"
     assert warnings[1] == f".../{source_files[2]}"
+    assert folder_collisions == {"entity/villager/ambient": 2}
+
+
+def test_check_for_overwritten_files_should_count_collisions_per_folder():
+
+    # Arrange
+    source_files: list[Path] = [
+        Path("entity/villager/ambient/file01.ogg"),
+        Path("entity/villager/ambient/file02.ogg"),
+        Path("entity/witch/death/file01.ogg")
+    ]
+
+    target_keys: set[str] = {
+        "entity/villager/ambient/file01.ogg",
+        "entity/villager/ambient/file02.ogg",
+        "entity/witch/death/file01.ogg",
+        "entity/witch/death/file02.ogg"
+    }
+
+    # Act
+    warnings, folder_collisions = check_for_overwritten_files(source_files, target_keys)
+
+    # Assert
+    assert len(warnings) == 3
+    assert folder_collisions == {
+        "entity/villager/ambient": 2,
+        "entity/witch/death": 1
+    }
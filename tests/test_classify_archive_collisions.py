@@ -0,0 +1,55 @@
+import os
+import time
+import zipfile
+from pathlib import Path
+
+from objects.pack_archive import PackArchive
+from spindex import classify_archive_collisions
+
+
+def test_classify_archive_collisions_should_compare_crcs_with_folder_files(tmp_path):
+
+    # Arrange: the zip's files are dated well before the folder's
+    source = tmp_path / "source"
+    (source / "sounds").mkdir(parents=True)
+    for name, data in [("same.ogg", b"abc"), ("size.ogg", b"abcd"), ("crc.ogg", b"xyz")]:
+        (source / "sounds" / name).write_bytes(data)
+
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in [("same.ogg", b"abc"), ("size.ogg", b"ab"), ("crc.ogg", b"abc")]:
+            archive.writestr(
+                zipfile.ZipInfo(f"assets/source/sounds/{name}", (2000, 1, 1, 0, 0, 0)), data)
+    target = PackArchive(path, "assets/source/")
+    files = [Path("same.ogg"), Path("size.ogg"), Path("crc.ogg")]
+
+    # Act
+    identical, differing, target_newer = classify_archive_collisions(files, source, target, 2)
+
+    # Assert
+    assert identical == [Path("same.ogg")]
+    assert sorted(differing) == [Path("crc.ogg"), Path("size.ogg")]
+    assert target_newer == []
+
+
+def test_classify_archive_collisions_should_find_newer_files_in_a_zip(tmp_path):
+
+    # Arrange
+    source = tmp_path / "source"
+    (source / "sounds").mkdir(parents=True)
+    (source / "sounds" / "file01.ogg").write_bytes(b"abc")
+    old = time.mktime((2001, 1, 1, 0, 0, 0, 0, 0, -1))
+    os.utime(source / "sounds" / "file01.ogg", (old, old))
+
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            zipfile.ZipInfo("assets/source/sounds/file01.ogg", (2020, 1, 1, 0, 0, 0)), b"xyz")
+
+    # Act
+    identical, differing, target_newer = classify_archive_collisions(
+        [Path("file01.ogg")], source, PackArchive(path, "assets/source/"))
+
+    # Assert
+    assert target_newer == [Path("file01.ogg")]
+    assert identical == differing == []
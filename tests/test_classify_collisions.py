@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from objects.file_hasher import FileHasher
+from spindex import classify_collisions
+
+
+def create_pair(tmp_path: Path, file: str, source: bytes, target: bytes):
+
+    for folder, contents in (("source", source), ("target", target)):
+        path = tmp_path / folder / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(contents)
+
+
+def test_classify_collisions_should_separate_identical_and_differing_files(tmp_path):
+
+    # Arrange
+    create_pair(tmp_path, "entity/villager/ambient/same.ogg", b"abc", b"abc")
+    create_pair(tmp_path, "entity/villager/ambient/same-size.ogg", b"abc", b"xyz")
+    create_pair(tmp_path, "entity/villager/ambient/other-size.ogg", b"abc", b"abcd")
+
+    files = [
+        Path("entity/villager/ambient/same.ogg"),
+        Path("entity/villager/ambient/same-size.ogg"),
+        Path("entity/villager/ambient/other-size.ogg")]
+
+    # Make sure the targets are older than the sources
+    for file in files:
+        os.utime(tmp_path / "target" / file, ns=(0, 0))
+
+    # Act
+    identical, differing, target_newer = classify_collisions(
+        files, tmp_path / "source", tmp_path / "target", FileHasher(2))
+
+    # Assert
+    assert identical == [files[0]]
+    assert differing == [files[1], files[2]]
+    assert target_newer == []
+
+
+def test_classify_collisions_should_flag_differing_targets_that_are_newer(tmp_path):
+
+    # Arrange
+    create_pair(tmp_path, "entity/villager/ambient/file01.ogg", b"abc", b"xyz")
+    file = Path("entity/villager/ambient/file01.ogg")
+    os.utime(tmp_path / "source" / file, ns=(0, 0))
+
+    # Act
+    identical, differing, target_newer = classify_collisions(
+        [file], tmp_path / "source", tmp_path / "target", FileHasher(1))
+
+    # Assert
+    assert identical == []
+    assert differing == []
+    assert target_newer == [file]
+
+
+def test_classify_collisions_should_not_call_newer_identical_files_a_problem(tmp_path):
+
+    # Arrange
+    create_pair(tmp_path, "entity/villager/ambient/file01.ogg", b"abc", b"abc")
+    file = Path("entity/villager/ambient/file01.ogg")
+    os.utime(tmp_path / "source" / file, ns=(0, 0))
+
+    # Act
+    identical, differing, target_newer = classify_collisions(
+        [file], tmp_path / "source", tmp_path / "target", FileHasher(1))
+
+    # Assert
+    assert identical == [file]
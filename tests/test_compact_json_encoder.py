@@ -0,0 +1,75 @@
+import json
+
+from json_encoder import CompactJSONEncoder
+
+
+def test_compact_json_encoder_should_put_small_containers_on_a_single_line():
+
+    # Arrange
+    data = {
+        "entity.villager.ambient": {
+            "replace": True,
+            "sounds": [
+                {"name": "namespace:entity/villager/ambient/file01", "volume": 0.3},
+                {"name": "namespace:entity/villager/ambient/file02", "weight": 2}
+            ],
+            "subtitle": "subtitles.entity.villager.ambient"
+        }
+    }
+
+    # Act
+    result = json.dumps(data, indent=4, cls=CompactJSONEncoder)
+
+    # Assert
+    assert result == (
+        '{\n'
+        '    "entity.villager.ambient": {\n'
+        '        "replace": true,\n'
+        '        "sounds": [\n'
+        '            {"name": "namespace:entity/villager/ambient/file01", "volume": 0.3},\n'
+        '            {"name": "namespace:entity/villager/ambient/file02", "weight": 2}\n'
+        '        ],\n'
+        '        "subtitle": "subtitles.entity.villager.ambient"\n'
+        '    }\n'
+        '}')
+
+
+def test_compact_json_encoder_should_split_containers_with_too_many_items():
+
+    # Arrange
+    data = list(range(CompactJSONEncoder.MAX_ITEMS + 1))
+
+    # Act
+    result = json.dumps(data, indent=2, cls=CompactJSONEncoder)
+
+    # Assert
+    assert result == "[\n" + ",\n".join(f"  {i}" for i in data) + "\n]"
+
+
+def test_compact_json_encoder_should_measure_width_the_way_str_does():
+
+    # Arrange: str() spells 1.0 with three characters, but it is encoded as "1"
+    fits = ["x" * 193, 1.0]
+    too_wide = ["x" * 194, 1.0]
+
+    # Act
+    fits_result = json.dumps(fits, cls=CompactJSONEncoder)
+    too_wide_result = json.dumps(too_wide, cls=CompactJSONEncoder)
+
+    # Assert
+    assert fits_result == f'["{"x" * 193}", 1]'
+    assert too_wide_result == f'[\n    "{"x" * 194}",\n    1\n]'
+
+
+def test_compact_json_encoder_should_write_the_same_output_with_dump_and_dumps(tmp_path):
+
+    # Arrange
+    data = {"test.event": {"sounds": [{"name": "namespace:path/to/sound", "pitch": 1.25}]}}
+    path = tmp_path / "sounds.json"
+
+    # Act
+    with open(path, "w") as fp:
+        json.dump(data, fp, indent=4, cls=CompactJSONEncoder)
+
+    # Assert
+    assert path.read_text() == json.dumps(data, indent=4, cls=CompactJSONEncoder)
@@ -0,0 +1,33 @@
+import os
+from pathlib import Path
+
+from objects.file_hasher import FileHasher
+from spindex import confirm_overwrites
+
+
+def test_confirm_overwrites_should_ask_about_newer_target_files_only_once(fs, monkeypatch, capsys):
+
+    # Arrange
+    fs.create_file("/source/namespace/sounds/entity/older.ogg", contents="abc")
+    fs.create_file("/source/namespace/sounds/entity/newer.ogg", contents="abc")
+    fs.create_file("/target/namespace/sounds/entity/older.ogg", contents="abcd")
+    fs.create_file("/target/namespace/sounds/entity/newer.ogg", contents="abcd")
+    os.utime("/target/namespace/sounds/entity/older.ogg", (0, 0))
+    os.utime("/source/namespace/sounds/entity/newer.ogg", (0, 0))
+    prompts: list[str] = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "y")
+
+    # Act
+    confirm_overwrites(
+        [Path("entity/older.ogg"), Path("entity/newer.ogg")],
+        Path("/source/namespace"),
+        Path("/target/namespace"),
+        FileHasher(1),
+        False,
+        False)
+    output = capsys.readouterr().out
+
+    # Assert
+    assert len(prompts) == 2
+    assert output.count(".../entity/newer.ogg") == 1
+    assert output.count(".../entity/older.ogg") == 1
@@ -0,0 +1,313 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from objects.copy_engine import CopyEngine, LinkMode
+from objects.metadata_cache import MetadataCache
+
+
+def test_constructor_should_raise_typeerror_when_workers_not_int():
+
+    with pytest.raises(TypeError):
+        CopyEngine("8")
+
+
+def test_constructor_should_raise_valueerror_when_workers_less_than_one():
+
+    with pytest.raises(ValueError):
+        CopyEngine(0)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copy_files_should_copy_files_and_create_target_folders(fs, workers):
+
+    # Arrange
+    fs.create_file("/source/sounds/entity/villager/ambient/file01.ogg", contents="abc")
+    fs.create_file("/source/sounds/entity/witch/death/file02.ogg", contents="defgh")
+    files = [
+        (Path("/source/sounds/entity/villager/ambient/file01.ogg"),
+         Path("/target/sounds/entity/villager/ambient/file01.ogg")),
+        (Path("/source/sounds/entity/witch/death/file02.ogg"),
+         Path("/target/sounds/entity/witch/death/file02.ogg"))]
+
+    # Act
+    report = CopyEngine(workers).copy_files(files)
+
+    # Assert
+    assert report.errors == []
+    assert report.files_copied == 2
+    assert report.bytes_copied == 8
+    assert Path("/target/sounds/entity/villager/ambient/file01.ogg").read_text() == "abc"
+    assert Path("/target/sounds/entity/witch/death/file02.ogg").read_text() == "defgh"
+
+
+def test_copy_files_should_collect_errors_and_keep_copying(fs):
+
+    # Arrange
+    fs.create_file("/source/sounds/entity/villager/ambient/file02.ogg", contents="abc")
+    files = [
+        (Path("/source/sounds/entity/villager/ambient/file01.ogg"),
+         Path("/target/sounds/entity/villager/ambient/file01.ogg")),
+        (Path("/source/sounds/entity/villager/ambient/file02.ogg"),
+         Path("/target/sounds/entity/villager/ambient/file02.ogg"))]
+
+    # Act
+    report = CopyEngine(2).copy_files(files)
+
+    # Assert
+    assert report.files_copied == 1
+    assert len(report.errors) == 1
+    assert report.errors[0].startswith("/source/sounds/entity/villager/ambient/file01.ogg <- ")
+    assert Path("/target/sounds/entity/villager/ambient/file02.ogg").exists()
+
+
+def test_copy_files_should_skip_unchanged_files_in_incremental_mode(fs):
+
+    # Arrange
+    source = Path("/source/sounds/entity/villager/ambient/file01.ogg")
+    target = Path("/target/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file(source, contents="abc")
+    CopyEngine(1).copy_files([(source, target)])
+
+    # Act
+    report = CopyEngine(1, incremental=True).copy_files([(source, target)])
+
+    # Assert
+    assert report.files_copied == 0
+    assert report.files_skipped == 1
+    assert report.bytes_skipped == 3
+
+
+def test_copy_files_should_copy_files_whose_modification_time_changed(fs):
+
+    # Arrange
+    source = Path("/source/sounds/entity/villager/ambient/file01.ogg")
+    target = Path("/target/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file(source, contents="abc")
+    fs.create_file(target, contents="xyz")
+    os.utime(target, ns=(0, 0))
+
+    # Act
+    report = CopyEngine(1, incremental=True).copy_files([(source, target)])
+
+    # Assert
+    assert report.files_copied == 1
+    assert target.read_text() == "abc"
+
+
+def test_copy_files_should_write_transformed_files_and_skip_them_by_modification_time(fs):
+
+    # Arrange
+    source = Path("/source/sounds/entity/villager/ambient/file01.ogg")
+    target = Path("/target/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file(source, contents="abcdef")
+    engine = CopyEngine(1, incremental=True, transform=lambda name, data: data[:3])
+
+    # Act
+    first = engine.copy_files([(source, target)])
+    second = engine.copy_files([(source, target)])
+
+    # Assert
+    assert first.files_copied == 1
+    assert target.read_text() == "abc"
+    assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+    assert second.files_skipped == 1
+
+
+def test_copy_files_should_transform_targets_an_earlier_run_copied_as_they_were(fs):
+
+    # Arrange
+    source = Path("/source/sounds/entity/villager/ambient/file01.ogg")
+    target = Path("/target/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file(source, contents="abcdef")
+    cache = MetadataCache()
+    CopyEngine(1, cache=cache).copy_files([(source, target)])
+
+    # Act
+    first = CopyEngine(1, incremental=True, transform=lambda name, data: data[:3], cache=cache).copy_files(
+        [(source, target)])
+    second = CopyEngine(1, incremental=True, transform=lambda name, data: data[:3], cache=cache).copy_files(
+        [(source, target)])
+
+    # Assert
+    assert first.files_copied == 1
+    assert target.read_text() == "abc"
+    assert second.files_skipped == 1
+
+
+def test_copy_files_should_not_transform_through_targets_hard_linked_to_their_source(tmp_path):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    target = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    source.parent.mkdir(parents=True)
+    source.write_text("abcdef")
+    CopyEngine(1, link_mode=LinkMode.hardlink).copy_files([(source, target)])
+
+    # Act
+    report = CopyEngine(1, transform=lambda name, data: data[:3]).copy_files([(source, target)])
+
+    # Assert
+    assert report.errors == []
+    assert source.read_text() == "abcdef"
+    assert target.read_text() == "abc"
+
+
+def test_copy_files_should_compare_contents_in_checksum_mode(tmp_path):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    same = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    other_source = tmp_path / "source/sounds/entity/villager/ambient/file02.ogg"
+    different = tmp_path / "target/sounds/entity/villager/ambient/file02.ogg"
+    source.parent.mkdir(parents=True)
+    same.parent.mkdir(parents=True)
+    source.write_text("abc")
+    same.write_text("abc")
+    other_source.write_text("abc")
+    different.write_text("xyz")
+
+    # Act
+    report = CopyEngine(1, checksum=True).copy_files(
+        [(source, same), (other_source, different)])
+
+    # Assert
+    assert report.files_skipped == 1
+    assert report.files_copied == 1
+    assert different.read_text() == "abc"
+
+
+def test_copy_files_should_not_look_for_targets_missing_from_the_listing(fs):
+
+    # Arrange: the target exists, but the listing says otherwise
+    source = Path("/source/sounds/entity/villager/ambient/file01.ogg")
+    target = Path("/target/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file(source, contents="abc")
+    CopyEngine(1).copy_files([(source, target)])
+
+    # Act
+    report = CopyEngine(1, incremental=True).copy_files([(source, target)], set())
+
+    # Assert
+    assert report.files_copied == 1
+    assert report.files_skipped == 0
+
+
+def test_constructor_should_raise_valueerror_when_link_mode_unknown():
+
+    with pytest.raises(ValueError):
+        CopyEngine(1, link_mode="symlink")
+
+
+def test_copy_files_should_hard_link_files_in_hardlink_mode(tmp_path):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    target = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    source.parent.mkdir(parents=True)
+    source.write_text("abc")
+
+    # Act
+    report = CopyEngine(1, link_mode=LinkMode.hardlink).copy_files([(source, target)])
+
+    # Assert
+    assert report.files_linked == 1
+    assert target.samefile(source)
+    assert list(target.parent.iterdir()) == [target]
+
+
+def test_copy_files_should_leave_hard_linked_targets_alone_in_copy_mode(tmp_path):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    target = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    source.parent.mkdir(parents=True)
+    source.write_text("abc")
+    CopyEngine(1, link_mode=LinkMode.hardlink).copy_files([(source, target)])
+
+    # Act
+    report = CopyEngine(1).copy_files([(source, target)])
+
+    # Assert
+    assert report.errors == []
+    assert report.files_skipped == 1
+
+
+@pytest.mark.parametrize("link_mode", [LinkMode.reflink, LinkMode.copy_file_range])
+def test_copy_files_should_place_or_fall_back_to_copying(tmp_path, link_mode):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    target = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    source.parent.mkdir(parents=True)
+    source.write_bytes(b"OggS" * 1000)
+
+    # Act
+    report = CopyEngine(1, link_mode=link_mode).copy_files([(source, target)])
+
+    # Assert
+    assert report.errors == []
+    assert report.files_linked + report.files_fallen_back == 1
+    assert target.read_bytes() == source.read_bytes()
+    assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+
+@pytest.mark.parametrize("link_mode", [LinkMode.reflink, LinkMode.copy_file_range])
+def test_copy_files_should_not_write_through_targets_hard_linked_to_their_source(tmp_path, link_mode):
+
+    # Arrange
+    source = tmp_path / "source/sounds/entity/villager/ambient/file01.ogg"
+    target = tmp_path / "target/sounds/entity/villager/ambient/file01.ogg"
+    source.parent.mkdir(parents=True)
+    source.write_bytes(b"OggS" * 1250)
+    CopyEngine(1, link_mode=LinkMode.hardlink).copy_files([(source, target)])
+
+    # Act
+    report = CopyEngine(1, link_mode=link_mode).copy_files([(source, target)])
+
+    # Assert
+    assert report.errors == []
+    assert source.read_bytes() == b"OggS" * 1250
+    assert target.read_bytes() == b"OggS" * 1250
+    assert list(target.parent.iterdir()) == [target]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copy_files_should_spend_tokens_for_every_file_and_byte(fs, monkeypatch, workers):
+
+    # Arrange
+    taken: list[tuple[float, float]] = []
+    monkeypatch.setattr(
+        "objects.copy_engine.TokenBucket.take",
+        lambda bucket, amount=1: taken.append((bucket.rate, amount)))
+    files = []
+    for i in range(3):
+        fs.create_file(f"/source/sounds/file0{i}.ogg", contents="abcd")
+        files.append((Path(f"/source/sounds/file0{i}.ogg"), Path(f"/target/sounds/file0{i}.ogg")))
+
+    # Act
+    report = CopyEngine(workers, bytes_per_second=1000, files_per_second=5).copy_files(files)
+
+    # Assert
+    assert report.files_copied == 3
+    assert sorted(taken) == [(5, 1)] * 3 + [(1000, 4)] * 3
+
+
+def test_copy_files_should_report_progress_while_copying(fs, monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(CopyEngine, "PROGRESS_INTERVAL", 0.0)
+    progress: list[int] = []
+    fs.create_file("/source/sounds/file01.ogg", contents="abc")
+    fs.create_file("/source/sounds/file02.ogg", contents="abc")
+    files = [
+        (Path("/source/sounds/file01.ogg"), Path("/target/sounds/file01.ogg")),
+        (Path("/source/sounds/file02.ogg"), Path("/target/sounds/file02.ogg"))]
+    engine = CopyEngine(1, on_progress=lambda report: progress.append(report.files_copied))
+
+    # Act
+    engine.copy_files(files)
+
+    # Assert
+    assert progress == [1, 2]
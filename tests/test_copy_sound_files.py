@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from objects.copy_engine import CopyEngine
+from spindex import copy_sound_files
+
+
+def test_copy_sound_files_should_copy_between_sounds_folders(fs):
+
+    # Arrange
+    fs.create_file("/source/namespace/sounds/entity/villager/ambient/file01.ogg", contents="abc")
+    sound_files: list[Path] = [Path("entity/villager/ambient/file01.ogg")]
+
+    # Act
+    report = copy_sound_files(
+        sound_files, Path("/source/namespace"), Path("/target/namespace"), CopyEngine(2))
+
+    # Assert
+    assert report.files_copied == 1
+    assert Path("/target/namespace/sounds/entity/villager/ambient/file01.ogg").read_text() == "abc"
+
+
+def test_copy_sound_files_should_reuse_the_target_listing_in_incremental_mode(fs):
+
+    # Arrange
+    fs.create_file("/source/namespace/sounds/entity/villager/ambient/file01.ogg", contents="abc")
+    sound_files: list[Path] = [Path("entity/villager/ambient/file01.ogg")]
+    source = Path("/source/namespace")
+    target = Path("/target/namespace")
+    copy_sound_files(sound_files, source, target, CopyEngine(1))
+
+    # Act
+    report = copy_sound_files(
+        sound_files, source, target, CopyEngine(1, incremental=True), sound_files)
+
+    # Assert
+    assert report.files_copied == 0
+    assert report.files_skipped == 1
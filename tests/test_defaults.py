@@ -245,6 +245,22 @@ def test_get_sound_should_not_include_volume_when_no_default_specified():
 # ------------------------------------------------------------------------
 
 
+def test_get_sound_should_use_sound_override_volume_instead_of_event_volume():
+
+    event_defaults = SoundEventDefaults(volume=0.1)
+    defaults = Defaults(
+        {"test.event": event_defaults},
+        sound_overrides={"test_sound_name": SoundEventDefaults(volume=0.5)})
+
+    result = defaults.get_sound("test.event", "test_sound_name")
+    assert result["volume"] == 0.5
+
+
+def test_constructor_should_raise_valueerror_when_sound_override_volume_greater_than_one():
+
+    with pytest.raises(ValueError):
+        Defaults({}, sound_overrides={"test_sound_name": SoundEventDefaults(volume=1.1)})
+
 def test_get_sound_should_use_event_weight():
 
     event_defaults = SoundEventDefaults(weight=8)
@@ -362,6 +378,27 @@ def test_get_sound_should_not_include_stream_when_no_default_specified():
     result = defaults.get_sound("test.event", "test_sound_name")
     assert "stream" not in result
 
+
+def test_get_sound_should_use_sound_value_when_no_stream_default_exists():
+
+    defaults = Defaults(
+        {"all": SoundEventDefaults()},
+        {"test_sound_name": SoundEventDefaults(stream=True)})
+
+    result = defaults.get_sound("test.event", "test_sound_name")
+    assert result["stream"] is True
+
+
+def test_get_sound_should_use_event_stream_instead_of_sound_value():
+
+    event_defaults = SoundEventDefaults(stream=False)
+    defaults = Defaults(
+        {"test.event": event_defaults},
+        {"test_sound_name": SoundEventDefaults(stream=True)})
+
+    result = defaults.get_sound("test.event", "test_sound_name")
+    assert result["stream"] is False
+
 # ------------------------------------------------------------------------
 
 
@@ -0,0 +1,172 @@
+from pathlib import Path
+
+import pytest
+
+from objects.deployment import Deployment, DeploymentError
+
+
+@pytest.fixture
+def pack(tmp_path):
+
+    sound_path = tmp_path / "namespace" / "sounds"
+    json_path = tmp_path / "minecraft" / "sounds.json"
+
+    (sound_path / "folder").mkdir(parents=True)
+    (sound_path / "folder" / "old.ogg").write_bytes(b"original")
+    json_path.parent.mkdir()
+    json_path.write_text("{}")
+
+    return sound_path, json_path
+
+
+def stage(deployment: Deployment, files: dict[str, bytes]) -> list[Path]:
+
+    deployment.begin()
+
+    for name, data in files.items():
+        staged = deployment.staged_sound_path / name
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        staged.write_bytes(data)
+
+    return [Path(name) for name in files]
+
+
+def test_deployment_commit_should_move_staged_files_into_the_target(pack):
+
+    # Arrange
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    files = stage(deployment, {
+        "folder/old.ogg": b"replacement", "other/new.ogg": b"new"})
+
+    # Act
+    deployment.commit(files, b'{"event": {}}')
+
+    # Assert
+    assert (sound_path / "folder" / "old.ogg").read_bytes() == b"replacement"
+    assert (sound_path / "other" / "new.ogg").read_bytes() == b"new"
+    assert json_path.read_text() == '{"event": {}}'
+    assert not deployment.staging_path.exists()
+    assert not deployment.staged_json_path.exists()
+
+
+def test_deployment_commit_should_replace_sounds_json_when_every_file_is_new(pack):
+
+    # Arrange
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    files = stage(deployment, {"other/new.ogg": b"new"})
+
+    # Act
+    deployment.commit(files, b'{"event": {}}')
+
+    # Assert
+    assert (sound_path / "other" / "new.ogg").read_bytes() == b"new"
+    assert json_path.read_text() == '{"event": {}}'
+    assert not deployment.staging_path.exists()
+    assert not deployment.staged_json_path.exists()
+
+
+def test_deployment_commit_should_leave_sounds_json_alone_without_json_data(pack):
+
+    # Arrange
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    files = stage(deployment, {"other/new.ogg": b"new"})
+
+    # Act
+    deployment.commit(files, None)
+
+    # Assert
+    assert json_path.read_text() == "{}"
+
+
+def test_deployment_commit_should_fail_when_nothing_was_staged(pack):
+
+    # Arrange
+    deployment = Deployment(*pack)
+    deployment.begin()
+
+    # Act / Assert
+    with pytest.raises(DeploymentError):
+        deployment.commit()
+
+
+def test_deployment_should_resume_an_interrupted_commit(pack):
+
+    # Arrange: the first file was swapped in before the interruption
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    stage(deployment, {
+        "folder/old.ogg": b"replacement", "other/new.ogg": b"new"})
+    deployment.staged_json_path.write_text('{"event": {}}')
+    with open(deployment.journal_path, "a") as fp:
+        fp.write('{"state": "committing", "json": true, '
+                 '"files": ["folder/old.ogg", "other/new.ogg"]}\n')
+
+    backup = deployment.backup_path / "sounds" / "folder" / "old.ogg"
+    backup.parent.mkdir(parents=True)
+    (sound_path / "folder" / "old.ogg").rename(backup)
+    (deployment.staged_sound_path / "folder" / "old.ogg").rename(
+        sound_path / "folder" / "old.ogg")
+
+    # Act
+    resumed = Deployment(sound_path, json_path)
+    interrupted = resumed.is_interrupted() and resumed.is_committing()
+    resumed.commit()
+
+    # Assert
+    assert interrupted
+    assert (sound_path / "folder" / "old.ogg").read_bytes() == b"replacement"
+    assert (sound_path / "other" / "new.ogg").read_bytes() == b"new"
+    assert json_path.read_text() == '{"event": {}}'
+    assert not resumed.is_interrupted()
+
+
+def test_deployment_rollback_should_restore_the_target_after_a_commit_started(pack):
+
+    # Arrange: everything was swapped in, but the staging folder remains
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    stage(deployment, {
+        "folder/old.ogg": b"replacement", "other/new.ogg": b"new"})
+    deployment.staged_json_path.write_text('{"event": {}}')
+    with open(deployment.journal_path, "a") as fp:
+        fp.write('{"state": "committing", "json": true, '
+                 '"files": ["folder/old.ogg", "other/new.ogg"]}\n')
+
+    backup = deployment.backup_path / "sounds" / "folder" / "old.ogg"
+    backup.parent.mkdir(parents=True)
+    (sound_path / "folder" / "old.ogg").rename(backup)
+    (deployment.staged_sound_path / "folder" / "old.ogg").rename(
+        sound_path / "folder" / "old.ogg")
+    (sound_path / "other").mkdir()
+    (deployment.staged_sound_path / "other" / "new.ogg").rename(
+        sound_path / "other" / "new.ogg")
+    deployment.backup_json_path.write_text("{}")
+    deployment.staged_json_path.rename(json_path)
+
+    # Act
+    Deployment(sound_path, json_path).rollback()
+
+    # Assert
+    assert (sound_path / "folder" / "old.ogg").read_bytes() == b"original"
+    assert not (sound_path / "other" / "new.ogg").exists()
+    assert json_path.read_text() == "{}"
+    assert not deployment.staging_path.exists()
+
+
+def test_deployment_rollback_should_not_touch_the_target_while_staging(pack):
+
+    # Arrange
+    sound_path, json_path = pack
+    deployment = Deployment(sound_path, json_path)
+    stage(deployment, {"folder/old.ogg": b"replacement"})
+
+    # Act
+    deployment.rollback()
+
+    # Assert
+    assert (sound_path / "folder" / "old.ogg").read_bytes() == b"original"
+    assert json_path.read_text() == "{}"
+    assert not deployment.staging_path.exists()
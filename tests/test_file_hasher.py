@@ -0,0 +1,80 @@
+import hashlib
+
+import pytest
+
+from objects.file_hasher import FileHasher
+from objects.metadata_cache import MetadataCache
+
+
+def test_constructor_should_raise_valueerror_when_workers_less_than_one():
+
+    with pytest.raises(ValueError):
+        FileHasher(0)
+
+
+def test_constructor_should_raise_valueerror_when_algorithm_unknown():
+
+    with pytest.raises(ValueError):
+        FileHasher(1, "not-a-hash")
+
+
+def test_hash_file_should_match_hashlib_across_chunks(tmp_path, monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(FileHasher, "CHUNK_SIZE", 7)
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(bytes(range(256)) * 3)
+
+    # Act
+    result = FileHasher(1).hash_file(path)
+
+    # Assert
+    assert result == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_hash_file_should_use_the_cache_for_unchanged_files(tmp_path):
+
+    # Arrange: a cached digest that can only have come from the cache
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(b"abc")
+    cache = MetadataCache()
+    cache.put(path.stat(), "sha256", {"digest": "cached"})
+
+    # Act
+    cached = FileHasher(1, cache=cache).hash_file(path)
+    path.write_bytes(b"abcd")
+    changed = FileHasher(1, cache=cache).hash_file(path)
+
+    # Assert
+    assert cached == "cached"
+    assert changed == hashlib.sha256(b"abcd").hexdigest()
+    assert cache.get(path.stat(), "sha256") == {"digest": changed}
+
+
+def test_hash_file_should_hash_empty_files(tmp_path):
+
+    # Arrange
+    path = tmp_path / "empty.ogg"
+    path.touch()
+
+    # Act
+    result = FileHasher(1).hash_file(path)
+
+    # Assert
+    assert result == hashlib.sha256(b"").hexdigest()
+
+
+def test_hash_files_should_collect_warnings_for_unreadable_files(tmp_path):
+
+    # Arrange
+    good = tmp_path / "file01.ogg"
+    good.write_bytes(b"OggS")
+    missing = tmp_path / "file02.ogg"
+
+    # Act
+    digests, warnings = FileHasher(2).hash_files([good, missing])
+
+    # Assert
+    assert digests == {good: hashlib.sha256(b"OggS").hexdigest()}
+    assert len(warnings) == 1
+    assert warnings[0].startswith(f"{missing} <- ")
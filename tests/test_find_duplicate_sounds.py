@@ -0,0 +1,57 @@
+import zipfile
+from pathlib import Path
+
+from objects.file_hasher import FileHasher
+from objects.ogg_inspector import OggInfo
+from objects.pack_archive import PackArchive
+from spindex import find_duplicate_sounds
+
+FILES = {
+    "team/derek/entity/villager/ambient/file01.ogg": b"abc",
+    "team/jill/entity/villager/ambient/file01.ogg": b"abc",
+    "team/jill/entity/witch/ambient/file01.ogg": b"abc",
+    "team/jill/entity/witch/ambient/file02.ogg": b"xyz",
+    "team/jill/entity/witch/ambient/file03.ogg": b"abcd"}
+
+
+def get_sound_info() -> dict[Path, OggInfo]:
+    return {Path(name): OggInfo(1, 44100, 1.0, len(data)) for name, data in FILES.items()}
+
+
+def test_find_duplicate_sounds_should_keep_the_first_of_each_identical_group(tmp_path):
+
+    # Arrange
+    for name, data in FILES.items():
+        path = tmp_path / "sounds" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    # Act
+    duplicates, warnings = find_duplicate_sounds(
+        [Path(name) for name in FILES], tmp_path, get_sound_info(), FileHasher(2))
+
+    # Assert
+    assert duplicates == {
+        Path("team/jill/entity/villager/ambient/file01.ogg"): Path("team/derek/entity/villager/ambient/file01.ogg"),
+        Path("team/jill/entity/witch/ambient/file01.ogg"): Path("team/derek/entity/villager/ambient/file01.ogg")}
+    assert warnings == []
+
+
+def test_find_duplicate_sounds_should_hash_files_in_a_zip(tmp_path):
+
+    # Arrange
+    path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in FILES.items():
+            archive.writestr(f"sounds/{name}", data)
+    source = PackArchive(path)
+
+    # Act
+    duplicates, warnings = find_duplicate_sounds(
+        [Path(name) for name in FILES], source, get_sound_info(), FileHasher(2))
+
+    # Assert
+    assert set(duplicates) == {
+        Path("team/jill/entity/villager/ambient/file01.ogg"),
+        Path("team/jill/entity/witch/ambient/file01.ogg")}
+    assert warnings == []
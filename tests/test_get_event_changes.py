@@ -0,0 +1,64 @@
+from objects.typed_dictionaries import SoundEvent, Sound
+from spindex import get_event_changes
+
+
+def test_get_event_changes_should_find_nothing_when_events_are_identical():
+
+    # Arrange
+    previous = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+    current = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+
+    # Act
+    added, changed, removed = get_event_changes(previous, current)
+
+    # Assert
+    assert added == []
+    assert changed == []
+    assert removed == []
+
+
+def test_get_event_changes_should_separate_added_changed_and_removed_events():
+
+    # Arrange
+    previous = {
+        "entity.villager.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/ambient/file01")]),
+        "entity.villager.death": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/death/file01")]),
+        "entity.witch.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/witch/ambient/file01")])}
+
+    current = {
+        "entity.villager.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/ambient/file01")]),
+        "entity.villager.death": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/death/file01", volume=0.5)]),
+        "entity.villager.hurt": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/hurt/file01")])}
+
+    # Act
+    added, changed, removed = get_event_changes(previous, current)
+
+    # Assert
+    assert added == ["entity.villager.hurt"]
+    assert changed == ["entity.villager.death"]
+    assert removed == ["entity.witch.ambient"]
+
+
+def test_get_event_changes_should_ignore_key_order_within_events():
+
+    # Arrange
+    previous = {"entity.villager.ambient": {
+        "subtitle": "subtitles.entity.villager.ambient",
+        "sounds": [{"name": "namespace:entity/villager/ambient/file01"}]}}
+    current = {"entity.villager.ambient": {
+        "sounds": [{"name": "namespace:entity/villager/ambient/file01"}],
+        "subtitle": "subtitles.entity.villager.ambient"}}
+
+    # Act
+    added, changed, removed = get_event_changes(previous, current)
+
+    # Assert
+    assert changed == []
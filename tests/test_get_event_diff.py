@@ -0,0 +1,42 @@
+from objects.typed_dictionaries import SoundEvent, Sound
+from spindex import get_event_diff
+
+
+def test_get_event_diff_should_only_include_named_events():
+
+    # Arrange
+    previous = {
+        "entity.villager.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/ambient/file01")]),
+        "entity.villager.death": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/death/file01")])}
+
+    current = {
+        "entity.villager.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/ambient/file02")]),
+        "entity.villager.death": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/death/file02")])}
+
+    # Act
+    lines = get_event_diff(previous, current, ["entity.villager.death"])
+
+    # Assert
+    assert lines[0] == "--- a/entity.villager.death"
+    assert lines[1] == "+++ b/entity.villager.death"
+    assert '-            {"name": "namespace:entity/villager/death/file01"}' in lines
+    assert '+            {"name": "namespace:entity/villager/death/file02"}' in lines
+    assert not any("ambient" in line for line in lines)
+
+
+def test_get_event_diff_should_show_added_events_as_new_lines():
+
+    # Arrange
+    current = {"entity.villager.hurt": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/hurt/file01")])}
+
+    # Act
+    lines = get_event_diff({}, current, ["entity.villager.hurt"])
+
+    # Assert
+    assert lines[2] == "@@ -0,0 +1,7 @@"
+    assert all(line.startswith("+") for line in lines[3:])
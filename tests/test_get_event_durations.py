@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from objects.ogg_inspector import OggInfo
+from spindex import get_event_durations
+
+
+def test_get_event_durations_should_add_up_each_events_sound_files():
+
+    # Arrange
+    events = {
+        "entity.villager.ambient": {"sounds": [
+            {"name": "namespace:entity/villager/ambient/file01"},
+            {"name": "namespace:entity/villager/ambient/file02"}]},
+        "entity.villager.death": {"sounds": [
+            {"name": "minecraft:entity/villager/death1"}]}}
+    sound_info = {
+        Path("entity/villager/ambient/file01.ogg"): OggInfo(1, 44100, 1.5, 1000),
+        Path("entity/villager/ambient/file02.ogg"): OggInfo(1, 44100, 2.0, 1000)}
+
+    # Act
+    durations = get_event_durations(events, "namespace", sound_info)
+
+    # Assert
+    assert durations == {"entity.villager.ambient": 3.5, "entity.villager.death": 0.0}
@@ -159,3 +159,36 @@ def test_get_generated_events_should_return_partial_results_when_mixed_warnings_
     assert warnings[1] == f"Could not build a sound event from this path: {file3}"
 
 
+
+
+def test_get_generated_events_should_name_the_kept_copy_of_a_duplicate():
+
+    namespace = "test-namespace"
+
+    kept = Path("derek/entity/villager/ambient/test-ogg-file")
+    duplicate = Path("jill/entity/witch/celebrate/test-ogg-file")
+    defaults = Defaults({"entity.witch.celebrate": SoundEventDefaults(volume=0.5)})
+
+    result, warnings = get_generated_events(
+        namespace, [kept, duplicate], defaults, SoundEventCatalog(), {duplicate: kept})
+
+    assert result["entity.villager.ambient"]["sounds"] == [Sound(name=f"{namespace}:derek/entity/villager/ambient/test-ogg-file")]
+    assert result["entity.witch.celebrate"]["sounds"] == [
+        Sound(name=f"{namespace}:derek/entity/villager/ambient/test-ogg-file", volume=0.5)]
+
+
+def test_get_generated_events_should_name_duplicates_in_the_same_event_once():
+
+    namespace = "test-namespace"
+
+    kept = Path("derek/entity/villager/ambient/test-ogg-file")
+    duplicate = Path("jill/entity/villager/ambient/test-ogg-file")
+    other = Path("jill/entity/villager/ambient/other-ogg-file")
+    defaults = Defaults({})
+
+    result, warnings = get_generated_events(
+        namespace, [duplicate, kept, other], defaults, SoundEventCatalog(), {duplicate: kept})
+
+    assert result["entity.villager.ambient"]["sounds"] == [
+        Sound(name=f"{namespace}:derek/entity/villager/ambient/test-ogg-file", weight=2),
+        Sound(name=f"{namespace}:jill/entity/villager/ambient/other-ogg-file")]
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from objects.loading_advisor import LoadingAdvisor, LoadingMode
+from objects.ogg_inspector import OggInfo
+from objects.sound_event_catalog import SoundEventCatalog
+from spindex import get_loading_recommendations
+
+
+def test_get_loading_recommendations_should_key_recommendations_by_sound_name():
+
+    # Arrange
+    sound_files = [
+        Path("entity/villager/ambient/long.ogg"),
+        Path("entity/villager/ambient/short.ogg"),
+        Path("entity/villager/celebrate/short.ogg"),
+        Path("not/an/event/file.ogg")]
+    sound_info = {
+        sound_files[0]: OggInfo(2, 44100, 30.0, 500_000),
+        sound_files[1]: OggInfo(1, 44100, 0.5, 9_000),
+        sound_files[2]: OggInfo(1, 44100, 0.5, 9_000),
+        sound_files[3]: OggInfo(1, 44100, 30.0, 500_000)}
+
+    # Act
+    result = get_loading_recommendations(
+        sound_files, sound_info, "namespace",
+        SoundEventCatalog(), LoadingAdvisor())
+
+    # Assert
+    assert result == {
+        "namespace:entity/villager/ambient/long": LoadingMode.stream,
+        "namespace:entity/villager/ambient/short": LoadingMode.preload}
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from objects.ogg_inspector import OggInfo
+from objects.sound_event_catalog import SoundEventCatalog
+from spindex import get_stereo_warnings, print_stereo_warnings
+
+
+def test_get_stereo_warnings_should_only_flag_stereo_files_in_positional_events():
+
+    # Arrange
+    sound_info = {
+        Path("entity/villager/ambient/stereo.ogg"): OggInfo(2, 44100, 1.0, 1000),
+        Path("entity/villager/ambient/mono.ogg"): OggInfo(1, 44100, 1.0, 1000),
+        Path("music/game/stereo.ogg"): OggInfo(2, 44100, 1.0, 1000),
+        Path("not/an/event/stereo.ogg"): OggInfo(2, 44100, 1.0, 1000)}
+
+    # Act
+    warnings = get_stereo_warnings(sound_info, SoundEventCatalog())
+
+    # Assert
+    assert warnings == [
+        f"{Path('entity/villager/ambient/stereo.ogg')} <- Has 2 channels, "
+        f"so entity.villager.ambient won't fade with distance, "
+        f"and the file is larger than it needs to be"]
+
+
+def test_print_stereo_warnings_should_list_the_files_without_asking_anything(capsys):
+
+    # Arrange
+    warnings = ["entity/villager/ambient/stereo.ogg <- Has 2 channels"]
+
+    # Act
+    print_stereo_warnings(warnings)
+    output = capsys.readouterr().out
+
+    # Assert
+    assert "1 stereo file(s) in entity and block events will be kept" in output
+    assert "entity/villager/ambient/stereo.ogg <- Has 2 channels" in output
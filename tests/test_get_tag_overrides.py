@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from objects.ogg_inspector import OggInfo
+from spindex import get_tag_overrides, get_tag_warnings
+
+
+def test_get_tag_overrides_should_convert_tags_to_sound_values():
+
+    # Arrange
+    sound_info = {
+        Path("entity/villager/ambient/file01.ogg"): OggInfo(
+            1, 44100, 1.0, 1000, 0, {"volume": "0.5", "weight": "3"}),
+        Path("entity/villager/ambient/file02.ogg"): OggInfo(1, 44100, 1.0, 1000)}
+
+    # Act
+    overrides, warnings = get_tag_overrides(sound_info, "namespace")
+
+    # Assert
+    assert overrides == {
+        "namespace:entity/villager/ambient/file01": {"volume": 0.5, "weight": 3}}
+    assert warnings == []
+
+
+def test_get_tag_overrides_should_warn_about_tags_it_cannot_use():
+
+    # Arrange
+    file = Path("entity/villager/ambient/file01.ogg")
+    sound_info = {file: OggInfo(
+        1, 44100, 1.0, 1000, 0, {"volume": "2", "weight": "heavy", "pitch": "1.2"})}
+
+    # Act
+    overrides, warnings = get_tag_overrides(sound_info, "namespace")
+
+    # Assert
+    assert overrides == {}
+    assert warnings == [
+        f"{file} <- SPINDEX_VOLUME=2 will be ignored: volume must be between 0.0 and 1.0",
+        f"{file} <- SPINDEX_WEIGHT=heavy will be ignored: invalid literal for int() with base 10: 'heavy'",
+        f"{file} <- SPINDEX_PITCH=1.2 will be ignored: only volume and weight can be set"]
+
+
+def test_get_tag_warnings_should_list_files_that_carry_tags():
+
+    # Arrange
+    file = Path("entity/villager/ambient/file01.ogg")
+    sound_info = {
+        file: OggInfo(1, 44100, 1.0, 1000, 5),
+        Path("entity/villager/ambient/file02.ogg"): OggInfo(1, 44100, 1.0, 1000)}
+
+    # Act
+    warnings = get_tag_warnings(sound_info)
+
+    # Assert
+    assert warnings == [f"{file} <- Carries 5 metadata tag(s), which ship to every player"]
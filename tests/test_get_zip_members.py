@@ -0,0 +1,66 @@
+import zipfile
+from pathlib import Path
+
+from objects.pack_archive import PackArchive
+from spindex import get_zip_members
+
+
+def test_get_zip_members_should_lay_out_the_source_namespace(fs):
+
+    # Arrange
+    fs.create_file("/source/namespace/sounds/entity/file01.ogg")
+    sound_files = [Path("entity/file01.ogg")]
+
+    # Act
+    members = get_zip_members(sound_files, Path("/source/namespace"), b"{}")
+
+    # Assert
+    assert members == [
+        ("assets/namespace/sounds/entity/file01.ogg",
+         Path("/source/namespace/sounds/entity/file01.ogg")),
+        ("assets/minecraft/sounds.json", b"{}")]
+
+
+def test_get_zip_members_should_let_source_files_replace_target_files(fs):
+
+    # Arrange
+    fs.create_file("/source/namespace/sounds/entity/file01.ogg")
+    fs.create_file("/pack/pack.mcmeta")
+    fs.create_file("/pack/assets/namespace/sounds/entity/file01.ogg")
+    fs.create_file("/pack/assets/namespace/sounds/entity/file02.ogg")
+    sound_files = [Path("entity/file01.ogg")]
+
+    # Act
+    members = get_zip_members(
+        sound_files, Path("/source/namespace"), b"{}", Path("/pack/assets/namespace"))
+
+    # Assert
+    assert members == [
+        ("pack.mcmeta", Path("/pack/pack.mcmeta")),
+        ("assets/namespace/sounds/entity/file02.ogg",
+         Path("/pack/assets/namespace/sounds/entity/file02.ogg")),
+        ("assets/namespace/sounds/entity/file01.ogg",
+         Path("/source/namespace/sounds/entity/file01.ogg")),
+        ("assets/minecraft/sounds.json", b"{}")]
+
+
+def test_get_zip_members_should_keep_everything_else_in_a_zipped_target(tmp_path):
+
+    # Arrange
+    source = tmp_path / "namespace"
+    (source / "sounds").mkdir(parents=True)
+    (source / "sounds" / "file01.ogg").write_bytes(b"new")
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("pack.mcmeta", "{}")
+        archive.writestr("assets/namespace/sounds/file01.ogg", b"old")
+        archive.writestr("assets/minecraft/sounds.json", "{}")
+    target = PackArchive(path, "assets/namespace/")
+
+    # Act
+    members = get_zip_members([Path("file01.ogg")], source, b"{}", target)
+
+    # Assert
+    assert [name for name, _ in members] == [
+        "pack.mcmeta", "assets/namespace/sounds/file01.ogg", "assets/minecraft/sounds.json"]
+    assert members[1][1] == source / "sounds" / "file01.ogg"
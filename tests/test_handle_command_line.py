@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from spindex import handle_command_line
+from spindex import handle_command_line, OutputFormat, PreviewMode
 
 
 def test_handle_command_line_should_parse_correct_arguments_correctly():
@@ -14,6 +14,8 @@ def test_handle_command_line_should_parse_correct_arguments_correctly():
         "-i",
         "-q",
         "-a",
+        "-j",
+        "4",
         "-s",
         "/path/to/source/files/",
         "-t",
@@ -26,6 +28,7 @@ def test_handle_command_line_should_parse_correct_arguments_correctly():
         assert args.index_only is True
         assert args.quiet is True
         assert args.abort_warnings is True
+        assert args.jobs == 4
         assert args.source == Path("/path/to/source/files/")
         assert args.target == Path("/path/to/target")
 
@@ -37,6 +40,8 @@ def test_handle_command_line_should_parse_long_arguments_correctly():
         "--index-only",
         "--quiet",
         "--abort-warnings",
+        "--jobs",
+        "4",
         "--source",
         "/path/to/source/files/",
         "--target",
@@ -49,6 +54,7 @@ def test_handle_command_line_should_parse_long_arguments_correctly():
         assert args.index_only is True
         assert args.quiet is True
         assert args.abort_warnings is True
+        assert args.jobs == 4
         assert args.source == Path("/path/to/source/files/")
         assert args.target == Path("/path/to/target")
 
@@ -66,7 +72,101 @@ def test_handle_command_line_should_report_unknown_switches(capsys):
 
         captured = capsys.readouterr()
         assert captured.err == (
-            "usage: Sound Pack Indexer [-h] [-v] [-i] [-q] [-a] [-s SOURCE] [-t TARGET]\n"
+            "usage: Sound Pack Indexer [-h] [-v] [-i] [-q] [-p MODE] [-a]\n"
+            "                          [--loading-advice MODE] [--tags MODE] [--dedup]\n"
+            "                          [--durations] [-j JOBS] [--incremental] [--checksum]\n"
+            "                          [--link-mode MODE] [--limit-rate RATE]\n"
+            "                          [--limit-files RATE] [--transactional]\n"
+            "                          [--strip-metadata] [--verify REPORT] [--lint]\n"
+            "                          [-s SOURCE] [-t TARGET] [--generated-format FORMAT]\n"
+            "                          [--target-format FORMAT] [--zip ZIP]\n"
+            "                          [--delta MANIFEST]\n"
             "Sound Pack Indexer: error: unrecognized arguments: -y\n"
         )
 
+
+def test_handle_command_line_should_default_output_formats_to_compact():
+
+    test_arguments = ["sound_pack_indexer"]
+
+    with patch.object(sys, 'argv', test_arguments):
+        args = handle_command_line()
+
+        assert args.generated_format == OutputFormat.compact
+        assert args.target_format == OutputFormat.compact
+
+
+def test_handle_command_line_should_parse_output_formats_separately():
+
+    test_arguments = [
+        "sound_pack_indexer",
+        "--generated-format",
+        "compact",
+        "--target-format",
+        "minified"
+    ]
+
+    with patch.object(sys, 'argv', test_arguments):
+        args = handle_command_line()
+
+        assert args.generated_format == OutputFormat.compact
+        assert args.target_format == OutputFormat.minified
+
+
+def test_handle_command_line_should_default_preview_to_summary():
+
+    test_arguments = ["sound_pack_indexer"]
+
+    with patch.object(sys, 'argv', test_arguments):
+        args = handle_command_line()
+
+        assert args.preview == PreviewMode.summary
+
+
+def test_handle_command_line_should_parse_preview_mode():
+
+    test_arguments = ["sound_pack_indexer", "-p", "diff"]
+
+    with patch.object(sys, 'argv', test_arguments):
+        args = handle_command_line()
+
+        assert args.preview == PreviewMode.diff
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_handle_command_line_should_reject_fewer_than_one_job(capsys, jobs):
+
+    test_arguments = ["sound_pack_indexer", "-j", jobs]
+
+    with patch.object(sys, 'argv', test_arguments):
+
+        with pytest.raises(SystemExit) as excinfo:
+            handle_command_line()
+
+        assert excinfo.value.code == 2
+        assert capsys.readouterr().err.endswith(
+            "error: -j/--jobs cannot be less than 1\n")
+
+
+@pytest.mark.parametrize("rate", ["0", "-2", "nan", "fast"])
+def test_handle_command_line_should_reject_a_file_rate_that_is_not_positive(capsys, rate):
+
+    test_arguments = ["sound_pack_indexer", "--limit-files", rate]
+
+    with patch.object(sys, 'argv', test_arguments):
+
+        with pytest.raises(SystemExit) as excinfo:
+            handle_command_line()
+
+        assert excinfo.value.code == 2
+        assert f"'{rate}' is not a rate, such as 5 or 0.5" in capsys.readouterr().err
+
+
+def test_handle_command_line_should_parse_a_file_rate():
+
+    test_arguments = ["sound_pack_indexer", "--limit-files", "2.5"]
+
+    with patch.object(sys, 'argv', test_arguments):
+        args = handle_command_line()
+
+        assert args.limit_files == 2.5
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from objects.ogg_inspector import OggInfo, OggInspector
+from spindex import inspect_sound_files
+from tests.ogg_files import make_vorbis_file
+
+
+def test_inspect_sound_files_should_leave_out_files_that_are_not_vorbis(tmp_path):
+
+    # Arrange
+    sounds = tmp_path / "namespace" / "sounds" / "entity"
+    sounds.mkdir(parents=True)
+    (sounds / "file01.ogg").write_bytes(make_vorbis_file(channels=2))
+    (sounds / "file02.ogg").write_bytes(b"ID3 renamed mp3")
+    sound_files = [Path("entity/file01.ogg"), Path("entity/file02.ogg")]
+
+    # Act
+    passed, info, warnings = inspect_sound_files(
+        sound_files, tmp_path / "namespace", OggInspector(2))
+
+    # Assert
+    assert passed == [Path("entity/file01.ogg")]
+    assert info == {Path("entity/file01.ogg"): OggInfo(2, 44100, 1.0, len(make_vorbis_file()))}
+    assert warnings == ["entity/file02.ogg <- Not an Ogg file, and will be ignored"]
@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+
+from objects.sound_event_catalog import SoundEventCatalog
+from spindex import lint_pack, print_lint_results, Color
+
+
+def make_pack(assets_path: Path, events: dict, files: list[str]) -> Path:
+
+    target_path = assets_path / "namespace"
+    for file in files:
+        path = target_path / "sounds" / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"OggS")
+
+    (target_path / "sounds").mkdir(parents=True, exist_ok=True)
+    (assets_path / "minecraft").mkdir()
+    (assets_path / "minecraft" / "sounds.json").write_text(json.dumps(events))
+
+    return target_path
+
+
+def test_lint_pack_should_find_nothing_in_a_clean_pack(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.ambient": {"sounds": [
+            {"name": "namespace:entity/villager/ambient/a"},
+            "namespace:entity/villager/ambient/b"]}},
+        ["entity/villager/ambient/a.ogg", "entity/villager/ambient/b.ogg"])
+
+    # Act
+    result = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert result == ([], [], [])
+
+
+def test_lint_pack_should_find_dangling_sounds_and_orphaned_files(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.ambient": {"sounds": [
+            {"name": "namespace:entity/villager/ambient/a"},
+            {"name": "namespace:entity/villager/ambient/gone"}]}},
+        ["entity/villager/ambient/a.ogg", "entity/villager/ambient/extra.ogg"])
+
+    # Act
+    dangling, orphans, unknown_events = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert dangling == [
+        "entity.villager.ambient -> namespace:entity/villager/ambient/gone"]
+    assert orphans == ["entity/villager/ambient/extra.ogg"]
+    assert unknown_events == []
+
+
+def test_lint_pack_should_find_events_minecraft_does_not_have(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.whatever": {"sounds": [
+            {"name": "namespace:entity/villager/whatever/a"}]}},
+        ["entity/villager/whatever/a.ogg"])
+
+    # Act
+    dangling, orphans, unknown_events = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert dangling == []
+    assert orphans == []
+    assert unknown_events == ["entity.villager.whatever"]
+
+
+def test_lint_pack_should_skip_vanilla_sounds_and_event_references(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.ambient": {"sounds": [
+            "mob/villager/idle1",
+            {"name": "minecraft:mob/villager/idle2"},
+            {"name": "entity.villager.yes", "type": "event"}]}},
+        [])
+
+    # Act
+    result = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert result == ([], [], [])
+
+
+def test_lint_pack_should_check_sounds_in_other_namespaces(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.ambient": {"sounds": [
+            {"name": "other:entity/villager/ambient/here"},
+            {"name": "other:entity/villager/ambient/gone"}]}},
+        [])
+    other_path = tmp_path / "other" / "sounds" / "entity" / "villager" / "ambient"
+    other_path.mkdir(parents=True)
+    (other_path / "here.ogg").write_bytes(b"OggS")
+
+    # Act
+    dangling, orphans, unknown_events = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert dangling == [
+        "entity.villager.ambient -> other:entity/villager/ambient/gone"]
+    assert orphans == []
+
+
+def test_lint_pack_should_report_sounds_without_a_name(tmp_path):
+
+    # Arrange
+    target_path = make_pack(
+        tmp_path,
+        {"entity.villager.ambient": {"sounds": [{"volume": 0.5}]}},
+        [])
+
+    # Act
+    dangling, orphans, unknown_events = lint_pack(target_path, SoundEventCatalog())
+
+    # Assert
+    assert dangling == ["entity.villager.ambient -> a sound with no name"]
+
+
+def test_print_lint_results_should_say_a_clean_pack_is_clean(capsys):
+
+    # Act
+    print_lint_results([], [], [])
+
+    # Assert
+    assert capsys.readouterr().out == (
+        "\nEvery sound names a file that exists.\n"
+        "\nEvery sound file is named by an event.\n"
+        "\nEvery event is a Minecraft sound event.\n")
+
+
+def test_print_lint_results_should_count_problems_in_the_right_number(capsys):
+
+    # Act
+    print_lint_results(["event -> namespace:gone"], ["a.ogg", "b.ogg"], [])
+    output = capsys.readouterr().out
+
+    # Assert
+    assert f"\n1 sound doesn't name a file that exists:{Color.red.value}\n" in output
+    assert f"\n2 sound files aren't named by any event:{Color.red.value}\n" in output
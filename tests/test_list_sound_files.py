@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from spindex import list_sound_files
+
+
+def test_list_sound_files_should_return_relative_paths_and_matching_keys(fs):
+
+    # Arrange
+    fs.create_file("/pack/namespace/sounds/entity/villager/ambient/file01.ogg")
+    fs.create_file("/pack/namespace/sounds/jill/entity/witch/death/file02.ogg")
+    fs.create_file("/pack/namespace/sounds/top-level.ogg")
+    fs.create_file("/pack/namespace/sounds/entity/villager/ambient/.subtitles")
+    fs.create_file("/pack/namespace/sounds/entity/villager/ambient/notes.txt")
+
+    # Act
+    files, keys = list_sound_files(Path("/pack/namespace/sounds"))
+
+    # Assert
+    assert sorted(files) == [
+        Path("entity/villager/ambient/file01.ogg"),
+        Path("jill/entity/witch/death/file02.ogg"),
+        Path("top-level.ogg")
+    ]
+    assert keys == {
+        "entity/villager/ambient/file01.ogg",
+        "jill/entity/witch/death/file02.ogg",
+        "top-level.ogg"
+    }
+
+
+def test_list_sound_files_should_return_nothing_for_missing_folder(fs):
+
+    # Act
+    files, keys = list_sound_files(Path("/pack/namespace/sounds"))
+
+    # Assert
+    assert files == []
+    assert keys == set()
+
+
+def test_list_sound_files_should_not_follow_folder_links(fs):
+
+    # Arrange
+    fs.create_file("/pack/namespace/sounds/entity/file01.ogg")
+    fs.create_symlink("/pack/namespace/sounds/entity/loop", "/pack/namespace/sounds")
+
+    # Act
+    files, keys = list_sound_files(Path("/pack/namespace/sounds"))
+
+    # Assert
+    assert files == [Path("entity/file01.ogg")]
+    assert keys == {"entity/file01.ogg"}
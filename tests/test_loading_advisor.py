@@ -0,0 +1,51 @@
+import pytest
+
+from objects.loading_advisor import LoadingAdvisor, LoadingMode
+from objects.ogg_inspector import OggInfo
+
+
+@pytest.mark.parametrize("event_name, duration, size", [
+    ("music.game", 1.0, 10_000),
+    ("entity.villager.ambient", 12.0, 10_000),
+    ("entity.villager.ambient", 1.0, 2_000_000)])
+def test_recommend_should_stream_music_and_long_or_large_sounds(
+        event_name, duration, size):
+
+    # Arrange
+    advisor = LoadingAdvisor()
+
+    # Act
+    result = advisor.recommend(event_name, OggInfo(2, 44100, duration, size))
+
+    # Assert
+    assert result == LoadingMode.stream
+
+
+def test_recommend_should_preload_short_sounds_that_play_often():
+
+    # Arrange
+    advisor = LoadingAdvisor()
+
+    # Act
+    result = advisor.recommend(
+        "block.stone.step", OggInfo(1, 44100, 0.3, 8_000))
+
+    # Assert
+    assert result == LoadingMode.preload
+
+
+@pytest.mark.parametrize("event_name, duration, size", [
+    ("entity.villager.celebrate", 0.3, 8_000),
+    ("block.stone.step", 3.0, 8_000),
+    ("block.stone.step", 0.3, 500_000)])
+def test_recommend_should_leave_other_sounds_to_the_game(
+        event_name, duration, size):
+
+    # Arrange
+    advisor = LoadingAdvisor()
+
+    # Act
+    result = advisor.recommend(event_name, OggInfo(1, 44100, duration, size))
+
+    # Assert
+    assert result is None
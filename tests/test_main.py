@@ -0,0 +1,60 @@
+import sys
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from spindex import main
+from tests.ogg_files import make_vorbis_file
+
+
+def make_source(tmp_path: Path) -> Path:
+
+    source_path = tmp_path / "namespace"
+    sound_file = source_path / "sounds" / "entity" / "villager" / "ambient" / "file01.ogg"
+    sound_file.parent.mkdir(parents=True)
+    sound_file.write_bytes(make_vorbis_file())
+    (source_path / "defaults.json").write_text("{}")
+    return source_path
+
+
+def test_main_should_write_a_zip_without_a_target(tmp_path):
+
+    # Arrange
+    source_path = make_source(tmp_path)
+    zip_path = tmp_path / "pack.zip"
+    test_arguments = ["sound_pack_indexer", "-q", "-s", str(source_path), "--zip", str(zip_path)]
+
+    # Act
+    with patch.object(sys, 'argv', test_arguments):
+        with pytest.raises(SystemExit) as result:
+            main()
+
+    # Assert
+    assert result.value.code is None
+    with zipfile.ZipFile(zip_path) as archive:
+        assert sorted(archive.namelist()) == [
+            "assets/minecraft/sounds.json",
+            "assets/namespace/sounds/entity/villager/ambient/file01.ogg"]
+
+
+def test_main_should_leave_a_zipped_target_alone_unless_the_user_agrees(tmp_path, monkeypatch):
+
+    # Arrange
+    source_path = make_source(tmp_path)
+    target_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(target_path, "w") as archive:
+        archive.writestr("pack.mcmeta", "{}")
+    original = target_path.read_bytes()
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    test_arguments = ["sound_pack_indexer", "-q", "-s", str(source_path), "-t", str(target_path)]
+
+    # Act
+    with patch.object(sys, 'argv', test_arguments):
+        with pytest.raises(SystemExit) as result:
+            main()
+
+    # Assert
+    assert result.value.code is None
+    assert target_path.read_bytes() == original
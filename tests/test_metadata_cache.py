@@ -0,0 +1,95 @@
+import os
+import sqlite3
+
+import pytest
+
+from objects.metadata_cache import MetadataCache
+
+
+def test_metadata_cache_should_keep_entries_between_runs(tmp_path):
+
+    # Arrange
+    (tmp_path / "file01.ogg").write_bytes(b"a")
+    stat = (tmp_path / "file01.ogg").stat()
+    path = tmp_path / "cache.sqlite"
+
+    cache = MetadataCache(path)
+    cache.put(stat, "ogg", {"channels": 1})
+    cache.put(stat, "sha256", {"digest": "abc"})
+    cache.close()
+
+    # Act
+    reloaded = MetadataCache(path)
+
+    # Assert
+    assert reloaded.get(stat, "ogg") == {"channels": 1}
+    assert reloaded.get(stat, "sha256") == {"digest": "abc"}
+
+
+def test_metadata_cache_should_miss_once_size_or_modification_time_changes(tmp_path):
+
+    # Arrange
+    file = tmp_path / "file01.ogg"
+    file.write_bytes(b"a")
+    cache = MetadataCache(tmp_path / "cache.sqlite")
+    cache.put(file.stat(), "ogg", {"channels": 1})
+
+    # Act
+    unchanged = cache.get(file.stat(), "ogg")
+    os.utime(file, ns=(0, 0))
+    touched = cache.get(file.stat(), "ogg")
+    file.write_bytes(b"bb")
+    resized = cache.get(file.stat(), "ogg")
+
+    # Assert
+    assert unchanged == {"channels": 1}
+    assert touched is None
+    assert resized is None
+
+
+def test_metadata_cache_should_write_entries_in_batches(tmp_path, monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(MetadataCache, "BATCH_SIZE", 2)
+    files = [tmp_path / f"file0{n}.ogg" for n in range(3)]
+    for file in files:
+        file.write_bytes(b"a")
+    path = tmp_path / "cache.sqlite"
+    cache = MetadataCache(path)
+
+    # Act
+    for file in files:
+        cache.put(file.stat(), "ogg", {"channels": 1})
+    other = MetadataCache(path)
+
+    # Assert: the first batch is written, and the third entry still waits
+    assert other.get(files[0].stat(), "ogg") == {"channels": 1}
+    assert other.get(files[2].stat(), "ogg") is None
+    assert cache.get(files[2].stat(), "ogg") == {"channels": 1}
+
+
+def test_metadata_cache_should_replace_a_damaged_file(tmp_path):
+
+    # Arrange
+    path = tmp_path / "cache.sqlite"
+    path.write_text("not a database" * 100)
+    (tmp_path / "file01.ogg").write_bytes(b"a")
+
+    # Act
+    cache = MetadataCache(path)
+
+    # Assert
+    assert cache.get((tmp_path / "file01.ogg").stat(), "ogg") is None
+
+
+def test_metadata_cache_should_raise_when_a_cache_in_memory_fails(monkeypatch):
+
+    # Arrange
+    def fail(self):
+        raise sqlite3.DatabaseError("disk I/O error")
+
+    monkeypatch.setattr(MetadataCache, "_MetadataCache__open", fail)
+
+    # Act / Assert
+    with pytest.raises(sqlite3.DatabaseError):
+        MetadataCache()
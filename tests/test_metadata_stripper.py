@@ -0,0 +1,99 @@
+from objects.metadata_stripper import MetadataStripper, strip_comments
+from objects.ogg_inspector import OggInspector, OggPage, read_comments, read_packet
+from tests.ogg_files import make_comments, make_identification, make_page, make_raw_page, make_vorbis_file
+
+
+def read_pages(data: bytes) -> list[OggPage]:
+
+    pages = []
+    position = 0
+    while position < len(data):
+        pages.append(OggPage(data, position))
+        position = pages[-1].end
+    return pages
+
+
+def test_strip_comments_should_empty_the_comment_header_and_keep_the_audio():
+
+    # Arrange
+    data = make_vorbis_file(comments=["TITLE=Scream", "ARTIST=Derek"], audio_pages=3)
+    original_pages = read_pages(data)
+
+    # Act
+    stripped = strip_comments(data)
+
+    # Assert
+    pages = read_pages(stripped)
+    assert len(stripped) < len(data)
+    assert len(pages) == len(original_pages)
+    assert all(page.checksum(stripped) == page.crc for page in pages)
+    assert read_comments(read_packet(stripped, pages[1])) == []
+    assert stripped.endswith(data[original_pages[2].offset:])
+    assert OggInspector().inspect_buffer(stripped).duration == 1.0
+
+
+def test_strip_comments_should_keep_the_page_count_when_comments_filled_several_pages():
+
+    # Arrange: album art spreads the comment header over two pages
+    comments = make_comments(["METADATA_BLOCK_PICTURE=" + "x" * 600])
+    setup = b"\x05vorbis" + b"\x00" * 40
+    rest = comments[510:]
+    data = make_page([make_identification()], header_type=0x02)
+    data += make_raw_page(comments[:510], b"\xff\xff", sequence_number=1)
+    data += make_raw_page(
+        rest + setup,
+        b"\xff" * (len(rest) // 255) + bytes([len(rest) % 255, len(setup)]),
+        header_type=0x01, sequence_number=2)
+    audio = make_page([b"\x00" * 300], header_type=0x04, granule_position=44100, sequence_number=3)
+    data += audio
+
+    # Act
+    stripped = strip_comments(data)
+
+    # Assert
+    pages = read_pages(stripped)
+    assert [page.sequence_number for page in pages] == [0, 1, 2, 3]
+    assert all(page.checksum(stripped) == page.crc for page in pages)
+    assert stripped.endswith(audio)
+    assert OggInspector().inspect_buffer(stripped).tags == 0
+
+
+def test_strip_comments_should_leave_a_file_without_comments_alone():
+
+    # Arrange
+    data = make_vorbis_file()
+
+    # Act
+    stripped = strip_comments(data)
+
+    # Assert
+    assert stripped is data
+
+
+def test_metadata_stripper_should_count_the_bytes_saved_for_each_file():
+
+    # Arrange
+    stripper = MetadataStripper()
+    data = make_vorbis_file(comments=["TITLE=Scream"])
+
+    # Act
+    stripped = stripper.strip("sounds/file01.ogg", data)
+    untouched = stripper.strip("sounds.json", b"{}")
+
+    # Assert
+    assert stripper.saved == {"sounds/file01.ogg": len(data) - len(stripped)}
+    assert untouched == b"{}"
+    assert str(stripper) == f"Stripped metadata from 1 files, saving {(len(data) - len(stripped)) / 1_000:.1f} KB"
+
+
+def test_metadata_stripper_should_keep_files_it_cannot_rewrite():
+
+    # Arrange
+    stripper = MetadataStripper()
+
+    # Act
+    result = stripper.strip("sounds/file01.ogg", b"ID3\x03")
+
+    # Assert
+    assert result == b"ID3\x03"
+    assert stripper.errors == ["sounds/file01.ogg <- Not an Ogg file"]
@@ -0,0 +1,222 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from objects.metadata_cache import MetadataCache
+from objects.ogg_inspector import OggInfo, OggInspector, ogg_crc
+from objects.pack_archive import ArchiveMember, PackArchive
+from tests.ogg_files import ogg_crc as slow_ogg_crc
+from tests.ogg_files import make_comments, make_identification, make_page, make_raw_page, make_vorbis_file
+
+
+def test_inspect_file_should_read_channels_and_sample_rate(tmp_path):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file(channels=2, sample_rate=48000))
+
+    # Act
+    info = OggInspector().inspect_file(path)
+
+    # Assert
+    assert info.channels == 2
+    assert info.sample_rate == 48000
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "File is empty"),
+    (b"ID3\x03\x00" + b"\x00" * 100, "Not an Ogg file"),
+    (make_vorbis_file()[:40], "Ogg page is cut short"),
+    (make_vorbis_file()[:58], "Ogg file ends after its first page"),
+    (make_vorbis_file().replace(b"\x01vorbis", b"\x01opus\x00\x00"), "Ogg stream isn't Vorbis audio"),
+])
+def test_inspect_file_should_say_what_is_wrong(tmp_path, data, message):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(data)
+
+    # Act
+    with pytest.raises(ValueError) as error:
+        OggInspector().inspect_file(path)
+
+    # Assert
+    assert str(error.value) == message
+
+
+def test_inspect_files_should_warn_about_bad_files_and_keep_the_rest(tmp_path):
+
+    # Arrange
+    (tmp_path / "good.ogg").write_bytes(make_vorbis_file())
+    (tmp_path / "bad.ogg").write_bytes(b"not ogg")
+    sources = {Path("good.ogg"): tmp_path / "good.ogg", Path("bad.ogg"): tmp_path / "bad.ogg"}
+
+    # Act
+    results, warnings = OggInspector(2).inspect_files(sources)
+
+    # Assert
+    assert results == {Path("good.ogg"): OggInfo(1, 44100, 1.0, len(make_vorbis_file()))}
+    assert warnings == ["bad.ogg <- Not an Ogg file, and will be ignored"]
+
+
+@pytest.mark.parametrize("workers, error", [("8", TypeError), (0, ValueError)])
+def test_ogg_inspector_should_reject_invalid_worker_counts(workers, error):
+
+    with pytest.raises(error):
+        OggInspector(workers)
+
+
+def test_inspect_file_should_work_out_duration_from_the_last_granule_position(tmp_path):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file(sample_rate=48000, samples=120000, audio_pages=5))
+
+    # Act
+    info = OggInspector().inspect_file(path)
+
+    # Assert
+    assert info.duration == 2.5
+
+
+def test_inspect_file_should_find_the_last_page_past_a_false_capture_pattern(tmp_path):
+
+    # Arrange: "OggS" inside the last page's audio data
+    data = make_vorbis_file(samples=22050)
+    position = data.rindex(b"\x01" * 300)
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(data[:position] + b"OggS" + data[position + 4:])
+
+    # Act
+    info = OggInspector().inspect_file(path)
+
+    # Assert
+    assert info.duration == 0.5
+
+
+def test_inspect_file_should_reject_a_file_cut_short_at_the_end(tmp_path):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file()[:-10])
+
+    # Act
+    with pytest.raises(ValueError) as error:
+        OggInspector().inspect_file(path)
+
+    # Assert
+    assert str(error.value) == "Ogg file is cut short before its last page"
+
+
+def test_inspect_file_should_use_the_cache_for_unchanged_files(tmp_path):
+
+    # Arrange: a cached result that can only have come from the cache
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file())
+    cache = MetadataCache()
+    cache.put(path.stat(), "ogg", OggInfo(6, 8000, 9.0, 1).to_dict())
+
+    # Act
+    cached = OggInspector(cache=cache).inspect_file(path)
+    path.write_bytes(make_vorbis_file(channels=2))
+    changed = OggInspector(cache=cache).inspect_file(path)
+
+    # Assert
+    assert cached == OggInfo(6, 8000, 9.0, 1)
+    assert changed == OggInfo(2, 44100, 1.0, len(make_vorbis_file()))
+
+
+def test_inspect_file_should_count_tags_and_collect_overrides(tmp_path):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file(comments=[
+        "TITLE=Scream", "ARTIST=Derek", "spindex_volume=0.5", "SPINDEX_WEIGHT=3"]))
+
+    # Act
+    info = OggInspector().inspect_file(path)
+
+    # Assert
+    assert info.tags == 2
+    assert info.overrides == {"volume": "0.5", "weight": "3"}
+
+
+def test_inspect_file_should_read_a_comment_header_spread_over_several_pages(tmp_path):
+
+    # Arrange: a long comment, like album art, carries on to the next page
+    comments = make_comments(["COMMENT=" + "x" * 600, "SPINDEX_VOLUME=0.25"])
+    setup = b"\x05vorbis" + b"\x00" * 40
+    rest = comments[510:]
+    data = make_page([make_identification()], header_type=0x02)
+    data += make_raw_page(comments[:510], b"\xff\xff", sequence_number=1)
+    data += make_raw_page(
+        rest + setup,
+        b"\xff" * (len(rest) // 255) + bytes([len(rest) % 255, len(setup)]),
+        header_type=0x01, sequence_number=2)
+    data += make_page([b"\x00" * 300], header_type=0x04, granule_position=44100, sequence_number=3)
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(data)
+
+    # Act
+    info = OggInspector().inspect_file(path)
+
+    # Assert
+    assert info.tags == 1
+    assert info.overrides == {"volume": "0.25"}
+
+
+def test_inspect_file_should_reject_a_missing_comment_header(tmp_path):
+
+    # Arrange
+    path = tmp_path / "file01.ogg"
+    path.write_bytes(make_vorbis_file().replace(b"\x03vorbis", b"\x04vorbis"))
+
+    # Act
+    with pytest.raises(ValueError) as error:
+        OggInspector().inspect_file(path)
+
+    # Assert
+    assert str(error.value) == "Vorbis comment header is missing"
+
+
+@pytest.mark.parametrize("data", [b"", b"OggS", bytes(range(256)) * 5])
+def test_ogg_crc_should_match_the_bit_by_bit_checksum(data):
+
+    assert ogg_crc(data) == slow_ogg_crc(data)
+
+
+def make_zipped_sound(tmp_path: Path, data: bytes) -> ArchiveMember:
+
+    path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("sounds/file01.ogg", data)
+    return PackArchive.open_namespace(path).sound_member(Path("file01.ogg"))
+
+
+def test_inspect_file_should_read_only_the_start_and_end_of_a_file_in_a_zip(tmp_path, monkeypatch):
+
+    # Arrange
+    data = make_vorbis_file(channels=2, samples=88200, audio_pages=250)
+    member = make_zipped_sound(tmp_path, data)
+    monkeypatch.setattr(ArchiveMember, "read_bytes", lambda self: pytest.fail("read in full"))
+
+    # Act
+    info = OggInspector().inspect_file(member)
+
+    # Assert
+    assert info == OggInfo(2, 44100, 2.0, len(data))
+
+
+def test_inspect_file_should_read_a_file_in_a_zip_in_full_when_its_headers_are_large(tmp_path, monkeypatch):
+
+    # Arrange
+    data = make_vorbis_file(comments=["TITLE=" + "x" * 100, "SPINDEX_VOLUME=0.5"])
+    member = make_zipped_sound(tmp_path, data)
+    monkeypatch.setattr(OggInspector, "HEAD_SIZE", 100)
+
+    # Act
+    info = OggInspector().inspect_file(member)
+
+    # Assert
+    assert info == OggInfo(1, 44100, 1.0, len(data), 1, {"volume": "0.5"})
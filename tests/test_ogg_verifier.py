@@ -0,0 +1,85 @@
+import pytest
+
+from objects.ogg_inspector import OggPage
+from objects.ogg_verifier import OggVerifier, verify_buffer
+from tests.ogg_files import make_vorbis_file
+
+
+def test_verify_buffer_should_check_every_page():
+
+    # Act
+    pages, error = verify_buffer(make_vorbis_file(audio_pages=3))
+
+    # Assert
+    assert pages == 5
+    assert error is None
+
+
+def test_verify_buffer_should_stop_at_the_first_bad_page():
+
+    # Arrange: flip a byte in the first audio page, and cut the last one short
+    data = bytearray(make_vorbis_file(audio_pages=3))
+    first_audio_page = OggPage(data, OggPage(data, 0).end).end
+    data[first_audio_page + 100] ^= 0xFF
+    data = bytes(data[:-10])
+
+    # Act
+    pages, error = verify_buffer(data)
+
+    # Assert
+    assert pages == 2
+    assert error.startswith(f"Page 2 at byte {first_audio_page}: CRC is ")
+
+
+def test_verify_files_should_report_corrupt_files_from_a_pool_of_processes(tmp_path):
+
+    # Arrange
+    good = tmp_path / "good.ogg"
+    good.write_bytes(make_vorbis_file())
+    bad = tmp_path / "bad.ogg"
+    bad.write_bytes(make_vorbis_file()[:-5])
+    last_page = make_vorbis_file().rfind(b"OggS")
+    empty = tmp_path / "empty.ogg"
+    empty.touch()
+    report_path = tmp_path / "report.txt"
+
+    # Act
+    report = OggVerifier(2).verify_files({
+        good.relative_to(tmp_path): good,
+        bad.relative_to(tmp_path): bad,
+        empty.relative_to(tmp_path): empty})
+    report.write(report_path)
+
+    # Assert
+    assert report.files_checked == 3
+    assert report.pages_checked == 4 + 3
+    assert report.errors == [
+        f"bad.ogg <- Page 3 at byte {last_page}: Ogg page is cut short",
+        "empty.ogg <- File is empty"]
+    assert report_path.read_text().splitlines()[1:] == report.errors
+
+
+def test_verify_files_should_list_files_that_were_not_checked(tmp_path):
+
+    # Arrange
+    good = tmp_path / "good.ogg"
+    good.write_bytes(make_vorbis_file())
+    report_path = tmp_path / "report.txt"
+
+    # Act
+    report = OggVerifier(1).verify_files(
+        {good.relative_to(tmp_path): good}, ["Bad Name.ogg <- Path does not match valid naming rules"])
+    report.write(report_path)
+
+    # Assert
+    assert report.errors == []
+    assert str(report).endswith(", 1 files were not checked")
+    assert report_path.read_text().splitlines()[1:] == [
+        "Not checked: Bad Name.ogg <- Path does not match valid naming rules"]
+
+
+@pytest.mark.parametrize("workers, error", [("8", TypeError), (0, ValueError)])
+def test_ogg_verifier_should_reject_invalid_worker_counts(workers, error):
+
+    with pytest.raises(error):
+        OggVerifier(workers)
@@ -0,0 +1,151 @@
+import os
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+from objects.pack_archive import PackArchive, crc32_file
+
+
+@pytest.fixture
+def namespace_zip(tmp_path) -> Path:
+
+    path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("namespace/", "")
+        archive.writestr("namespace/defaults.json", '{"replace": true}')
+        archive.writestr("namespace/sounds/entity/file01.ogg", b"abc")
+        archive.writestr("namespace/sounds/entity/notes.txt", b"ignored")
+    return path
+
+
+def test_pack_archive_should_look_through_a_single_wrapping_folder(namespace_zip):
+
+    # Act
+    archive = PackArchive.open_namespace(namespace_zip)
+
+    # Assert
+    assert archive.root == "namespace/"
+    assert archive.namespace == "namespace"
+    assert archive.list_folders() == {"sounds"}
+
+
+def test_pack_archive_should_name_an_unwrapped_namespace_after_the_zip(tmp_path):
+
+    # Arrange
+    path = tmp_path / "team.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("sounds/file01.ogg", b"abc")
+
+    # Act
+    archive = PackArchive.open_namespace(path)
+
+    # Assert
+    assert archive.root == ""
+    assert archive.namespace == "team"
+
+
+def test_pack_archive_should_list_sound_files_from_the_central_directory(namespace_zip):
+
+    # Act
+    files, keys = PackArchive.open_namespace(namespace_zip).list_sound_files()
+
+    # Assert
+    assert files == [Path("entity/file01.ogg")]
+    assert keys == {"entity/file01.ogg"}
+
+
+def test_pack_archive_should_read_members_lazily(namespace_zip):
+
+    # Act
+    archive = PackArchive.open_namespace(namespace_zip)
+    member = archive.sound_member(Path("entity/file01.ogg"))
+
+    # Assert
+    assert member.size == 3
+    assert member.crc == zlib.crc32(b"abc")
+    assert member.read_bytes() == b"abc"
+    assert archive.read_json("namespace/defaults.json") == {"replace": True}
+    assert archive.read_json("namespace/missing.json") == {}
+
+
+def test_pack_archive_should_extract_sound_files(namespace_zip, tmp_path):
+
+    # Arrange
+    archive = PackArchive.open_namespace(namespace_zip)
+    target = tmp_path / "target" / "sounds" / "entity" / "file01.ogg"
+
+    # Act
+    report = archive.extract_sound_files(
+        [(Path("entity/file01.ogg"), target), (Path("missing.ogg"), tmp_path / "x.ogg")])
+
+    # Assert
+    assert target.read_bytes() == b"abc"
+    assert report.files_copied == 1
+    assert len(report.errors) == 1
+
+
+def test_pack_archive_should_not_transform_through_targets_hard_linked_elsewhere(namespace_zip, tmp_path):
+
+    # Arrange
+    archive = PackArchive.open_namespace(namespace_zip)
+    source = tmp_path / "source.ogg"
+    source.write_bytes(b"abcdef")
+    target = tmp_path / "target" / "sounds" / "entity" / "file01.ogg"
+    target.parent.mkdir(parents=True)
+    os.link(source, target)
+
+    # Act
+    report = archive.extract_sound_files(
+        [(Path("entity/file01.ogg"), target)], transform=lambda name, data: data[:2])
+
+    # Assert
+    assert report.errors == []
+    assert source.read_bytes() == b"abcdef"
+    assert target.read_bytes() == b"ab"
+
+
+def test_pack_archive_should_wait_for_the_rate_limits_before_extracting(namespace_zip, tmp_path):
+
+    # Arrange
+    archive = PackArchive.open_namespace(namespace_zip)
+    target = tmp_path / "target" / "sounds" / "entity" / "file01.ogg"
+    sizes: list[int] = []
+
+    # Act
+    archive.extract_sound_files([(Path("entity/file01.ogg"), target)], throttle=sizes.append)
+
+    # Assert
+    assert sizes == [3]
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_pack_archive_should_read_part_of_a_member(tmp_path, compression):
+
+    # Arrange
+    path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        archive.writestr("sounds/file01.ogg", b"0123456789")
+    member = PackArchive.open_namespace(path).sound_member(Path("file01.ogg"))
+
+    # Act
+    middle = member.read_range(3, 4)
+    end = member.read_range(8, 100)
+
+    # Assert
+    assert middle == b"3456"
+    assert end == b"89"
+
+
+def test_crc32_file_should_match_zlib(tmp_path):
+
+    # Arrange
+    full = tmp_path / "full.ogg"
+    full.write_bytes(b"OggS" * 100)
+    empty = tmp_path / "empty.ogg"
+    empty.touch()
+
+    # Act / Assert
+    assert crc32_file(full) == zlib.crc32(b"OggS" * 100)
+    assert crc32_file(empty) == 0
@@ -0,0 +1,96 @@
+import hashlib
+import zipfile
+
+import pytest
+
+from objects.pack_zip import PackZip
+
+
+def test_pack_zip_should_store_ogg_files_and_deflate_everything_else(tmp_path):
+
+    # Arrange
+    sound = tmp_path / "file01.ogg"
+    sound.write_bytes(b"OggS" * 1000)
+    path = tmp_path / "pack.zip"
+
+    # Act
+    report = PackZip(2).write(path, [
+        ("assets/namespace/sounds/file01.ogg", sound),
+        ("assets/minecraft/sounds.json", b'{"event": {}}' * 100)])
+
+    # Assert
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert archive.getinfo(
+            "assets/namespace/sounds/file01.ogg").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo(
+            "assets/minecraft/sounds.json").compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("assets/namespace/sounds/file01.ogg") == b"OggS" * 1000
+        assert archive.read("assets/minecraft/sounds.json") == b'{"event": {}}' * 100
+    assert report.files_stored == 1
+    assert report.files_deflated == 1
+
+
+def test_pack_zip_should_report_the_sha1_of_the_finished_zip(tmp_path):
+
+    # Arrange
+    path = tmp_path / "pack.zip"
+
+    # Act
+    report = PackZip(1).write(path, [("pack.mcmeta", b"{}")])
+
+    # Assert
+    assert report.sha1 == hashlib.sha1(path.read_bytes()).hexdigest()
+    assert report.bytes_written == path.stat().st_size
+
+
+def test_pack_zip_should_keep_members_in_order_with_more_files_than_workers(tmp_path):
+
+    # Arrange
+    members = [(f"sounds/file{i:02}.ogg", bytes([i]) * i) for i in range(20)]
+    path = tmp_path / "pack.zip"
+
+    # Act
+    PackZip(2).write(path, members)
+
+    # Assert
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == [name for name, _ in members]
+        assert [archive.read(name) for name, _ in members] == [d for _, d in members]
+
+
+def test_pack_zip_should_not_leave_a_partial_zip_when_a_file_is_missing(tmp_path):
+
+    # Arrange
+    path = tmp_path / "pack.zip"
+
+    # Act
+    with pytest.raises(OSError):
+        PackZip(2).write(path, [("sounds/missing.ogg", tmp_path / "missing.ogg")])
+
+    # Assert
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("workers, error", [("8", TypeError), (0, ValueError)])
+def test_pack_zip_should_reject_invalid_worker_counts(workers, error):
+
+    with pytest.raises(error):
+        PackZip(workers)
+
+
+def test_pack_zip_should_transform_members_and_checksum_the_result(tmp_path):
+
+    # Arrange
+    sound = tmp_path / "file01.ogg"
+    sound.write_bytes(b"OggS" * 1000)
+    path = tmp_path / "pack.zip"
+
+    # Act
+    PackZip(2, lambda name, data: data[:4]).write(path, [
+        ("assets/namespace/sounds/file01.ogg", sound)])
+
+    # Assert
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert archive.read("assets/namespace/sounds/file01.ogg") == b"OggS"
@@ -1,3 +1,4 @@
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -19,6 +20,27 @@ def test_validate_source_path_should_raise_error_when_path_does_not_exist():
                       "/test/folder/namespace is not a valid filesystem path.")
 
 
+def test_validate_source_path_should_accept_a_zipped_namespace_folder(tmp_path):
+
+    path: Path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("namespace/defaults.json", "{}")
+        archive.writestr("namespace/sounds/file01.ogg", b"")
+
+    validate_source_path(path)
+
+
+def test_validate_source_path_should_check_the_folders_in_a_zip(tmp_path):
+
+    path: Path = tmp_path / "namespace.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("sounds/file01.ogg", b"")
+        archive.writestr("textures/file01.png", b"")
+
+    with pytest.raises(IncorrectDirStructureError):
+        validate_source_path(path)
+
+
 def test_validate_source_path_should_raise_error_when_no_sounds_folder_exists(fs):
 
     fs.create_dir("/test/folder/namespace/not-sounds")
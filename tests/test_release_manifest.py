@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from objects.file_hasher import FileHasher
+from objects.release_manifest import ReleaseManifest
+
+
+def test_release_manifest_should_find_new_and_changed_files(tmp_path):
+
+    # Arrange
+    sounds = tmp_path / "sounds"
+    sounds.mkdir()
+    for name in ["same.ogg", "changed.ogg", "removed.ogg"]:
+        (sounds / name).write_bytes(name.encode())
+    previous, _ = ReleaseManifest().update(
+        sounds, [p.relative_to(sounds) for p in sounds.iterdir()], FileHasher(2))
+
+    (sounds / "changed.ogg").write_bytes(b"different")
+    (sounds / "removed.ogg").unlink()
+    (sounds / "new.ogg").write_bytes(b"new")
+
+    # Act
+    current, warnings = previous.update(
+        sounds, [p.relative_to(sounds) for p in sounds.iterdir()], FileHasher(2))
+    changed, removed = previous.get_changes(current)
+
+    # Assert
+    assert warnings == []
+    assert sorted(changed) == ["changed.ogg", "new.ogg"]
+    assert removed == ["removed.ogg"]
+
+
+def test_release_manifest_should_only_hash_files_whose_size_or_mtime_changed(tmp_path):
+
+    # Arrange: a stale hash is kept, which shows the file wasn't read again
+    sounds = tmp_path / "sounds"
+    sounds.mkdir()
+    (sounds / "file01.ogg").write_bytes(b"abc")
+    stat = (sounds / "file01.ogg").stat()
+    previous = ReleaseManifest({"file01.ogg": {
+        "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": "stale"}})
+
+    # Act
+    current, _ = previous.update(sounds, [Path("file01.ogg")], FileHasher(1))
+    os.utime(sounds / "file01.ogg", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    touched, _ = previous.update(sounds, [Path("file01.ogg")], FileHasher(1))
+
+    # Assert
+    assert current.files["file01.ogg"]["sha256"] == "stale"
+    assert touched.files["file01.ogg"]["sha256"] != "stale"
+
+
+def test_release_manifest_should_round_trip_through_a_file(tmp_path):
+
+    # Arrange
+    manifest = ReleaseManifest({"file01.ogg": {"size": 3, "mtime_ns": 1, "sha256": "abc"}})
+    path = tmp_path / "release.manifest.json"
+
+    # Act
+    manifest.save(path)
+
+    # Assert
+    assert ReleaseManifest.load(path).files == manifest.files
+    assert ReleaseManifest.load(tmp_path / "missing.json").files == {}
+
+
+def test_release_manifest_should_reject_other_versions(tmp_path):
+
+    # Arrange
+    path = tmp_path / "release.manifest.json"
+    path.write_text('{"version": 99, "files": {}}')
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        ReleaseManifest.load(path)
@@ -0,0 +1,26 @@
+import pytest
+
+from objects.deployment import Deployment
+from spindex import resume_deployment
+
+
+@pytest.mark.parametrize("response, message", [
+    ("y", "Interrupted deployment finished."),
+    ("n", "Interrupted deployment rolled back.")])
+def test_resume_deployment_should_exit_successfully_either_way(tmp_path, monkeypatch, capsys, response, message):
+
+    # Arrange
+    deployment = Deployment(tmp_path / "namespace" / "sounds", tmp_path / "minecraft" / "sounds.json")
+    deployment.begin()
+    with open(deployment.journal_path, "a") as fp:
+        fp.write('{"state": "committing", "json": false, "files": []}\n')
+    monkeypatch.setattr("builtins.input", lambda prompt: response)
+
+    # Act
+    with pytest.raises(SystemExit) as result:
+        resume_deployment(deployment)
+
+    # Assert
+    assert result.value.code is None
+    assert capsys.readouterr().out.strip() == message
+    assert not deployment.is_interrupted()
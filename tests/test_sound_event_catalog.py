@@ -36,3 +36,26 @@ def test_sound_event_catalog_get_sound_event_name_should_raise_error_when_event_
         catalog.get_sound_event_name(path)
 
     assert str(result.value) == f"Could not build a sound event from this path: {path}"
+
+
+@pytest.mark.parametrize("event_name, expected", [
+    ("entity.villager.ambient", True),
+    ("block.stone.break", True),
+    ("music.game", False),
+    ("ui.button.click", False)])
+def test_sound_event_catalog_is_positional_should_only_accept_entity_and_block_events(event_name, expected):
+
+    catalog = SoundEventCatalog()
+
+    assert catalog.is_positional(event_name) is expected
+
+
+@pytest.mark.parametrize("event_name, expected", [
+    ("entity.villager.ambient", True),
+    ("entity.villager.whatever", False),
+    ("nothing.at.all", False)])
+def test_sound_event_catalog_has_event_should_only_accept_events_in_catalog(event_name, expected):
+
+    catalog = SoundEventCatalog()
+
+    assert catalog.has_event(event_name) is expected
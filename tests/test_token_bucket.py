@@ -0,0 +1,66 @@
+import pytest
+
+from objects.token_bucket import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Stands in for time, so nothing really sleeps"""
+
+    class Clock:
+        now = 100.0
+        sleeps: list[float] = []
+
+        def sleep(self, seconds: float):
+            self.sleeps.append(seconds)
+
+    clock = Clock()
+    monkeypatch.setattr("objects.token_bucket.time.monotonic", lambda: clock.now)
+    monkeypatch.setattr("objects.token_bucket.time.sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_should_allow_a_burst_up_to_its_capacity(clock):
+
+    # Arrange
+    bucket = TokenBucket(10)
+
+    # Act
+    for _ in range(10):
+        bucket.take()
+
+    # Assert
+    assert clock.sleeps == []
+
+
+def test_token_bucket_should_wait_off_a_debt(clock):
+
+    # Arrange
+    bucket = TokenBucket(100)
+
+    # Act: 250 bytes from a bucket of 100 leaves 150 to pay back
+    bucket.take(250)
+    bucket.take(50)
+
+    # Assert
+    assert clock.sleeps == pytest.approx([1.5, 2.0])
+
+
+def test_token_bucket_should_refill_over_time(clock):
+
+    # Arrange
+    bucket = TokenBucket(10)
+    bucket.take(10)
+
+    # Act
+    clock.now += 0.5
+    bucket.take(5)
+
+    # Assert
+    assert clock.sleeps == []
+
+
+def test_token_bucket_should_reject_a_rate_of_zero():
+
+    with pytest.raises(ValueError):
+        TokenBucket(0)
@@ -0,0 +1,100 @@
+import json
+import os
+from pathlib import Path
+
+from json_encoder import CompactJSONEncoder
+from objects.typed_dictionaries import SoundEvent, Sound
+from spindex import write_events, OutputFormat
+
+
+def test_write_events_should_write_the_text_it_returns(fs):
+
+    # Arrange
+    fs.create_dir("/test/namespace")
+    path = Path("/test/namespace/generated-sounds.json")
+    events = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")],
+        subtitle="subtitles.entity.villager.ambient")}
+
+    # Act
+    result, written = write_events(events, path)
+
+    # Assert
+    assert written is True
+    assert path.read_text() == result
+    assert result == json.dumps(events, indent=4, cls=CompactJSONEncoder)
+
+
+def test_write_events_should_not_rewrite_a_file_with_identical_contents(fs):
+
+    # Arrange
+    path = Path("/test/namespace/generated-sounds.json")
+    events = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+    fs.create_file(path, contents=json.dumps(events, indent=4, cls=CompactJSONEncoder))
+    os.utime(path, ns=(0, 0))
+
+    # Act
+    result, written = write_events(events, path)
+
+    # Assert
+    assert written is False
+    assert path.stat().st_mtime_ns == 0
+
+
+def test_write_events_should_rewrite_a_file_of_the_same_size_with_different_contents(fs):
+
+    # Arrange
+    path = Path("/test/namespace/generated-sounds.json")
+    events = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+    fs.create_file(path, contents=json.dumps(events, indent=4, cls=CompactJSONEncoder).replace("01", "02"))
+
+    # Act
+    result, written = write_events(events, path)
+
+    # Assert
+    assert written is True
+    assert path.read_text() == result
+
+
+def test_write_events_should_write_canonical_minified_json(fs):
+
+    # Arrange
+    fs.create_dir("/test/namespace")
+    path = Path("/test/namespace/sounds.json")
+    events = {
+        "entity.witch.ambient": SoundEvent(
+            subtitle="subtitles.entity.witch.ambient",
+            sounds=[Sound(name="namespace:entity/witch/ambient/file01", volume=0.7)]),
+        "entity.villager.ambient": SoundEvent(
+            sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+
+    # Act
+    result, written = write_events(events, path, OutputFormat.minified)
+
+    # Assert
+    assert path.read_text() == result
+    assert result == (
+        '{"entity.villager.ambient":{"sounds":[{"name":"namespace:entity/villager/ambient/file01"}]},'
+        '"entity.witch.ambient":{"sounds":[{"name":"namespace:entity/witch/ambient/file01","volume":0.7}],'
+        '"subtitle":"subtitles.entity.witch.ambient"}}')
+
+
+def test_write_events_should_keep_the_target_modification_time_when_run_again(fs):
+
+    # Arrange
+    fs.create_dir("/test/minecraft")
+    path = Path("/test/minecraft/sounds.json")
+    events = {"entity.villager.ambient": SoundEvent(
+        sounds=[Sound(name="namespace:entity/villager/ambient/file01")])}
+    write_events(events, path, OutputFormat.minified)
+    os.utime(path, ns=(0, 0))
+
+    # Act
+    result, written = write_events(events, path, OutputFormat.minified)
+
+    # Assert
+    assert written is False
+    assert path.stat().st_mtime_ns == 0
+    assert path.read_text() == result